@@ -1,9 +1,18 @@
 "use client";
 
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import {FaImage, FaRegHeart,} from "react-icons/fa";
 import {FaXTwitter} from "react-icons/fa6";
-import {likeTweet, postTweet, postTweetWithImage, replyTweet, startAgent, stopAgent} from "@/utils/api";
+import {
+    fetchAgentStatus,
+    likeTweet,
+    postTweet,
+    postTweetWithImage,
+    replyTweet,
+    startAgent,
+    stopAgent,
+    subscribeAgentEvents
+} from "@/utils/api";
 import {FiMessageSquare} from "react-icons/fi";
 import AgentButton from "@/components/AgentButton";
 
@@ -14,6 +23,23 @@ export default function Actions({ setLogs }: { setLogs: React.Dispatch<React.Set
     const [loading, setLoading] = useState(false);
     const [activeAction, setActiveAction] = useState<string | null>(null)
 
+    useEffect(() => {
+        // Pick up a loop that was already running on the server
+        fetchAgentStatus()
+            .then((status) => setIsRunning(status.state !== "stopped"))
+            .catch(() => {});
+        // The loop's logs and errors arrive as server events, so the log follows it without polling
+        return subscribeAgentEvents((type, data) => {
+            if (type === "log") {
+                setLogs((prev) => [...prev, data.message]);
+            } else if (type === "error") {
+                setLogs((prev) => [...prev, `❌ ${data.error}`]);
+            } else if (type === "loop_state") {
+                setIsRunning(data.state !== "stopped");
+            }
+        });
+    }, [setLogs]);
+
     const handleAction = async (action: string) => {
         if (activeAction) return // Prevent multiple actions from running simultaneously
         setActiveAction(action)
@@ -32,6 +32,27 @@ export const stopAgent = async () => {
     }
 };
 
+export const fetchAgentStatus = async () => {
+    try {
+        const response = await fetch("http://localhost:8001/agent/status");
+        if (!response.ok) throw new Error("Failed to fetch agent status");
+        return await response.json();
+    } catch (err) {
+        throw err;
+    }
+};
+
+export const subscribeAgentEvents = (onEvent: (type: string, data: any) => void) => {
+    // EventSource reconnects on its own and resumes from the last event id it saw
+    const source = new EventSource("http://localhost:8001/events");
+    const types = ["task_started", "task_finished", "action_started", "action_finished", "action_failed",
+        "generated_text", "transaction", "error", "log", "loop_state"];
+    types.forEach((type) =>
+        source.addEventListener(type, (event) => onEvent(type, JSON.parse((event as MessageEvent).data)))
+    );
+    return () => source.close();
+};
+
 export const postTweet = async (prompt : string) => {
     try {
         const response = await fetch("http://localhost:8001/agent/post-tweet", {
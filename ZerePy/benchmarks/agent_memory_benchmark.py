@@ -0,0 +1,94 @@
+"""
+Memory cost of each extra agent hosted in one process.
+
+Loads `--agents` copies of a persona that uses several LLM providers plus
+Twitter, first as independent ZerePyAgent instances and then through an
+AgentHost (which shares LLM connections with identical config), and reports
+the traced allocation per agent after every LLM client has been created.
+
+Runs in a temporary directory with dummy API keys; nothing touches the network.
+
+Usage (from the ZerePy directory):
+    python -m benchmarks.agent_memory_benchmark --agents 20
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from src.agent import ZerePyAgent
+from src.agent_host import AgentHost
+
+BENCH_AGENT = {
+    "name": "BenchAgent",
+    "bio": ["A persona used to measure hosting overhead."],
+    "traits": ["Curious"],
+    "examples": ["An example tweet."],
+    "example_accounts": [],
+    "loop_delay": 900,
+    "config": [
+        {"name": "twitter", "timeline_read_count": 10, "tweet_interval": 900},
+        {"name": "openai", "model": "gpt-4o-mini"},
+        {"name": "anthropic", "model": "claude-3-5-sonnet-20241022"},
+        {"name": "xai", "model": "grok-2-latest"},
+        {"name": "ollama", "base_url": "http://127.0.0.1:11434/", "model": "llama3.2"},
+    ],
+    "tasks": [{"name": "post-tweet", "weight": 1}, {"name": "like-tweet", "weight": 1}],
+    "use_time_based_weights": False,
+    "time_based_multipliers": {},
+    "state": None,
+    "outbox": None,
+}
+DUMMY_KEYS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "XAI_API_KEY")
+
+
+def _warm_clients(agent) -> None:
+    """Create the SDK clients an agent would build on its first LLM call"""
+    for connection in agent.connection_manager.connections.values():
+        if hasattr(connection, "_get_client"):
+            connection._get_client()
+
+
+def _per_agent_kib(load, count: int) -> float:
+    # The first agent pays for imports and lazily built module state
+    _warm_clients(load(0))
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    agents = [load(index + 1) for index in range(count)]
+    for agent in agents:
+        _warm_clients(agent)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return growth / count / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    for key in DUMMY_KEYS:
+        os.environ.setdefault(key, "bench-key")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        Path("agents").mkdir()
+        for index in range(args.agents + 1):
+            Path("agents", f"bench_{index}.json").write_text(json.dumps(BENCH_AGENT))
+
+        independent = _per_agent_kib(lambda index: ZerePyAgent(f"bench_{index}"), args.agents)
+        host = AgentHost()
+        hosted = _per_agent_kib(lambda index: host.load(f"bench_{index}"), args.agents)
+
+    print(f"{args.agents} extra agents, {len(BENCH_AGENT['config'])} connections each")
+    print(f"independent      {independent:8.1f} KiB per agent")
+    print(f"AgentHost        {hosted:8.1f} KiB per agent   ({len(host.shared)} shared LLM connections)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: per-call framework overhead of action dispatch.
+
+A no-op connection is called three ways: its method directly (the floor),
+through `connection.perform_action` (dispatch table, coercion, hooks) and
+through `ConnectionManager.perform_action` (health check, positional
+binding, events). The difference from the floor is what the framework
+costs on every action, whatever the connection does.
+
+Usage (from the ZerePy directory):
+    python -m benchmarks.dispatch_benchmark --calls 200000
+"""
+import argparse
+import logging
+import time
+
+from src.connection_manager import ConnectionManager
+from src.connections.base_connection import Action, ActionParameter, BaseConnection
+from src.events import EventBus
+
+
+class NoopConnection(BaseConnection):
+    """Connection whose actions do nothing, so only framework cost is measured"""
+
+    @property
+    def is_llm_provider(self) -> bool:
+        return False
+
+    def validate_config(self, config):
+        return config
+
+    def configure(self, **kwargs) -> bool:
+        return True
+
+    def is_configured(self, verbose=False) -> bool:
+        return True
+
+    def register_actions(self) -> None:
+        self.actions = {
+            "noop": Action(name="noop", parameters=[], description="Do nothing"),
+            "echo": Action(
+                name="echo",
+                parameters=[
+                    ActionParameter("text", True, str, "Text to return"),
+                    ActionParameter("count", True, int, "A number"),
+                    ActionParameter("ratio", False, float, "Another number"),
+                ],
+                description="Return the text"
+            ),
+        }
+
+    def noop(self):
+        return None
+
+    def echo(self, text: str, count: int, ratio: float = 1.0):
+        return text
+
+
+def _ns_per_call(call, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    manager = ConnectionManager([])
+    connection = NoopConnection({"name": "noop"})
+    manager.connections["noop"] = connection
+    with_events = ConnectionManager([])
+    with_events.connections["noop"] = connection
+    with_events.events = EventBus()
+
+    cases = [
+        ("direct method", lambda: connection.echo("hi", 3, 0.5)),
+        ("connection.perform_action", lambda: connection.perform_action("echo", {"text": "hi", "count": 3, "ratio": 0.5})),
+        ("  coercing str -> int", lambda: connection.perform_action("echo", {"text": "hi", "count": "3"})),
+        ("manager.perform_action", lambda: manager.perform_action("noop", "echo", ["hi", 3, 0.5])),
+        ("  with event bus", lambda: with_events.perform_action("noop", "echo", ["hi", 3, 0.5])),
+        ("  no-param action", lambda: manager.perform_action("noop", "noop", [])),
+    ]
+    for _, call in cases:
+        _ns_per_call(call, min(args.calls, 1000))
+
+    print(f"{args.calls} calls per case")
+    floor = None
+    for label, call in cases:
+        ns = _ns_per_call(call, args.calls)
+        floor = ns if floor is None else floor
+        print(f"{label:<28} {ns:8.0f} ns/call   overhead {ns - floor:8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
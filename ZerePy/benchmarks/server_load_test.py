@@ -0,0 +1,109 @@
+"""
+Load test: concurrent requests against the FastAPI server while every
+connection call blocks for `--delay` seconds (a stand-in for a slow Ollama
+generation or Twitter request).
+
+The server runs in-process under uvicorn with the default agent loaded; its
+connection manager is swapped for one that only sleeps, so no network or
+API keys are needed. The test fires `--requests` concurrent calls at
+`--endpoint` and meanwhile polls `GET /`, which should stay fast as long as
+blocking work is kept off the event loop.
+
+Usage (from the ZerePy directory):
+    python -m benchmarks.server_load_test --requests 8 --delay 1
+    python -m benchmarks.server_load_test --endpoint /agent/post-tweet
+"""
+import argparse
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+
+from src.server.app import ZerePyServer
+
+PAYLOADS = {
+    "/agent/action": {"connection": "ollama", "action": "generate-text", "params": ["hello", "be brief"]},
+    "/agent/post-tweet": {"prompt": "hello"},
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _slow_perform_action(delay: float):
+    def perform_action(*args, **kwargs):
+        time.sleep(delay)
+        return "ok"
+    return perform_action
+
+
+def _start_server(delay: float) -> str:
+    server = ZerePyServer()
+    agent = server.state.agent
+    agent.connection_manager.perform_action = _slow_perform_action(delay)
+    agent.perform_action = lambda connection, action, **kwargs: _slow_perform_action(delay)()
+    agent.tweet_interval = 0
+
+    port = _free_port()
+    config = uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning")
+    uvicorn_server = uvicorn.Server(config)
+    threading.Thread(target=uvicorn_server.run, daemon=True).start()
+    while not uvicorn_server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def _timed_post(url: str, payload: dict) -> float:
+    start = time.perf_counter()
+    response = requests.post(url, json=payload, timeout=300)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def _poll_root(url: str, stop: threading.Event, latencies: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        requests.get(url, timeout=300)
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds each connection call blocks")
+    parser.add_argument("--endpoint", choices=sorted(PAYLOADS), default="/agent/action")
+    args = parser.parse_args()
+
+    base_url = _start_server(args.delay)
+    stop = threading.Event()
+    root_latencies = []
+    poller = threading.Thread(target=_poll_root, args=(base_url + "/", stop, root_latencies), daemon=True)
+    poller.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.requests) as pool:
+        latencies = list(pool.map(
+            lambda _: _timed_post(base_url + args.endpoint, PAYLOADS[args.endpoint]), range(args.requests)
+        ))
+    wall = time.perf_counter() - start
+    stop.set()
+    poller.join()
+
+    print(f"{args.requests} x {args.endpoint} ({args.delay:.2f}s per blocking call)")
+    print(f"wall {wall:6.2f} s   summed request time {sum(latencies):6.2f} s")
+    print(f"request p50 {statistics.median(latencies):6.2f} s   max {max(latencies):6.2f} s")
+    if root_latencies:
+        print(f"GET / during load: p50 {statistics.median(root_latencies):7.2f} ms   "
+              f"max {max(root_latencies):7.2f} ms ({len(root_latencies)} polls)")
+
+
+if __name__ == "__main__":
+    main()
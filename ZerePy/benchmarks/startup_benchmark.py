@@ -0,0 +1,84 @@
+"""
+Cold-start benchmark for the CLI (`main.py`) and the server (`src.server`).
+
+Runs each entry point's imports in a fresh interpreter under
+`python -X importtime` and reports total import time plus the slowest
+top-level packages, so regressions from eager SDK imports show up.
+
+Usage (from the ZerePy directory):
+    python -m benchmarks.startup_benchmark
+    python -m benchmarks.startup_benchmark --agent example --top 15
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+TARGETS = {
+    "cli (main.py)": "import src.cli",
+    "server (src.server)": "import src.server",
+}
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) rows from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def measure(code: str) -> List[Tuple[int, int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"'{code}' failed: {tail[0]}")
+    return _parse_importtime(result.stderr)
+
+
+def report(label: str, rows: List[Tuple[int, int, str]], top: int) -> None:
+    # Top-level imports are the rows with no indentation in the module column
+    roots = [(cumulative, module.strip()) for _, cumulative, module in rows if not module.startswith("  ")]
+    total_ms = sum(cumulative for cumulative, _ in roots) / 1000
+
+    per_package: Dict[str, int] = defaultdict(int)
+    for self_us, _, module in rows:
+        per_package[module.strip().split(".")[0]] += self_us
+
+    print(f"\n{label}: {total_ms:.1f} ms total import time, {len(rows)} modules")
+    print(f"  {'package':<28} self time")
+    for package, self_us in sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"  {package:<28} {self_us / 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=10, help="number of packages to list")
+    parser.add_argument("--agent", help="also measure loading this agent from agents/<name>.json")
+    args = parser.parse_args()
+
+    targets = dict(TARGETS)
+    if args.agent:
+        targets[f"agent load ({args.agent})"] = (
+            f"from src.agent import ZerePyAgent; ZerePyAgent({args.agent!r})"
+        )
+
+    for label, code in targets.items():
+        try:
+            report(label, measure(code), args.top)
+        except RuntimeError as e:
+            print(f"\n{label}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark: per-call latency of bare `requests.get` vs the pooled
+`src.transport` session against a local keep-alive stub server.
+
+Usage (from the ZerePy directory):
+    python -m benchmarks.transport_benchmark --calls 500
+
+The stub speaks plain HTTP on localhost, so the numbers only show the TCP
+connect + pool overhead; against real TLS endpoints the gap is larger.
+"""
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src import transport
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # required for keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _time_calls(call, url: str, calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = call(url)
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<18} mean {statistics.mean(latencies):7.3f} ms   "
+          f"p50 {statistics.median(latencies):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/models"
+
+    try:
+        # Warm up both paths once so imports and the first pool connection don't skew results
+        requests.get(url)
+        transport.get(url)
+
+        bare = _time_calls(requests.get, url, args.calls)
+        pooled = _time_calls(transport.get, url, args.calls)
+
+        print(f"{args.calls} GET calls against {url}")
+        _report("requests.get", bare)
+        _report("transport.get", pooled)
+        print(f"speedup (mean)     {statistics.mean(bare) / statistics.mean(pooled):.2f}x")
+    finally:
+        server.shutdown()
+        transport.close_all()
+
+
+if __name__ == "__main__":
+    main()
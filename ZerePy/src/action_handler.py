@@ -1,12 +1,50 @@
+import importlib
 import logging
 
 logger = logging.getLogger("action_handler")
 
-action_registry = {}    
+# Connection config name -> module registering that connection's agent actions.
+# Imported lazily so agents only pay for the SDKs their config actually uses.
+ACTION_MODULES = {
+    "twitter": "src.actions.twitter_actions",
+    "echochambers": "src.actions.echochamber_actions",
+    "solana": "src.actions.solana_actions",
+    "sonic": "src.actions.sonic_actions",
+    "ethereum": "src.actions.ethereum_actions",
+    "eternalai": "src.actions.eternalai_actions",
+}
 
-def register_action(action_name):
+# Placeholder in `action_connections` for whichever LLM provider the agent uses
+LLM_CONNECTION = "llm"
+
+action_registry = {}
+action_connections = {}
+# action name -> callable(agent) returning the earliest unix time the action can do useful work
+action_eligibility = {}
+# action name -> callable(agent) producing the text the action posts, so it can be generated ahead of time
+action_pregenerators = {}
+# (connection, connection action) -> callables(agent, outbox entry) run once that write has gone through
+write_commit_hooks = {}
+
+def register_action(action_name, connections=(), next_eligible=None, pregenerate=None):
     def decorator(func):
+        # Agents of every connection share this registry, so one name must mean one action
+        previous = action_registry.get(action_name)
+        if previous is not None and previous.__module__ != func.__module__:
+            logger.warning(f"Action {action_name} from {func.__module__} replaces the one from {previous.__module__}")
         action_registry[action_name] = func
+        action_connections[action_name] = tuple(connections)
+        if next_eligible:
+            action_eligibility[action_name] = next_eligible
+        if pregenerate:
+            action_pregenerators[action_name] = pregenerate
+        return func
+    return decorator
+
+def on_write_committed(connection_name, *connection_actions):
+    def decorator(func):
+        for connection_action in connection_actions:
+            write_commit_hooks.setdefault((connection_name, connection_action), []).append(func)
         return func
     return decorator
 
@@ -16,5 +54,10 @@ def execute_action(agent, action_name, **kwargs):
     else:
         logger.error(f"Action {action_name} not found")
         return None
-    
 
+def load_actions(connection_names):
+    """Import the action modules for the given connection names"""
+    for name in connection_names:
+        module_name = ACTION_MODULES.get(name)
+        if module_name:
+            importlib.import_module(module_name)
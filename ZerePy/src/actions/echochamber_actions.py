@@ -1,45 +1,72 @@
+import hashlib
 import time,random
-from src.action_handler import register_action
+from src.action_handler import register_action, on_write_committed, LLM_CONNECTION
 from src.prompts import REPLY_ECHOCHAMBER_PROMPT, POST_ECHOCHAMBER_PROMPT
 
-@register_action("post-echochambers")
+def last_message_time(agent) -> float:
+    """When the last room message went out; one still waiting in the outbox counts as sent"""
+    queued_at = (agent.outbox.pending_since("echochambers", ("send-message",), key_prefix="post-echochambers:")
+                 if agent.outbox else None)
+    return max(agent.state.get("echochambers_last_message", 0), queued_at or 0)
+
+
+@on_write_committed("echochambers", "send-message")
+def record_message(agent, entry):
+    # Replies go through send-message too; only posts count toward message_interval
+    if entry.idempotency_key and entry.idempotency_key.startswith("post-echochambers:"):
+        agent.state["echochambers_last_message"] = entry.committed_at
+
+
+def next_message_time(agent) -> float:
+    """Earliest time a new room message may be posted without breaking message_interval"""
+    return last_message_time(agent) + agent.echochambers_message_interval
+
+
+def compose_echochambers_message(agent):
+    """Generate a new room message from the room topic, tags and our previous posts"""
+    room_info = agent.state.get("room_info")
+    if not room_info:
+        return None
+
+    previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
+    previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
+    agent.logger.info(f"Found {len(previous_messages)} messages in post history")
+
+    prompt = POST_ECHOCHAMBER_PROMPT.format(
+        room_topic=room_info['topic'],
+        tags=", ".join(room_info['tags']),
+        previous_content=previous_content
+    )
+    return agent.prompt_llm(prompt, task="post-echochambers")
+
+
+@register_action("post-echochambers", connections=("echochambers", LLM_CONNECTION),
+                 next_eligible=next_message_time, pregenerate=compose_echochambers_message)
 def post_echochambers(agent, **kwargs):
     current_time = time.time()
 
     # Initialize state
-    if "echochambers_last_message" not in agent.state:
-        agent.state["echochambers_last_message"] = 0
     if "echochambers_replied_messages" not in agent.state:
         agent.state["echochambers_replied_messages"] = set()
     
-    if current_time - agent.state["echochambers_last_message"] > agent.echochambers_message_interval:
+    if current_time - last_message_time(agent) > agent.echochambers_message_interval:
         agent.logger.info("\n📝 GENERATING NEW ECHOCHAMBERS MESSAGE")
         
         # Generate message based on room topic and tags
-        previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
-        previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
-        agent.logger.info(f"Found {len(previous_messages)} messages in post history")
-        
-        prompt  = POST_ECHOCHAMBER_PROMPT.format(
-            room_topic=agent.state['room_info']['topic'],
-            tags=", ".join(agent.state['room_info']['tags']),
-            previous_content=previous_content
-        )
-        message = agent.prompt_llm(prompt)
+        message = agent.generate_post("post-echochambers")
         
         if message:
             agent.logger.info(f"\n🚀 Posting message: '{message[:69]}...'")
-            agent.connection_manager.perform_action(
-                connection_name="echochambers",
-                action_name="send-message",
-                params=[message]  # Pass as list of values
-            )
-            agent.state["echochambers_last_message"] = current_time
-            agent.logger.info("✅ Message posted successfully!")
+            digest = hashlib.sha256(message.encode("utf-8")).hexdigest()[:32]
+            if not agent.perform_write("echochambers", "send-message", [message],
+                                       idempotency_key=f"post-echochambers:{digest}"):
+                agent.logger.error("❌ Failed to post message.")
+                return False
+            agent.logger.info("✅ Message sent to the outbox!" if agent.outbox else "✅ Message posted successfully!")
             return True
     return False
 
-@register_action("reply-echochambers")
+@register_action("reply-echochambers", connections=("echochambers", LLM_CONNECTION))
 def reply_echochambers(agent, **kwargs):
     agent.logger.info("\n🔍 CHECKING FOR MESSAGES TO REPLY TO")
     
@@ -87,17 +114,16 @@ def reply_echochambers(agent, **kwargs):
                 tags=", ".join(agent.state['room_info']['tags']),
                 username_prompt=username_prompt
             )
-            reply = agent.prompt_llm(prompt)
+            reply = agent.prompt_llm(prompt, task="reply-echochambers")
             
             if reply:
                 agent.logger.info(f"\n🚀 Posting reply: '{reply[:69]}...'")
-                agent.connection_manager.perform_action(
-                    connection_name="echochambers",
-                    action_name="send-message",
-                    params=[reply]
-                )
+                if not agent.perform_write("echochambers", "send-message", [reply],
+                                           idempotency_key=f"reply-echochambers:{message_id}"):
+                    agent.logger.error("❌ Failed to post reply.")
+                    return False
                 agent.state["echochambers_replied_messages"].add(message_id)
-                agent.logger.info("✅ Reply posted successfully!")
+                agent.logger.info("✅ Reply sent to the outbox!" if agent.outbox else "✅ Reply posted successfully!")
                 return True
     else:
         agent.logger.info("No messages in history")
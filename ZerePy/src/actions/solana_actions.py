@@ -3,7 +3,7 @@ from src.action_handler import register_action
 
 logger = logging.getLogger("agent")
 
-@register_action("sol-transfer")
+@register_action("sol-transfer", connections=("solana",))
 def sol_transfer(agent, **kwargs):
     """Transfer SOL or SPL tokens"""
     agent.logger.info("\n💸 INITIATING TRANSFER")
@@ -23,7 +23,7 @@ def sol_transfer(agent, **kwargs):
         agent.logger.error(f"❌ Transfer failed: {str(e)}")
         return False
 
-@register_action("sol-swap")
+@register_action("sol-swap", connections=("solana",))
 def sol_swap(agent, **kwargs):
     """Swap tokens using Jupiter"""
     agent.logger.info("\n🔄 INITIATING TOKEN SWAP")
@@ -44,7 +44,7 @@ def sol_swap(agent, **kwargs):
         agent.logger.error(f"❌ Swap failed: {str(e)}")
         return False
 
-@register_action("sol-balance")
+@register_action("sol-balance", connections=("solana",))
 def sol_balance(agent, **kwargs):
     """Check SOL or token balance"""
     agent.logger.info("\n💰 CHECKING BALANCE")
@@ -60,7 +60,7 @@ def sol_balance(agent, **kwargs):
         agent.logger.error(f"❌ Balance check failed: {str(e)}")
         return None
 
-@register_action("sol-stake")
+@register_action("sol-stake", connections=("solana",))
 def sol_stake(agent, **kwargs):
     """Stake SOL"""
     agent.logger.info("\n🎯 INITIATING SOL STAKE")
@@ -76,7 +76,7 @@ def sol_stake(agent, **kwargs):
         agent.logger.error(f"❌ Staking failed: {str(e)}")
         return False
 
-@register_action("sol-lend")
+@register_action("sol-lend", connections=("solana",))
 def sol_lend(agent, **kwargs):
     """Lend assets using Lulo"""
     agent.logger.info("\n🏦 INITIATING LENDING")
@@ -92,7 +92,7 @@ def sol_lend(agent, **kwargs):
         agent.logger.error(f"❌ Lending failed: {str(e)}")
         return False
 
-@register_action("sol-request-funds")
+@register_action("sol-request-funds", connections=("solana",))
 def request_faucet_funds(agent, **kwargs):
     """Request faucet funds for testing"""
     agent.logger.info("\n🚰 REQUESTING FAUCET FUNDS")
@@ -108,7 +108,7 @@ def request_faucet_funds(agent, **kwargs):
         agent.logger.error(f"❌ Faucet request failed: {str(e)}")
         return False
 
-@register_action("sol-deploy-token")
+@register_action("sol-deploy-token", connections=("solana",))
 def sol_deploy_token(agent, **kwargs):
     """Deploy a new token"""
     agent.logger.info("\n🪙 DEPLOYING NEW TOKEN")
@@ -124,7 +124,7 @@ def sol_deploy_token(agent, **kwargs):
         agent.logger.error(f"❌ Token deployment failed: {str(e)}")
         return False
 
-@register_action("sol-get-price")
+@register_action("sol-get-price", connections=("solana",))
 def sol_get_price(agent, **kwargs):
     """Get token price"""
     agent.logger.info("\n💲 FETCHING TOKEN PRICE")
@@ -140,7 +140,7 @@ def sol_get_price(agent, **kwargs):
         agent.logger.error(f"❌ Price fetch failed: {str(e)}")
         return None
 
-@register_action("sol-get-tps")
+@register_action("sol-get-tps", connections=("solana",))
 def sol_get_tps(agent, **kwargs):
     """Get current Solana TPS"""
     agent.logger.info("\n📊 FETCHING CURRENT TPS")
@@ -156,7 +156,7 @@ def sol_get_tps(agent, **kwargs):
         agent.logger.error(f"❌ TPS fetch failed: {str(e)}")
         return None
 
-@register_action("sol-get-token-by-ticker")
+@register_action("sol-get-token-by-ticker", connections=("solana",))
 def get_token_data_by_ticker(agent, **kwargs):
     """Get token data by ticker"""
     agent.logger.info("\n🔍 FETCHING TOKEN DATA BY TICKER")
@@ -172,7 +172,7 @@ def get_token_data_by_ticker(agent, **kwargs):
         agent.logger.error(f"❌ Token data fetch failed: {str(e)}")
         return None
 
-@register_action("sol-get-token-by-address")
+@register_action("sol-get-token-by-address", connections=("solana",))
 def get_token_data_by_address(agent, **kwargs):
     """Get token data by address"""
     agent.logger.info("\n🔍 FETCHING TOKEN DATA BY ADDRESS")
@@ -188,7 +188,7 @@ def get_token_data_by_address(agent, **kwargs):
         agent.logger.error(f"❌ Token data fetch failed: {str(e)}")
         return None
 
-@register_action("sol-launch-pump-token")
+@register_action("sol-launch-pump-token", connections=("solana",))
 def launch_pump_fun_token(agent, **kwargs):
     """Launch a Pump & Fun token"""
     agent.logger.info("\n🚀 LAUNCHING PUMP & FUN TOKEN")
@@ -1,82 +1,99 @@
-import os
+import hashlib
 import time
 
-from dotenv import load_dotenv
-
-from src.action_handler import register_action
+from src.action_handler import register_action, on_write_committed, LLM_CONNECTION
 from src.helpers import print_h_bar
 from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
-import requests
-
-load_dotenv()
-api_key = os.getenv("STABILITY_AI_API_KEY")
-
-# Check if API key is loaded
-if not api_key:
-    raise ValueError("API key is missing. Ensure STABILITY_AI_API_KEY is set in the .env file.")
-
-def generate_image(prompt: str, output_path: str):
-    response = requests.post(
-        f"https://api.stability.ai/v2beta/stable-image/generate/ultra",
-        headers={
-            "authorization": f"Bearer {api_key}",
-            "accept": "image/*"
-        },
-        files={"none": ''},
-        data={
-            "prompt": prompt,
-            "output_format": 'jpeg',
-        },
-    )
-
-    if response.status_code == 200:
-        with open(output_path, 'wb') as file:
-            file.write(response.content)
-        return output_path
-    else:
-        raise Exception(str(response.json()))
 
 
-@register_action("post-tweet-with-image")
+def twitter_ready_at(agent, connection_action: str) -> float:
+    """Earliest time a Twitter connection action fits its endpoint's rate-limit budget"""
+    twitter = agent.connection_manager.connections.get("twitter")
+    return twitter.ready_at(connection_action) if twitter else 0
+
+
+# Connection actions that publish a new tweet
+TWEET_ACTIONS = ("post-tweet", "post-tweet-with-media")
+
+
+def last_tweet_time(agent) -> float:
+    """When the last tweet went out; a tweet still waiting in the outbox counts as posted"""
+    queued_at = agent.outbox.pending_since("twitter", TWEET_ACTIONS) if agent.outbox else None
+    return max(agent.state.get("last_tweet_time", 0), queued_at or 0)
+
+
+@on_write_committed("twitter", *TWEET_ACTIONS)
+def record_tweet(agent, entry):
+    agent.state["last_tweet_time"] = entry.committed_at
+
+
+def text_key(action: str, text: str) -> str:
+    """Idempotency key for posting `text`; Twitter refuses the same text twice anyway"""
+    return f"{action}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]}"
+
+
+def pop_timeline_tweet(agent):
+    """Take the next queued timeline tweet, or None when there is none"""
+    tweets = agent.state.get("timeline_tweets")
+    # Tasks run concurrently, so don't check-then-pop; list.pop itself is atomic
+    try:
+        return tweets.pop(0) if tweets is not None else None
+    except IndexError:
+        return None
+
+
+def next_tweet_time(agent) -> float:
+    """Earliest time a new tweet may be posted without breaking tweet_interval or the rate limit"""
+    return max(last_tweet_time(agent) + agent.tweet_interval,
+               twitter_ready_at(agent, "post-tweet"))
+
+
+def next_reply_time(agent) -> float:
+    return twitter_ready_at(agent, "reply-to-tweet")
+
+
+def next_like_time(agent) -> float:
+    return twitter_ready_at(agent, "like-tweet")
+
+
+def compose_tweet(agent) -> str:
+    """Generate the text of a new tweet"""
+    return agent.prompt_llm(POST_TWEET_PROMPT.format(agent_name=agent.name), task="post-tweet")
+
+
+@register_action("post-tweet-with-image", connections=("twitter", LLM_CONNECTION),
+                 next_eligible=next_tweet_time, pregenerate=compose_tweet)
 def post_tweet_with_image(agent, **kwargs):
     current_time = time.time()
 
-    if "last_tweet_time" not in agent.state:
-        last_tweet_time = 0
-    else:
-        last_tweet_time = agent.state["last_tweet_time"]
-
-    if current_time - last_tweet_time >= agent.tweet_interval:
+    if current_time - last_tweet_time(agent) >= agent.tweet_interval:
         agent.logger.info("\n📝 GENERATING NEW TWEET WITH IMAGE")
         print_h_bar()
 
+        # Usually pre-rendered already; otherwise it renders while the tweet text is generated
+        agent.logger.info("\n🎨 Generating image with Stable Diffusion...")
+        image_future = agent.image_service.next_post_image()
+
         # Generate tweet text
-        text_prompt = POST_TWEET_PROMPT.format(agent_name=agent.name)
-        tweet_text = agent.prompt_llm(text_prompt)
+        tweet_text = agent.generate_post("post-tweet-with-image")
 
-        # Generate image using Stable Diffusion
-        # Usage in tweet posting function
         try:
-            agent.logger.info("\n🎨 Generating image with Stable Diffusion...")
-            prompt = "Astronaut in a jungle, cold color palette, muted colors, detailed, 8k"
-            image_path = generate_image(prompt, "./generated_image.jpeg")
-            agent.logger.info(f"\n📷 Image generated and saved to: {image_path}")
+            image = image_future.result()
+            agent.logger.info(f"\n📷 Image generated ({len(image)} bytes)")
         except Exception as e:
             agent.logger.error(f"\n❌ Failed to generate image: {e}")
             return False
 
-        if tweet_text and image_path:
+        if tweet_text and image:
             agent.logger.info("\n🚀 Posting tweet with image:")
             agent.logger.info(f"'{tweet_text}'")
-            agent.logger.info(f"📷 Image path: {image_path}")
 
-            agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="post-tweet-with-media",
-                params=[tweet_text, image_path]
-            )
-            agent.state["last_tweet_time"] = current_time
-            agent.logger.info("\n✅ Tweet with image posted successfully!")
+            if not agent.perform_write("twitter", "post-tweet-with-media", [tweet_text, image],
+                                       idempotency_key=text_key("post-tweet-with-media", tweet_text)):
+                agent.logger.error("\n❌ Failed to post tweet with image.")
+                return False
+            agent.logger.info("\n✅ Tweet with image sent to the outbox!" if agent.outbox
+                              else "\n✅ Tweet with image posted successfully!")
             return True
         else:
             agent.logger.error("\n❌ Failed to generate tweet or image.")
@@ -86,43 +103,38 @@ def post_tweet_with_image(agent, **kwargs):
         return False
 
 
-@register_action("post-tweet")
+@register_action("post-tweet", connections=("twitter", LLM_CONNECTION),
+                 next_eligible=next_tweet_time, pregenerate=compose_tweet)
 def post_tweet(agent, **kwargs):
     current_time = time.time()
 
-    if ("last_tweet_time" not in agent.state):
-        last_tweet_time = 0
-    else:
-        last_tweet_time = agent.state["last_tweet_time"]
-
-    if current_time - last_tweet_time >= agent.tweet_interval:
+    if current_time - last_tweet_time(agent) >= agent.tweet_interval:
         agent.logger.info("\n📝 GENERATING NEW TWEET")
         print_h_bar()
 
-        prompt = POST_TWEET_PROMPT.format(agent_name=agent.name)
-        tweet_text = agent.prompt_llm(prompt)
+        tweet_text = agent.generate_post("post-tweet")
 
         if tweet_text:
             agent.logger.info("\n🚀 Posting tweet:")
             agent.logger.info(f"'{tweet_text}'")
-            agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="post-tweet",
-                params=[tweet_text]
-            )
-            agent.state["last_tweet_time"] = current_time
-            agent.logger.info("\n✅ Tweet posted successfully!")
+            # last_tweet_time is only moved once the tweet has actually gone out (see record_tweet)
+            if not agent.perform_write("twitter", "post-tweet", [tweet_text],
+                                       idempotency_key=text_key("post-tweet", tweet_text)):
+                agent.logger.error("\n❌ Failed to post tweet.")
+                return False
+            agent.logger.info("\n✅ Tweet sent to the outbox!" if agent.outbox else "\n✅ Tweet posted successfully!")
             return True
+        agent.logger.error("\n❌ Failed to generate tweet.")
+        return False
     else:
         agent.logger.info("\n👀 Delaying post until tweet interval elapses...")
         return False
 
 
-@register_action("reply-to-tweet")
+@register_action("reply-to-tweet", connections=("twitter", LLM_CONNECTION), next_eligible=next_reply_time)
 def reply_to_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(
-            agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
+    tweet = pop_timeline_tweet(agent)
+    if tweet is not None:
         tweet_id = tweet.get('id')
         if not tweet_id:
             return
@@ -131,26 +143,25 @@ def reply_to_tweet(agent, **kwargs):
 
         base_prompt = REPLY_TWEET_PROMPT.format(tweet_text=tweet.get('text'))
         system_prompt = agent._construct_system_prompt()
-        reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt)
+        reply_text = agent.prompt_llm(prompt=base_prompt, system_prompt=system_prompt, task="reply-to-tweet")
 
         if reply_text:
             agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
-            agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="reply-to-tweet",
-                params=[tweet_id, reply_text]
-            )
-            agent.logger.info("✅ Reply posted successfully!")
+            if not agent.perform_write("twitter", "reply-to-tweet", [tweet_id, reply_text],
+                                       idempotency_key=f"reply-to-tweet:{tweet_id}"):
+                agent.logger.error("❌ Failed to post reply.")
+                return False
+            agent.logger.info("✅ Reply sent to the outbox!" if agent.outbox else "✅ Reply posted successfully!")
             return True
     else:
         agent.logger.info("\n👀 No tweets found to reply to...")
         return False
 
 
-@register_action("like-tweet")
+@register_action("like-tweet", connections=("twitter",), next_eligible=next_like_time)
 def like_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
+    tweet = pop_timeline_tweet(agent)
+    if tweet is not None:
         tweet_id = tweet.get('id')
         if not tweet_id:
             return False
@@ -168,12 +179,10 @@ def like_tweet(agent, **kwargs):
 
         agent.logger.info(f"\n👍 LIKING TWEET: {tweet.get('text', '')[:50]}...")
 
-        agent.connection_manager.perform_action(
-            connection_name="twitter",
-            action_name="like-tweet",
-            params=[tweet_id]
-        )
-        agent.logger.info("✅ Tweet liked successfully!")
+        if not agent.perform_write("twitter", "like-tweet", [tweet_id], idempotency_key=f"like-tweet:{tweet_id}"):
+            agent.logger.error("❌ Failed to like tweet.")
+            return False
+        agent.logger.info("✅ Like sent to the outbox!" if agent.outbox else "✅ Tweet liked successfully!")
         return True
     else:
         agent.logger.info("\n👀 No tweets found to like...")
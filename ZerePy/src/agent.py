@@ -1,17 +1,22 @@
+import asyncio
 import json
-import random
 import time
 import logging
 import os
+import threading
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 from dotenv import load_dotenv
-from src.connection_manager import ConnectionManager
+from src.connection_manager import ConnectionManager, SharedConnections
 from src.helpers import print_h_bar
-from src.action_handler import execute_action
-import src.actions.twitter_actions  
-import src.actions.echochamber_actions
-import src.actions.solana_actions
-from datetime import datetime
+from src.action_handler import action_pregenerators, execute_action, load_actions
+from src.agent_state import AgentState
+from src.content_buffer import ContentBuffer
+from src.events import EventBus
+from src.image_service import ImageService
+from src.llm_cache import LLMCache
+from src.outbox import Outbox, OutboxEntry, run_commit_hooks, COMMITTED
+from src.scheduler import TaskScheduler
 
 REQUIRED_FIELDS = ["name", "bio", "traits", "examples", "loop_delay", "config", "tasks"]
 
@@ -20,7 +25,8 @@ logger = logging.getLogger("agent")
 class ZerePyAgent:
     def __init__(
             self,
-            agent_name: str
+            agent_name: str,
+            shared_connections: Optional[SharedConnections] = None
     ):
         try:
             agent_path = Path("agents") / f"{agent_name}.json"
@@ -30,13 +36,28 @@ class ZerePyAgent:
             if missing_fields:
                 raise KeyError(f"Missing required fields: {', '.join(missing_fields)}")
 
+            self.agent_name = agent_name
             self.name = agent_dict["name"]
             self.bio = agent_dict["bio"]
             self.traits = agent_dict["traits"]
             self.examples = agent_dict["examples"]
             self.example_accounts = agent_dict["example_accounts"]
             self.loop_delay = agent_dict["loop_delay"]
-            self.connection_manager = ConnectionManager(agent_dict["config"])
+            load_actions(config["name"] for config in agent_dict["config"])
+            # Agents hosted side by side each keep their own record of timeline tweets already read
+            for config in agent_dict["config"]:
+                if config["name"] == "twitter":
+                    config.setdefault("seen_index_scope", agent_name)
+            self.connection_manager = ConnectionManager(
+                agent_dict["config"],
+                health_refresh_interval=agent_dict.get("health_refresh_interval"),
+                shared=shared_connections
+            )
+            # Activity feed for dashboards (the server streams it at /events)
+            self.events = EventBus()
+            self.connection_manager.events = self.events
+            if agent_dict.get("llm_cache"):
+                self.connection_manager.llm_cache = LLMCache.from_config(agent_dict["llm_cache"])
             self.use_time_based_weights = agent_dict["use_time_based_weights"]
             self.time_based_multipliers = agent_dict["time_based_multipliers"]
 
@@ -48,6 +69,13 @@ class ZerePyAgent:
                 self.tweet_interval = twitter_config.get("tweet_interval", 900)
                 self.own_tweet_replies_count = twitter_config.get("own_tweet_replies_count", 2)
 
+            # Stability AI renders for image tweets, cached and pre-rendered off the hot path
+            self.image_service = None
+            if twitter_config:
+                self.image_service = ImageService.from_config(
+                    agent_dict.get("image_service", {}), debug_path=twitter_config.get("image_debug_path")
+                )
+
             # Extract Echochambers config
             echochambers_config = next((config for config in agent_dict["config"] if config["name"] == "echochambers"), None)
             if echochambers_config:
@@ -64,8 +92,19 @@ class ZerePyAgent:
             self.task_weights = [task.get("weight", 0) for task in self.tasks]
             self.logger = logging.getLogger("agent")
 
-            # Set up empty agent state
-            self.state = {}
+            # Optional pre-generated posts, refilled in the background while the loop runs
+            self.content_buffer = None
+            if agent_dict.get("content_buffer"):
+                self.content_buffer = ContentBuffer.from_config(self, agent_dict["content_buffer"])
+
+            # Write actions go through a durable outbox unless the agent file sets "outbox": null
+            outbox_config = agent_dict.get("outbox", {})
+            self.outbox = Outbox.from_config(self, outbox_config) if outbox_config is not None else None
+
+            # Agent state; the keys in STATE_KEYS are restored from and persisted to the state backend
+            self.state = AgentState.from_config(agent_name, agent_dict.get("state", {}))
+            # Task the loop is running right now, if any
+            self.current_task = None
 
         except Exception as e:
             logger.error("Could not load ZerePy agent")
@@ -76,7 +115,9 @@ class ZerePyAgent:
         llm_providers = self.connection_manager.get_model_providers()
         if not llm_providers:
             raise ValueError("No configured LLM provider found")
-        self.model_provider = llm_providers[0]
+        # The router fronts every other provider, so it wins when configured
+        self.model_provider = "router" if "router" in llm_providers else llm_providers[0]
+        self.is_llm_set = True
 
         # Load Twitter username for self-reply detection if Twitter tasks exist
         if any("tweet" in task["name"] for task in self.tasks):
@@ -135,33 +176,124 @@ class ZerePyAgent:
         
         return weights
 
-    def prompt_llm(self, prompt: str, system_prompt: str = None) -> str:
+    def prompt_llm(self, prompt: str, system_prompt: str = None, task: str = None, bypass_cache: bool = False) -> str:
         """Generate text using the configured LLM provider"""
         system_prompt = system_prompt or self._construct_system_prompt()
 
         return self.connection_manager.perform_action(
             connection_name=self.model_provider,
             action_name="generate-text",
+            params=[prompt, system_prompt],
+            task=task,
+            bypass_cache=bypass_cache
+        )
+
+    def prompt_llm_stream(self, prompt: str, system_prompt: str = None) -> Optional[Iterator[str]]:
+        """Stream text from the configured LLM provider; returns None if the stream could not start"""
+        system_prompt = system_prompt or self._construct_system_prompt()
+
+        return self.connection_manager.perform_action(
+            connection_name=self.model_provider,
+            action_name="generate-text-stream",
             params=[prompt, system_prompt]
         )
 
+    def generate_post(self, task_name: str) -> Optional[str]:
+        """Text for a posting task: a pre-generated candidate if one is buffered, else a fresh generation"""
+        if self.content_buffer:
+            text = self.content_buffer.take(task_name)
+            if text:
+                logger.info(f"Using pre-generated content for {task_name}")
+                return text
+        return action_pregenerators[task_name](self)
+
     def perform_action(self, connection: str, action: str, **kwargs) -> None:
         return self.connection_manager.perform_action(connection, action, **kwargs)
-    
-    def select_action(self, use_time_based_weights: bool = False) -> dict:
-        task_weights = [weight for weight in self.task_weights.copy()]
-        
-        if use_time_based_weights:
-            current_hour = datetime.now().hour
-            task_weights = self._adjust_weights_for_time(current_hour, task_weights)
-        
-        return random.choices(self.tasks, weights=task_weights, k=1)[0]
 
-    def loop(self):
-        """Main agent loop for autonomous behavior"""
+    def perform_write(self, connection: str, action: str, params: list,
+                      idempotency_key: str = None) -> Optional[OutboxEntry]:
+        """
+        Send a write action (post, reply, like, message) through the outbox.
+
+        Returns the outbox entry once the write is queued (or the entry
+        already recorded under the same idempotency key); a queued write can
+        still fail, so check its `status`. Without an outbox the write runs
+        inline and a committed entry means it succeeded. None means the
+        inline write failed. Either way the action's commit hooks run only
+        after the write has gone through.
+        """
+        if self.outbox:
+            # Writes from the server can arrive while the loop (which usually starts the outbox) is stopped
+            self.outbox.start()
+            entry, created = self.outbox.enqueue(connection, action, params, idempotency_key=idempotency_key)
+            if not created:
+                logger.info(f"{connection} {action} is already in the outbox ({idempotency_key})")
+            return entry
+
+        result = self.connection_manager.perform_action(connection_name=connection, action_name=action,
+                                                        params=params)
+        if result is None or (isinstance(result, dict) and result.get("error")):
+            return None
+        entry = OutboxEntry(
+            id="", agent=self.agent_name, connection=connection, action=action, params=params,
+            idempotency_key=idempotency_key, status=COMMITTED, attempts=1, result=result, committed_at=time.time()
+        )
+        run_commit_hooks(self, entry)
+        return entry
+    
+    def _replenish_inputs(self) -> None:
+        """Refill the state inputs (timeline, room info) that tasks consume"""
+        # TODO: Add more inputs to complexify agent behavior
+        if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
+            if any("tweet" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING TIMELINE")
+                self.state["timeline_tweets"] = self.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="read-timeline",
+                    params=[]
+                )
+
+        if "room_info" not in self.state or self.state["room_info"] is None:
+            if any("echochambers" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
+                self.state["room_info"] = self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-info",
+                    params={}
+                )
+
+    def prepare_loop(self) -> None:
+        """Set up the LLM provider and start the background work the loop draws on"""
         if not self.is_llm_set:
             self._setup_llm_provider()
 
+        if self.content_buffer:
+            self.content_buffer.start()
+        if self.outbox:
+            self.outbox.start()
+        if self.image_service and any(task["name"] == "post-tweet-with-image" and task.get("weight", 0) > 0
+                                      for task in self.tasks):
+            self.image_service.warm_up()
+
+    def finish_loop(self) -> None:
+        """Stop the background work prepare_loop started; a later write restarts the outbox"""
+        if self.content_buffer:
+            self.content_buffer.stop()
+        if self.outbox:
+            self.outbox.stop()
+
+    def close(self) -> None:
+        """Stop every background thread of the agent and write out its state"""
+        self.finish_loop()
+        self.connection_manager.health.stop_refresher()
+        self.connection_manager.close()
+        if self.image_service:
+            self.image_service.stop()
+        self.state.close()
+
+    def _start_countdown(self) -> None:
+        self.prepare_loop()
+
         logger.info("\n🚀 Starting agent loop...")
         logger.info("Press Ctrl+C at any time to stop the loop.")
         print_h_bar()
@@ -172,48 +304,60 @@ class ZerePyAgent:
             logger.info(f"{i}...")
             time.sleep(1)
 
+    def run_next_action(self, scheduler: TaskScheduler, stop_event: threading.Event = None) -> Optional[Tuple[str, bool]]:
+        """
+        Wait for the next due task, run it and reschedule it.
+
+        Returns:
+            (action_name, success), or None if `stop_event` was set while waiting
+        """
+        # CHOOSE AN ACTION
+        # TODO: Add agentic action selection
+        action_name = scheduler.wait_for_next(stop_event)
+        if action_name is None:
+            return None
+
+        success = False
+        self.current_task = action_name
+        self.events.publish("task_started", task=action_name)
+        try:
+            # REPLENISH INPUTS
+            self._replenish_inputs()
+
+            # PERFORM ACTION
+            success = bool(execute_action(self, action_name))
+        except Exception as e:
+            logger.error(f"\n❌ Error in agent loop iteration: {e}")
+            self.events.publish("error", task=action_name, error=str(e))
+        finally:
+            self.events.publish("task_finished", task=action_name, success=success)
+            self.current_task = None
+            scheduler.complete(action_name, success)
+            print_h_bar()
+        return action_name, success
+
+    def loop(self):
+        """Main agent loop for autonomous behavior"""
         try:
+            self._start_countdown()
+            scheduler = TaskScheduler(self)
             while True:
-                success = False
-                try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
-
-                    if "room_info" not in self.state or self.state["room_info"] is None:
-                        if any("echochambers" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
-                            self.state["room_info"] = self.connection_manager.perform_action(
-                                connection_name="echochambers",
-                                action_name="get-room-info",
-                                params={}
-                            )
-
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
-
-                    # PERFORM ACTION
-                    success = execute_action(self, action_name)
-
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
-
-                except Exception as e:
-                    logger.error(f"\n❌ Error in agent loop iteration: {e}")
-                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
+                self.run_next_action(scheduler)
 
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
-            return
\ No newline at end of file
+            return
+        finally:
+            self.finish_loop()
+
+    def loop_async(self):
+        """Agent loop that runs every task concurrently on an asyncio runtime"""
+        from src.async_runtime import AsyncAgentRuntime
+
+        try:
+            self._start_countdown()
+            asyncio.run(AsyncAgentRuntime(self).run())
+        except KeyboardInterrupt:
+            logger.info("\n🛑 Agent loop stopped by user.")
+        finally:
+            self.finish_loop()
@@ -0,0 +1,78 @@
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.agent import ZerePyAgent
+from src.connection_manager import SharedConnections
+
+logger = logging.getLogger("agent_host")
+
+
+class AgentHost:
+    """
+    Several ZerePyAgent instances in one process, addressed by agent file name.
+
+    Each agent keeps its own state, scheduler inputs, caches and event bus.
+    What is safe to share is shared: HTTP calls already go through the
+    process-wide pooled transport, and LLM provider connections with an
+    identical config are a single instance (see SharedConnections).
+    """
+
+    def __init__(self, agents_dir: str = "agents"):
+        self.agents_dir = Path(agents_dir)
+        self.shared = SharedConnections()
+        self._agents: Dict[str, ZerePyAgent] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> List[str]:
+        """Agent files that can be loaded"""
+        if not self.agents_dir.exists():
+            return []
+        return sorted(path.stem for path in self.agents_dir.glob("*.json") if path.stem != "general")
+
+    def load(self, name: str) -> ZerePyAgent:
+        """Load (or reload) an agent from agents/<name>.json"""
+        if not (self.agents_dir / f"{name}.json").exists():
+            raise FileNotFoundError(f"Agent file not found: {name}")
+        agent = ZerePyAgent(name, shared_connections=self.shared)
+        with self._lock:
+            previous = self._agents.get(name)
+            self._agents[name] = agent
+        if previous:
+            self._release(previous)
+        logger.info(f"\n✅ Loaded agent {name} ({agent.name})")
+        return agent
+
+    def unload(self, name: str) -> None:
+        with self._lock:
+            agent = self._agents.pop(name, None)
+        if agent is None:
+            raise KeyError(f"Agent {name} is not loaded")
+        self._release(agent)
+
+    @staticmethod
+    def _release(agent: ZerePyAgent) -> None:
+        """Stop the agent's background threads and write out its state"""
+        agent.close()
+
+    def get(self, name: str) -> Optional[ZerePyAgent]:
+        with self._lock:
+            return self._agents.get(name)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return list(self._agents)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._agents
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._agents)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            agents = {name: agent.name for name, agent in self._agents.items()}
+        return {"agents": agents, "shared_connections": len(self.shared)}
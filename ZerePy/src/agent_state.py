@@ -0,0 +1,271 @@
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("agent_state")
+
+DEFAULT_STATE_PATH = "~/.zerepy/agent_state.sqlite"
+# Seconds between write-behind flushes of changed keys
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class StateKey:
+    """
+    A state key that survives restarts.
+
+    `immediate` keys are written as soon as they are set, since losing them
+    in a crash changes behavior (posting twice inside tweet_interval).
+    Restored values older than `max_age` seconds are dropped, so a long
+    downtime still triggers a fresh read.
+    """
+    type: type
+    max_age: Optional[float] = None
+    immediate: bool = False
+
+    def encode(self, value: Any) -> str:
+        if isinstance(value, (set, frozenset)):
+            value = list(value)
+        return json.dumps(value, default=str)
+
+    def decode(self, raw: str) -> Any:
+        value = json.loads(raw)
+        if value is None:
+            return None
+        return self.type(value)
+
+
+# Keys persisted by default; anything else in agent.state stays in memory only
+STATE_KEYS: Dict[str, StateKey] = {
+    "last_tweet_time": StateKey(float, immediate=True),
+    "echochambers_last_message": StateKey(float, immediate=True),
+    "timeline_tweets": StateKey(list, max_age=6 * 3600),
+    "echochambers_replied_messages": StateKey(set),
+    "room_info": StateKey(dict, max_age=24 * 3600),
+}
+
+
+class StateBackend(ABC):
+    """Storage for persisted state keys; one row per (agent, key)"""
+
+    persistent = True
+
+    @abstractmethod
+    def load(self, agent: str) -> Dict[str, Tuple[str, float]]:
+        """Return {key: (encoded value, updated_at)} for an agent"""
+        pass
+
+    @abstractmethod
+    def write(self, agent: str, changes: Dict[str, Optional[str]]) -> None:
+        """Apply a batch atomically; a None value deletes the key"""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """Keeps state for the life of the process only"""
+
+    persistent = False
+
+    def __init__(self, **_):
+        self._rows: Dict[str, Dict[str, Tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, agent: str) -> Dict[str, Tuple[str, float]]:
+        with self._lock:
+            return dict(self._rows.get(agent, {}))
+
+    def write(self, agent: str, changes: Dict[str, Optional[str]]) -> None:
+        now = time.time()
+        with self._lock:
+            rows = self._rows.setdefault(agent, {})
+            for key, value in changes.items():
+                if value is None:
+                    rows.pop(key, None)
+                else:
+                    rows[key] = (value, now)
+
+
+class SqliteStateBackend(StateBackend):
+    """
+    sqlite in WAL mode. Each batch is one transaction, so a crash leaves
+    either the whole batch or none of it on disk.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_PATH, **_):
+        path = str(Path(path).expanduser())
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS agent_state ("
+            "agent TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (agent, key))"
+        )
+        self._db.commit()
+
+    def load(self, agent: str) -> Dict[str, Tuple[str, float]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value, updated_at FROM agent_state WHERE agent = ?", (agent,)
+            ).fetchall()
+        return {key: (value, updated_at) for key, value, updated_at in rows}
+
+    def write(self, agent: str, changes: Dict[str, Optional[str]]) -> None:
+        now = time.time()
+        upserts = [(agent, key, value, now) for key, value in changes.items() if value is not None]
+        deletes = [(agent, key) for key, value in changes.items() if value is None]
+        with self._lock, self._db:
+            if upserts:
+                self._db.executemany("INSERT OR REPLACE INTO agent_state VALUES (?, ?, ?, ?)", upserts)
+            if deletes:
+                self._db.executemany("DELETE FROM agent_state WHERE agent = ? AND key = ?", deletes)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Selected with "backend" in the agent file's `state` block; add an entry to plug in another store
+STATE_BACKENDS = {
+    "sqlite": SqliteStateBackend,
+    "memory": MemoryStateBackend,
+}
+
+# Flushed one last time at interpreter exit
+_open_states: "weakref.WeakValueDictionary[int, AgentState]" = weakref.WeakValueDictionary()
+
+
+class AgentState(dict):
+    """
+    The agent's `state` dict, with the keys in STATE_KEYS persisted.
+
+    Values restored from the backend are in place before the first task
+    runs. Changes, including in-place ones like `timeline_tweets.pop(0)`,
+    are picked up by a background thread that writes only the keys whose
+    encoded value changed, batched into one transaction every
+    `flush_interval` seconds. Immediate keys are written on assignment.
+    """
+
+    def __init__(self, agent: str, backend: StateBackend, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 keys: Dict[str, StateKey] = None):
+        super().__init__()
+        self.agent = agent
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.state_keys = STATE_KEYS if keys is None else keys
+        self.flushes = 0
+
+        self._written: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._restore()
+        if backend.persistent:
+            self._thread = threading.Thread(target=self._flush_loop, name=f"state-{agent}", daemon=True)
+            self._thread.start()
+            _open_states[id(self)] = self
+
+    @classmethod
+    def from_config(cls, agent: str, config: Optional[Dict[str, Any]]) -> "AgentState":
+        """Build the state from the `state` block of an agent file; null keeps it in memory only"""
+        if config is None:
+            return cls(agent, MemoryStateBackend())
+        backend_name = config.get("backend", "sqlite")
+        if backend_name not in STATE_BACKENDS:
+            raise ValueError(f"Unknown state backend: {backend_name}")
+        backend = STATE_BACKENDS[backend_name](path=config.get("path", DEFAULT_STATE_PATH))
+        return cls(agent, backend, flush_interval=config.get("flush_interval", DEFAULT_FLUSH_INTERVAL))
+
+    def _restore(self) -> None:
+        now = time.time()
+        restored = []
+        for key, (raw, updated_at) in self.backend.load(self.agent).items():
+            state_key = self.state_keys.get(key)
+            if state_key is None:
+                continue
+            if state_key.max_age is not None and now - updated_at > state_key.max_age:
+                continue
+            try:
+                super().__setitem__(key, state_key.decode(raw))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Dropping unreadable state key {key}: {e}")
+                continue
+            self._written[key] = raw
+            restored.append(key)
+        if restored:
+            logger.info(f"Restored agent state: {', '.join(sorted(restored))}")
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        state_key = self.state_keys.get(key)
+        if state_key is not None and state_key.immediate and self.backend.persistent:
+            self.flush(only=(key,))
+
+    def _changes(self, keys) -> Dict[str, Optional[str]]:
+        changes = {}
+        for key in keys:
+            if key in self:
+                try:
+                    encoded = self.state_keys[key].encode(self[key])
+                except RuntimeError:
+                    # Mutated by the agent thread mid-encode; the next flush catches it
+                    continue
+                if self._written.get(key) != encoded:
+                    changes[key] = encoded
+            elif key in self._written:
+                changes[key] = None
+        return changes
+
+    def flush(self, only=None) -> int:
+        """Write changed keys now; returns how many were written"""
+        with self._lock:
+            changes = self._changes(only or self.state_keys)
+            if not changes:
+                return 0
+            try:
+                self.backend.write(self.agent, changes)
+            except Exception as e:
+                logger.error(f"Failed to persist agent state: {e}")
+                return 0
+            for key, encoded in changes.items():
+                if encoded is None:
+                    self._written.pop(key, None)
+                else:
+                    self._written[key] = encoded
+            self.flushes += 1
+            return len(changes)
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the flusher and write anything still pending"""
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 1)
+        if self.backend.persistent:
+            self.flush()
+            self.backend.close()
+        _open_states.pop(id(self), None)
+
+
+@atexit.register
+def _flush_open_states() -> None:
+    for state in list(_open_states.values()):
+        state.close()
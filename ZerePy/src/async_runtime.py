@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from src.action_handler import LLM_CONNECTION, action_connections, execute_action
+from src.scheduler import TaskScheduler
+
+logger = logging.getLogger("async_runtime")
+
+
+class AsyncAgentRuntime:
+    """
+    Runs every weighted task of a ZerePyAgent as its own coroutine.
+
+    Each task follows the same rate policy and eligibility windows as the
+    blocking loop's TaskScheduler, but tasks no longer wait on each other: a
+    post can be generating while timeline tweets are being liked. The actions
+    themselves are blocking, so they run on a dedicated thread pool;
+    per-connection semaphores cap how many actions hit one connection at once
+    (`max_concurrency` in the connection's config).
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.scheduler = TaskScheduler(agent)
+        self.tasks = self.scheduler.tasks
+        limits = agent.connection_manager.concurrency_limits
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(max(1, limit)) for name, limit in limits.items()
+        }
+        self._inputs_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(len(self.tasks), 1) + 1, thread_name_prefix="agent-action"
+        )
+
+    def _connections_for(self, action_name: str) -> List[str]:
+        names = set()
+        for name in action_connections.get(action_name, ()):
+            if name == LLM_CONNECTION:
+                name = self.agent.model_provider
+            if name in self._semaphores:
+                names.add(name)
+        # Acquire in a fixed order so two tasks never deadlock on each other
+        return sorted(names)
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _run_action(self, action_name: str) -> bool:
+        semaphores = [self._semaphores[name] for name in self._connections_for(action_name)]
+        for semaphore in semaphores:
+            await semaphore.acquire()
+        try:
+            async with self._inputs_lock:
+                await self._run_blocking(self.agent._replenish_inputs)
+            return bool(await self._run_blocking(execute_action, self.agent, action_name))
+        finally:
+            for semaphore in reversed(semaphores):
+                semaphore.release()
+
+    async def _sleep_until(self, action_name: str, due: float) -> None:
+        while True:
+            # Eligibility can move while we sleep (e.g. another task just tweeted)
+            due = max(due, self.scheduler.eligible_at(action_name))
+            wait = due - time.time()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _task_loop(self, action_name: str, first_due: float) -> None:
+        due = first_due
+        while True:
+            await self._sleep_until(action_name, due)
+            self.agent.events.publish("task_started", task=action_name)
+            try:
+                success = await self._run_action(action_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"\n❌ Error running {action_name}: {e}")
+                self.agent.events.publish("error", task=action_name, error=str(e))
+                success = False
+            self.agent.events.publish("task_finished", task=action_name, success=success)
+
+            due = self.scheduler.next_due(action_name, success)
+            logger.info(f"\n⏳ {action_name}: next run in {due - time.time():.0f} seconds")
+
+    async def run(self) -> None:
+        """Run all task loops until cancelled"""
+        if not self.tasks:
+            logger.warning("No weighted tasks configured, nothing to run")
+            return
+
+        logger.info(f"Running {len(self.tasks)} tasks concurrently: "
+                    f"{', '.join(task['name'] for task in self.tasks)}")
+        workers = [
+            asyncio.create_task(self._task_loop(entry["task"], entry["due"]), name=entry["task"])
+            for entry in self.scheduler.snapshot()
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Don't wait for in-flight blocking actions, they finish in the background
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -90,7 +90,8 @@ class ZerePyCLI:
             Command(
                 name="agent-loop",
                 description="Starts the current agent's autonomous behavior loop.",
-                tips=["Press Ctrl+C to stop the loop"],
+                tips=["Press Ctrl+C to stop the loop",
+                      "Use 'agent-loop --async' to run tasks concurrently"],
                 handler=self.agent_loop,
                 aliases=['loop', 'start']
             )
@@ -189,6 +190,18 @@ class ZerePyCLI:
             )
         )
         
+        # LLM cache stats command
+        self._register_command(
+            Command(
+                name="cache-stats",
+                description="Shows statistics for the agent's LLM response cache, content buffer and image cache.",
+                tips=["Enable the cache with an 'llm_cache' block in the agent file",
+                      "Enable pre-generated posts with a 'content_buffer' block in the agent file"],
+                handler=self.cache_stats,
+                aliases=['cache']
+            )
+        )
+
         ################## MISC ################## 
         # Exit command
         self._register_command(
@@ -333,6 +346,9 @@ class ZerePyCLI:
 
     def _load_agent_from_file(self, agent_name):
         try: 
+            # Stop the previous agent and write out its state before a reload reads it back
+            if self.agent:
+                self.agent.close()
             self.agent = ZerePyAgent(agent_name)
             logger.info(f"\n✅ Successfully loaded agent: {self.agent.name}")
         except FileNotFoundError:
@@ -408,7 +424,10 @@ class ZerePyCLI:
             return
 
         try:
-            self.agent.loop()
+            if "--async" in input_list[1:]:
+                self.agent.loop_async()
+            else:
+                self.agent.loop()
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
         except Exception as e:
@@ -508,6 +527,34 @@ class ZerePyCLI:
         else:
             logging.info("Please load an agent to see the list of supported actions")
 
+    def cache_stats(self, input_list: List[str]) -> None:
+        """Handle cache stats command"""
+        if self.agent is None:
+            logger.info("No agent loaded. Use 'load-agent' first.")
+            return
+
+        llm_cache = self.agent.connection_manager.llm_cache
+        if llm_cache is None:
+            logger.info("LLM cache is not enabled for this agent.")
+        else:
+            logger.info("\nLLM CACHE:")
+            for key, value in llm_cache.get_stats().items():
+                logger.info(f"- {key}: {value}")
+
+        logger.info("\nSINGLE-FLIGHT READS:")
+        for key, value in self.agent.connection_manager.single_flight.get_stats().items():
+            logger.info(f"- {key}: {value}")
+
+        if self.agent.content_buffer is not None:
+            logger.info("\nCONTENT BUFFER:")
+            for key, value in self.agent.content_buffer.get_stats().items():
+                logger.info(f"- {key}: {value}")
+
+        if self.agent.image_service is not None:
+            logger.info("\nIMAGE CACHE:")
+            for key, value in self.agent.image_service.get_stats().items():
+                logger.info(f"- {key}: {value}")
+
     def chat_session(self, input_list: List[str]) -> None:
         """Handle chat command"""
         if self.agent is None:
@@ -526,13 +573,33 @@ class ZerePyCLI:
                 if user_input.lower() == 'exit':
                     break
                 
-                response = self.agent.prompt_llm(user_input)
-                logger.info(f"\n{self.agent.name}: {response}")
+                self._stream_reply(user_input)
                 print_h_bar()
                 
             except KeyboardInterrupt:
                 break
 
+    def _stream_reply(self, user_input: str) -> None:
+        """Print the agent's reply token by token, falling back to a blocking call"""
+        stream = self.agent.prompt_llm_stream(user_input)
+        printed = False
+        if stream is not None:
+            try:
+                for token in stream:
+                    if not printed:
+                        sys.stdout.write(f"\n{self.agent.name}: ")
+                        printed = True
+                    sys.stdout.write(token)
+                    sys.stdout.flush()
+            except Exception as e:
+                logger.error(f"\nStreaming failed: {e}")
+            if printed:
+                sys.stdout.write("\n")
+                return
+
+        response = self.agent.prompt_llm(user_input)
+        logger.info(f"\n{self.agent.name}: {response}")
+
     def exit(self, input_list: List[str]) -> None:
         """Exit the CLI gracefully"""
         logger.info("\nGoodbye! 👋")
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.connections.base_connection import BaseConnection
+
+logger = logging.getLogger("connection_health")
+
+DEFAULT_HEALTH_TTL = 300  # seconds a health verdict is trusted before re-probing
+DEFAULT_UNHEALTHY_TTL = 10  # a failed probe is often a transient network error, so retry it soon
+
+
+@dataclass
+class HealthRecord:
+    """Last known health verdict for a single connection"""
+    healthy: bool
+    checked_at: float
+    ttl: float
+    error: Optional[str] = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.checked_at < self.ttl
+
+
+class ConnectionHealthMonitor:
+    """
+    Caches the result of `is_configured()` per connection so hot paths don't
+    pay a live probe (users/me, models.list, ...) on every action.
+
+    Verdicts expire after a per-connection TTL (failed probes after a much
+    shorter one), are dropped as soon as a real call fails, and can
+    optionally be kept warm by a background refresher.
+    """
+
+    def __init__(self, connections: Dict[str, BaseConnection], ttls: Dict[str, float] = None,
+                 default_ttl: float = DEFAULT_HEALTH_TTL, unhealthy_ttl: float = DEFAULT_UNHEALTHY_TTL):
+        self.connections = connections
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.unhealthy_ttl = unhealthy_ttl
+        self._records: Dict[str, HealthRecord] = {}
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._stop_event = threading.Event()
+
+    def _ttl_for(self, connection_name: str, healthy: bool = True) -> float:
+        ttl = self.ttls.get(connection_name, self.default_ttl)
+        return ttl if healthy else min(ttl, self.unhealthy_ttl)
+
+    def probe(self, connection_name: str, verbose: bool = False) -> bool:
+        """Run a live `is_configured()` check and store the verdict"""
+        connection = self.connections[connection_name]
+        error = None
+        try:
+            healthy = bool(connection.is_configured(verbose=verbose))
+        except Exception as e:
+            healthy = False
+            error = str(e)
+
+        with self._lock:
+            self._records[connection_name] = HealthRecord(
+                healthy=healthy,
+                checked_at=time.monotonic(),
+                ttl=self._ttl_for(connection_name, healthy),
+                error=error
+            )
+        return healthy
+
+    def is_healthy(self, connection_name: str, deep: bool = False, verbose: bool = False) -> bool:
+        """
+        Return the cached health verdict for a connection.
+
+        Args:
+            connection_name: Name of the connection to check
+            deep: Ignore the cache and run a live probe
+            verbose: Forwarded to `is_configured()` when a probe runs
+
+        Returns:
+            bool: True if the connection is considered healthy
+        """
+        if not deep:
+            with self._lock:
+                record = self._records.get(connection_name)
+            if record and record.is_fresh(time.monotonic()):
+                return record.healthy
+        return self.probe(connection_name, verbose=verbose)
+
+    def invalidate(self, connection_name: str = None) -> None:
+        """Drop the cached verdict for one connection, or all of them"""
+        with self._lock:
+            if connection_name is None:
+                self._records.clear()
+            else:
+                self._records.pop(connection_name, None)
+
+    def get_record(self, connection_name: str) -> Optional[HealthRecord]:
+        with self._lock:
+            return self._records.get(connection_name)
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(timeout=interval):
+            now = time.monotonic()
+            for name in list(self.connections):
+                record = self.get_record(name)
+                if record is None or not record.is_fresh(now):
+                    try:
+                        self.probe(name)
+                    except Exception as e:
+                        logger.debug(f"Background health probe failed for {name}: {e}")
+
+    def start_refresher(self, interval: float = 60) -> None:
+        """Start a daemon thread that re-probes connections whose verdict expired"""
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._stop_event.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval,), name="connection-health", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        if self._refresher:
+            self._stop_event.set()
+            self._refresher.join(timeout=5)
+            self._refresher = None
@@ -1,67 +1,141 @@
+import asyncio
+import importlib
+import inspect
+import json
 import logging
-from typing import Any, List, Optional, Type, Dict
-from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type, Dict, Union
+from src.connections.base_connection import BaseConnection, InvalidActionRequest
+from src.connection_health import ConnectionHealthMonitor, DEFAULT_HEALTH_TTL
+from src.events import EventBus, find_tx_hashes
+from src.llm_cache import LLMCache
+from src.singleflight import SingleFlight
 
 logger = logging.getLogger("connection_manager")
 
+# Config name -> (module, class). Connection modules pull in heavy SDKs (web3, solana,
+# anthropic, ...), so they are only imported when an agent config references them.
+CONNECTION_REGISTRY = {
+    "twitter": ("src.connections.twitter_connection", "TwitterConnection"),
+    "anthropic": ("src.connections.anthropic_connection", "AnthropicConnection"),
+    "openai": ("src.connections.openai_connection", "OpenAIConnection"),
+    "farcaster": ("src.connections.farcaster_connection", "FarcasterConnection"),
+    "eternalai": ("src.connections.eternalai_connection", "EternalAIConnection"),
+    "ollama": ("src.connections.ollama_connection", "OllamaConnection"),
+    "echochambers": ("src.connections.echochambers_connection", "EchochambersConnection"),
+    "goat": ("src.connections.goat_connection", "GoatConnection"),
+    "solana": ("src.connections.solana_connection", "SolanaConnection"),
+    "hyperbolic": ("src.connections.hyperbolic_connection", "HyperbolicConnection"),
+    "galadriel": ("src.connections.galadriel_connection", "GaladrielConnection"),
+    "sonic": ("src.connections.sonic_connection", "SonicConnection"),
+    "discord": ("src.connections.discord_connection", "DiscordConnection"),
+    "allora": ("src.connections.allora_connection", "AlloraConnection"),
+    "xai": ("src.connections.xai_connection", "XAIConnection"),
+    "ethereum": ("src.connections.ethereum_connection", "EthereumConnection"),
+    "router": ("src.connections.router_connection", "RouterConnection"),
+}
+
+# How many actions may run against one connection at the same time (async runtime, perform_actions)
+DEFAULT_MAX_CONCURRENCY = 4
+# Worker threads shared by all perform_actions calls of one manager
+DEFAULT_BATCH_WORKERS = 16
+
+# (connection, action, params) tuple or {"connection", "action", "params"} dict
+ActionCall = Union[Tuple[Any, ...], Dict[str, Any]]
+
+
+@dataclass
+class ActionResult:
+    """Outcome of one call in a perform_actions batch"""
+    connection: str
+    action: str
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _parse_call(call: ActionCall) -> Tuple[str, str, List[Any]]:
+    if isinstance(call, dict):
+        return call["connection"], call["action"], call.get("params") or []
+    connection_name, action_name, *rest = call
+    return connection_name, action_name, (rest[0] if rest else None) or []
+
+
+class ConnectionNotReadyError(RuntimeError):
+    """The connection failed its health check, so the action was never sent"""
+
+
+class SharedConnections:
+    """
+    LLM provider connections shared by the agents of one process.
+
+    Agents whose config for a provider is identical get the same connection
+    instance, and with it one SDK client and its connection pool. Other
+    connections hold per-agent state (timeline cursors, rate-limit budgets,
+    wallets) and are never shared.
+    """
+
+    def __init__(self):
+        self._connections: Dict[str, BaseConnection] = {}
+        self._lock = threading.Lock()
+
+    def share(self, config: Dict[str, Any], connection: BaseConnection) -> BaseConnection:
+        """The shared instance for this config, registering `connection` if there is none yet"""
+        # Routers bind to their own agent's manager
+        if not connection.is_llm_provider or hasattr(connection, "attach"):
+            return connection
+        key = json.dumps(config, sort_keys=True, default=str)
+        with self._lock:
+            return self._connections.setdefault(key, connection)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._connections)
+
 
 class ConnectionManager:
-    def __init__(self, agent_config):
+    def __init__(self, agent_config, health_refresh_interval: Optional[float] = None,
+                 shared: Optional[SharedConnections] = None):
         self.connections: Dict[str, BaseConnection] = {}
+        self.shared = shared
+        self.concurrency_limits: Dict[str, int] = {}
+        # Optional response cache for generate-text, set up by the agent
+        self.llm_cache: Optional[LLMCache] = None
+        # Optional bus for action start/finish events, set up by the agent
+        self.events: Optional[EventBus] = None
+        # Merges identical concurrent calls to read-only actions (connection.coalesce_actions)
+        self.single_flight = SingleFlight()
+        # perform_actions workers and per-connection caps, created on first use
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        self._batch_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._batch_lock = threading.Lock()
+        health_ttls = {}
         for config in agent_config:
             self._register_connection(config)
+            health_ttls[config["name"]] = config.get("health_ttl", DEFAULT_HEALTH_TTL)
+            self.concurrency_limits[config["name"]] = config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+
+        self.health = ConnectionHealthMonitor(self.connections, ttls=health_ttls)
+        # Connections that route to others (the LLM router) need the full set
+        for connection in self.connections.values():
+            if hasattr(connection, "attach"):
+                connection.attach(self)
+        if health_refresh_interval:
+            self.health.start_refresher(health_refresh_interval)
 
     @staticmethod
     def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        return None
+        entry = CONNECTION_REGISTRY.get(class_name)
+        if entry is None:
+            return None
+        module_name, attr_name = entry
+        return getattr(importlib.import_module(module_name), attr_name)
 
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
@@ -76,14 +150,16 @@ class ConnectionManager:
             name = config_dic["name"]
             connection_class = self._class_name_to_type(name)
             connection = connection_class(config_dic)
+            if self.shared is not None:
+                connection = self.shared.share(config_dic, connection)
             self.connections[name] = connection
         except Exception as e:
             logging.error(f"Failed to initialize connection {name}: {e}")
 
     def _check_connection(self, connection_string: str) -> bool:
         try:
-            connection = self.connections[connection_string]
-            return connection.is_configured(verbose=True)
+            self.connections[connection_string]
+            return self.health.is_healthy(connection_string, deep=True, verbose=True)
         except KeyError:
             logging.error(
                 "\nUnknown connection. Try 'list-connections' to see all supported connections."
@@ -98,6 +174,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
             success = connection.configure()
+            self.health.invalidate(connection_name)
 
             if success:
                 logging.info(
@@ -119,9 +196,9 @@ class ConnectionManager:
     def list_connections(self) -> None:
         """List all available connections and their status"""
         logging.info("\nAVAILABLE CONNECTIONS:")
-        for name, connection in self.connections.items():
+        for name in self.connections:
             status = (
-                "✅ Configured" if connection.is_configured() else "❌ Not Configured"
+                "✅ Configured" if self.health.is_healthy(name) else "❌ Not Configured"
             )
             logging.info(f"- {name}: {status}")
 
@@ -130,7 +207,7 @@ class ConnectionManager:
         try:
             connection = self.connections[connection_name]
 
-            if connection.is_configured():
+            if self.health.is_healthy(connection_name):
                 logging.info(
                     f"\n✅ {connection_name} is configured. You can use any of its actions."
                 )
@@ -155,61 +232,334 @@ class ConnectionManager:
             logging.error(f"\nAn error occurred: {e}")
 
     def perform_action(
-        self, connection_name: str, action_name: str, params: List[Any]
+        self, connection_name: str, action_name: str, params: List[Any],
+        task: Optional[str] = None, bypass_cache: bool = False, raise_errors: bool = False
     ) -> Optional[Any]:
-        """Perform an action on a specific connection with given parameters"""
+        """
+        Perform an action on a specific connection with given parameters
+
+        `task` and `bypass_cache` only matter for `generate-text` when an LLM
+        cache is enabled: `task` selects the cache TTL/bypass policy, and
+        `bypass_cache` forces a fresh generation. Errors are logged and
+        return None unless `raise_errors` is set; then bad requests raise
+        InvalidActionRequest (a ValueError) and failures raise the
+        connection's own exception.
+        """
         try:
+            if raise_errors and connection_name not in self.connections:
+                raise InvalidActionRequest(f"Unknown connection '{connection_name}'")
             connection = self.connections[connection_name]
 
-            if not connection.is_configured():
+            if not self.health.is_healthy(connection_name):
+                if raise_errors:
+                    raise ConnectionNotReadyError(f"Connection '{connection_name}' is not configured")
                 logging.error(
                     f"\nError: Connection '{connection_name}' is not configured"
                 )
                 return None
 
             if action_name not in connection.actions:
+                if raise_errors:
+                    raise InvalidActionRequest(f"Unknown action '{action_name}' for connection '{connection_name}'")
                 logging.error(
                     f"\nError: Unknown action '{action_name}' for connection '{connection_name}'"
                 )
                 return None
 
-            action = connection.actions[action_name]
-
-            # Convert list of params to kwargs dictionary, handling both required and optional params
-            kwargs = {}
-            param_index = 0
-
-            # Add provided parameters up to the number provided
-            for i, param in enumerate(action.parameters):
-                if param_index < len(params):
-                    kwargs[param.name] = params[param_index]
-                    param_index += 1
-
-            # Validate all required parameters are present
-            missing_required = [
-                param.name
-                for param in action.parameters
-                if param.required and param.name not in kwargs
-            ]
-
+            # Positional params are bound by the action's compiled dispatch entry
+            kwargs, missing_required = connection.compiled_action(action_name).bind(params)
             if missing_required:
+                if raise_errors:
+                    raise InvalidActionRequest(f"Missing required parameters: {', '.join(missing_required)}")
                 logging.error(
                     f"\nError: Missing required parameters: {', '.join(missing_required)}"
                 )
                 return None
 
-            return connection.perform_action(action_name, kwargs)
+            if action_name == "generate-text" and self.llm_cache and connection.is_llm_provider:
+                return self._cached_generate_text(connection_name, kwargs, task, bypass_cache)
+
+            if action_name in connection.coalesce_actions:
+                key = SingleFlight.make_key(connection_name, action_name, kwargs)
+                return self.single_flight.do(key, self._invoke, connection_name, action_name, kwargs,
+                                             label=f"{connection_name}/{action_name}")
+
+            return self._invoke(connection_name, action_name, kwargs)
 
         except Exception as e:
+            if raise_errors:
+                raise
             logging.error(
                 f"\nAn error occurred while trying action {action_name} for {connection_name} connection: {e}"
             )
             return None
 
+    def _invoke(self, connection_name: str, action_name: str, kwargs: Dict[str, Any]) -> Any:
+        events = self.events
+        if events:
+            events.publish("action_started", connection=connection_name, action=action_name)
+        started = time.monotonic()
+        try:
+            result = self.connections[connection_name].perform_action(action_name, kwargs)
+            if inspect.isgenerator(result):
+                return self._watch_stream(connection_name, action_name, result, started)
+        except ValueError as e:
+            # Bad parameters say nothing about the health of the connection
+            if events:
+                events.publish("action_failed", connection=connection_name, action=action_name, error=str(e))
+            raise
+        except Exception as e:
+            # Rate-limit errors (which carry `retry_at`) don't mean the connection is broken
+            if not hasattr(e, "retry_at"):
+                self.health.invalidate(connection_name)
+            if events:
+                events.publish("action_failed", connection=connection_name, action=action_name, error=str(e))
+            raise
+
+        if events:
+            self._publish_result(events, connection_name, action_name, result, time.monotonic() - started)
+        return result
+
+    def _watch_stream(self, connection_name: str, action_name: str, stream: Iterator[str],
+                      started: float) -> Iterator[str]:
+        """
+        Pull the first chunk of a streamed result now, so errors the provider
+        raises on connect (auth, quota, network) fail the call instead of
+        surfacing after the caller has started its own response. The returned
+        iterator publishes the finish event when the stream ends.
+        """
+        first = next(stream, None)
+        return self._stream_events(connection_name, action_name, stream, first, started)
+
+    def _stream_events(self, connection_name: str, action_name: str, stream: Iterator[str],
+                       first: Optional[str], started: float) -> Iterator[str]:
+        events = self.events
+        try:
+            if first is not None:
+                yield first
+            yield from stream
+        except Exception as e:
+            if not hasattr(e, "retry_at"):
+                self.health.invalidate(connection_name)
+            if events:
+                events.publish("action_failed", connection=connection_name, action=action_name, error=str(e))
+            raise
+        finally:
+            stream.close()
+        if events:
+            events.publish("action_finished", connection=connection_name, action=action_name,
+                           duration=round(time.monotonic() - started, 3), ok=True)
+
+    @staticmethod
+    def _publish_result(events: EventBus, connection_name: str, action_name: str, result: Any,
+                        duration: float) -> None:
+        events.publish("action_finished", connection=connection_name, action=action_name,
+                       duration=round(duration, 3), ok=result is not None and result is not False)
+        if action_name == "generate-text" and isinstance(result, str):
+            events.publish("generated_text", connection=connection_name, text=result)
+        for tx_hash in find_tx_hashes(result):
+            events.publish("transaction", connection=connection_name, action=action_name, tx_hash=tx_hash)
+
+    def _cached_generate_text(self, connection_name: str, kwargs: Dict[str, Any],
+                              task: Optional[str], bypass_cache: bool) -> Any:
+        if bypass_cache or self.llm_cache.should_bypass(task):
+            self.llm_cache.record_bypass()
+            return self._invoke(connection_name, "generate-text", kwargs)
+
+        model = kwargs.get("model") or self.connections[connection_name].config.get("model")
+        key = self.llm_cache.make_key(connection_name, model, kwargs.get("system_prompt"), kwargs["prompt"])
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit for {connection_name}/{model}")
+            return cached
+
+        result = self._invoke(connection_name, "generate-text", kwargs)
+        if result:
+            self.llm_cache.put(key, result, self.llm_cache.ttl_for(task))
+        return result
+
+    def _connection_semaphore(self, connection_name: str) -> threading.BoundedSemaphore:
+        with self._batch_lock:
+            semaphore = self._batch_semaphores.get(connection_name)
+            if semaphore is None:
+                limit = self.concurrency_limits.get(connection_name, DEFAULT_MAX_CONCURRENCY)
+                semaphore = self._batch_semaphores[connection_name] = threading.BoundedSemaphore(max(1, limit))
+            return semaphore
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._batch_lock:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_BATCH_WORKERS, thread_name_prefix="batch-action"
+                )
+            return self._batch_executor
+
+    def _capped(self, connection_name: str, func, *args) -> Any:
+        with self._connection_semaphore(connection_name):
+            return func(*args)
+
+    def _batch_handler(self, connection_name: str, action_name: str):
+        connection = self.connections.get(connection_name)
+        if connection is None or action_name not in connection.actions:
+            return None
+        return connection.compiled_action(action_name).batch_handler
+
+    def _perform_batch(self, connection_name: str, action_name: str, params_list: List[List[Any]]) -> List[Any]:
+        """
+        Run calls of one action through the connection's native batch handler.
+        Returns one result or Exception per call, in order.
+        """
+        if not self.health.is_healthy(connection_name):
+            error = ConnectionNotReadyError(f"Connection '{connection_name}' is not configured")
+            return [error] * len(params_list)
+
+        connection = self.connections[connection_name]
+        compiled = connection.compiled_action(action_name)
+        outcomes: List[Any] = [None] * len(params_list)
+        ready, indexes = [], []
+        for index, params in enumerate(params_list):
+            try:
+                kwargs, missing_required = compiled.bind(params)
+                if missing_required:
+                    raise InvalidActionRequest(f"Missing required parameters: {', '.join(missing_required)}")
+                errors = compiled.coerce(kwargs) if compiled.check_params else []
+                if errors:
+                    raise InvalidActionRequest(f"Invalid parameters: {', '.join(errors)}")
+                connection.before_action(action_name, kwargs)
+            except Exception as e:
+                outcomes[index] = e
+                continue
+            ready.append(kwargs)
+            indexes.append(index)
+        if not ready:
+            return outcomes
+
+        events = self.events
+        if events:
+            for _ in ready:
+                events.publish("action_started", connection=connection_name, action=action_name)
+        started = time.monotonic()
+        try:
+            results = compiled.batch_handler(ready)
+        except Exception as e:
+            if not isinstance(e, ValueError) and not hasattr(e, "retry_at"):
+                self.health.invalidate(connection_name)
+            results = [e] * len(ready)
+        duration = time.monotonic() - started
+        results = list(results)
+        if len(results) != len(ready):
+            logging.error(f"\n{connection_name} {action_name} batch returned {len(results)} results "
+                          f"for {len(ready)} calls")
+            # Calls without a result of their own fail instead of reporting None
+            missing = RuntimeError(f"Batch handler returned no result for this call "
+                                   f"({len(results)} results for {len(ready)} calls)")
+            results = results[:len(ready)] + [missing] * (len(ready) - len(results))
+
+        for index, result in zip(indexes, results):
+            outcomes[index] = result
+            if not events:
+                continue
+            if isinstance(result, Exception):
+                events.publish("action_failed", connection=connection_name, action=action_name, error=str(result))
+            else:
+                self._publish_result(events, connection_name, action_name, result, duration)
+        return outcomes
+
+    def _submit(self, parsed: List[Tuple[str, str, List[Any]]]) -> List[Tuple[List[int], bool, Future]]:
+        """
+        Start every call on the batch pool. Calls to an action with a native
+        batch handler are merged into one unit; returns (call indexes, merged,
+        future) per unit, where a merged unit's future yields one outcome per call.
+        """
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, (connection_name, action_name, _) in enumerate(parsed):
+            if self._batch_handler(connection_name, action_name):
+                groups.setdefault((connection_name, action_name), []).append(index)
+
+        executor = self._executor()
+        units = []
+        merged = set()
+        for (connection_name, action_name), indexes in groups.items():
+            if len(indexes) < 2:
+                continue
+            merged.update(indexes)
+            params_list = [parsed[index][2] for index in indexes]
+            units.append((indexes, True, executor.submit(
+                self._capped, connection_name, self._perform_batch, connection_name, action_name, params_list
+            )))
+        for index, (connection_name, action_name, params) in enumerate(parsed):
+            if index in merged:
+                continue
+            units.append(([index], False, executor.submit(
+                self._capped, connection_name, self.perform_action, connection_name, action_name, params,
+                None, False, True
+            )))
+        return units
+
+    @staticmethod
+    def _collect(parsed: List[Tuple[str, str, List[Any]]],
+                 outcomes: List[Tuple[List[int], bool, Any]]) -> List[ActionResult]:
+        results: List[Optional[ActionResult]] = [None] * len(parsed)
+        for indexes, merged, outcome in outcomes:
+            if not merged:
+                values = [outcome]
+            elif isinstance(outcome, BaseException):
+                values = [outcome] * len(indexes)
+            else:
+                values = outcome
+            for index, value in zip(indexes, values):
+                connection_name, action_name, _ = parsed[index]
+                if isinstance(value, BaseException):
+                    results[index] = ActionResult(connection_name, action_name, False, error=str(value))
+                else:
+                    results[index] = ActionResult(connection_name, action_name, True, result=value)
+        return results
+
+    def perform_actions(self, calls: Sequence[ActionCall]) -> List[ActionResult]:
+        """
+        Run independent actions concurrently and return their results in call order.
+
+        Each call is a (connection, action, params) tuple or a dict with those
+        keys. At most `max_concurrency` calls run against one connection at a
+        time. A failing call doesn't affect the others; its ActionResult has
+        ok=False and the error message. Calls to an action whose connection
+        has a batch handler (`<action>_batch`, e.g. Twitter's get-tweet) are
+        merged into one request.
+        """
+        parsed = [_parse_call(call) for call in calls]
+        outcomes = []
+        for indexes, merged, future in self._submit(parsed):
+            try:
+                outcomes.append((indexes, merged, future.result()))
+            except Exception as e:
+                outcomes.append((indexes, merged, e))
+        return self._collect(parsed, outcomes)
+
+    async def perform_actions_async(self, calls: Sequence[ActionCall]) -> List[ActionResult]:
+        """perform_actions for asyncio callers; the actions still run on the manager's worker threads"""
+        parsed = [_parse_call(call) for call in calls]
+        units = self._submit(parsed)
+        values = await asyncio.gather(
+            *(asyncio.wrap_future(future) for _, _, future in units), return_exceptions=True
+        )
+        return self._collect(parsed, [(indexes, merged, value) for (indexes, merged, _), value in zip(units, values)])
+
+    def close(self) -> None:
+        """Stop the perform_actions worker threads"""
+        with self._batch_lock:
+            executor, self._batch_executor = self._batch_executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+    def is_read_only(self, connection_name: str, action_name: str) -> bool:
+        """Whether an action only reads (the connection lists it in coalesce_actions), so re-running it is safe"""
+        connection = self.connections.get(connection_name)
+        return connection is not None and action_name in connection.coalesce_actions
+
     def get_model_providers(self) -> List[str]:
         """Get a list of all LLM provider connections"""
         return [
             name
             for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
+            if self.health.is_healthy(name) and getattr(conn, "is_llm_provider", lambda: False)
         ]
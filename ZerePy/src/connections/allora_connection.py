@@ -21,6 +21,8 @@ class AlloraAPIError(AlloraConnectionError):
     pass
 
 class AlloraConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-inference", "list-topics"})
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
@@ -134,17 +136,3 @@ class AlloraConnection(BaseConnection):
             else:
                 logger.info("\n✅ Allora API key found")
         return bool(api_key)
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute an action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from anthropic import Anthropic, NotFoundError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -53,6 +53,15 @@ class AnthropicConnection(BaseConnection):
                 ],
                 description="Generate text using Anthropic models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text token by token using Anthropic models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -159,6 +168,23 @@ class AnthropicConnection(BaseConnection):
         except Exception as e:
             raise AnthropicAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Anthropic models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            with client.messages.stream(
+                model=model or self.config["model"],
+                max_tokens=1000,
+                temperature=0,
+                system=system_prompt,
+                messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+
+        except Exception as e:
+            raise AnthropicAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -188,18 +214,3 @@ class AnthropicConnection(BaseConnection):
                 
         except Exception as e:
             raise AnthropicAPIError(f"Listing models failed: {e}")
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Twitter action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
@@ -1,8 +1,13 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional, Tuple
 from dataclasses import dataclass
 
+
+class InvalidActionRequest(ValueError):
+    """The action call itself is invalid (unknown action, bad parameters), so nothing was sent"""
+
+
 @dataclass
 class ActionParameter:
     name: str
@@ -28,15 +33,73 @@ class Action:
                     errors.append(f"Invalid type for {param.name}. Expected {param.type.__name__}")
         return errors
 
+class CompiledAction:
+    """
+    Dispatch entry for one action, built once instead of on every call.
+
+    Holds the bound handler, the parameter names in positional order and
+    the (name, type, required) coercers, so a call is a dict lookup, one
+    pass over the parameters and the method call.
+    """
+
+    __slots__ = ("action", "handler", "batch_handler", "names", "required", "min_positional", "coercers",
+                 "check_params")
+
+    def __init__(self, action: Action, handler: Callable, check_params: bool = True,
+                 batch_handler: Optional[Callable] = None):
+        self.action = action
+        self.handler = handler
+        # Takes a list of kwargs and returns one result (or Exception) per item, in order
+        self.batch_handler = batch_handler
+        self.names = tuple(param.name for param in action.parameters)
+        self.required = tuple(param.name for param in action.parameters if param.required)
+        # Positional params needed to cover every required one
+        self.min_positional = max((index + 1 for index, param in enumerate(action.parameters) if param.required),
+                                  default=0)
+        self.coercers = tuple((param.name, param.type, param.required) for param in action.parameters)
+        self.check_params = check_params
+
+    def bind(self, params: List[Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """Map positional params to kwargs; returns (kwargs, missing required names)"""
+        kwargs = dict(zip(self.names, params))
+        if len(kwargs) >= self.min_positional:
+            return kwargs, []
+        return kwargs, [name for name in self.required if name not in kwargs]
+
+    def coerce(self, kwargs: Dict[str, Any]) -> List[str]:
+        """Cast kwargs to their declared types in place; returns validation errors"""
+        errors = []
+        for name, param_type, required in self.coercers:
+            if name in kwargs:
+                value = kwargs[name]
+                if value.__class__ is param_type:
+                    continue
+                try:
+                    kwargs[name] = param_type(value)
+                except ValueError:
+                    errors.append(f"Invalid type for {name}. Expected {param_type.__name__}")
+            elif required:
+                errors.append(f"Missing required parameter: {name}")
+        return errors
+
+
 class BaseConnection(ABC):
+    # Set to False for connections whose handlers validate their own input
+    check_params = True
+    # Read-only actions; identical concurrent calls share one upstream call (see src/singleflight.py)
+    coalesce_actions: frozenset = frozenset()
+
     def __init__(self, config):
         try:
-            # Dictionary to store action name -> handler method mapping
-            self.actions: Dict[str, Callable] = {}
+            # Dictionary to store action name -> Action mapping
+            self.actions: Dict[str, Action] = {}
+            # Action name -> CompiledAction, filled from self.actions
+            self._dispatch: Dict[str, CompiledAction] = {}
             # Dictionary to store some essential configuration
             self.config = self.validate_config(config) 
             # Register actions during initialization
             self.register_actions()
+            self.compile_actions()
         except Exception as e:
             logging.error("Could not initialize the connection")
             raise e
@@ -92,23 +155,67 @@ class BaseConnection(ABC):
         """
         pass
 
-    def perform_action(self, action_name: str, **kwargs) -> Any:
+    def action_handler(self, action_name: str) -> Callable:
+        """The callable behind an action: by default the method named after it (read-timeline -> read_timeline)"""
+        method = getattr(self, action_name.replace("-", "_"), None)
+        if method is None:
+            def not_implemented(**kwargs):
+                raise NotImplementedError(f"The action '{action_name}' is not implemented.")
+            return not_implemented
+        return method
+
+    def batch_handler(self, action_name: str) -> Optional[Callable]:
+        """
+        Native batch form of an action, if the connection has one: a method
+        named `<action>_batch` (get-tweet -> get_tweet_batch) that takes a
+        list of kwargs and returns one result or Exception per item, in order.
+        ConnectionManager.perform_actions merges compatible calls into it.
+        """
+        return getattr(self, action_name.replace("-", "_") + "_batch", None)
+
+    def _compile(self, action_name: str, action: Action) -> CompiledAction:
+        return CompiledAction(action, self.action_handler(action_name), self.check_params,
+                              self.batch_handler(action_name))
+
+    def compile_actions(self) -> None:
+        """Build the dispatch table for every registered action"""
+        self._dispatch = {name: self._compile(name, action) for name, action in self.actions.items()}
+
+    def compiled_action(self, action_name: str) -> CompiledAction:
+        """Dispatch entry for an action, recompiled if the action was registered again since"""
+        action = self.actions.get(action_name)
+        if action is None:
+            raise KeyError(f"Unknown action: {action_name}")
+        compiled = self._dispatch.get(action_name)
+        if compiled is None or compiled.action is not action:
+            compiled = self._dispatch[action_name] = self._compile(action_name, action)
+        return compiled
+
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
+        """
+        Hook run after validation and before the handler; fill config defaults
+        into `kwargs` or raise if the connection can't serve calls right now.
+        """
+
+    def perform_action(self, action_name: str, kwargs: Dict[str, Any]) -> Any:
         """
         Perform a registered action with the given parameters.
         
         Args:
             action_name: Name of the action to perform
-            **kwargs: Parameters for the action
+            kwargs: Parameters for the action, cast to their declared types in place
             
         Returns:
             Any: Result of the action
             
         Raises:
             KeyError: If the action is not registered
-            ValueError: If the action parameters are invalid
+            InvalidActionRequest: If the action parameters are invalid
         """
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-            
-        handler = self.actions[action_name]
-        return handler(**kwargs)
+        compiled = self.compiled_action(action_name)
+        if compiled.check_params:
+            errors = compiled.coerce(kwargs)
+            if errors:
+                raise InvalidActionRequest(f"Invalid parameters: {', '.join(errors)}")
+        self.before_action(action_name, kwargs)
+        return compiled.handler(**kwargs)
@@ -4,7 +4,7 @@ from typing import Dict, Any
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
-import requests
+from src import transport
 import json
 
 logger = logging.getLogger("connections.discord_connection")
@@ -29,6 +29,8 @@ class DiscordAPIError(DiscordConnectionError):
 
 
 class DiscordConnection(BaseConnection):
+    coalesce_actions = frozenset({"read-messages", "read-mentioned-messages", "list-channels"})
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = "https://discord.com/api/v10"
@@ -220,20 +222,9 @@ class DiscordConnection(BaseConnection):
                 logger.debug(f"Configuration check failed: {e}")
             return False
 
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         # Add config parameters if not provided
-        if action_name == "read-messages":
-            if "count" not in kwargs:
-                kwargs["count"] = self.config["message_read_count"]
-        elif action_name == "read-mentioned-messages":
+        if action_name in ("read-messages", "read-mentioned-messages"):
             if "count" not in kwargs:
                 kwargs["count"] = self.config["message_read_count"]
         elif action_name == "react-to-message":
@@ -243,11 +234,6 @@ class DiscordConnection(BaseConnection):
             if "server_id" not in kwargs:
                 kwargs["server_id"] = self.config["server_id"]
 
-        # Call the appropriate method based on action name
-        method_name = action_name.replace("-", "_")
-        method = getattr(self, method_name)
-        return method(**kwargs)
-
     def list_channels(self, server_id: str, **kwargs) -> dict:
         """Lists all Discord channels under the server"""
         request_path = f"/guilds/{server_id}/channels"
@@ -390,7 +376,7 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("PUT", url, headers=headers, data={})
+        response = transport.request("PUT", url, headers=headers, data={})
         if response.status_code != 204:
             raise DiscordAPIError(
                 f"Failed to called PUT to Discord: {response.status_code} - {response.text}"
@@ -405,7 +391,7 @@ class DiscordConnection(BaseConnection):
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = transport.request("POST", url, headers=headers, data=payload)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call POST to Discord: {response.status_code} - {response.text}"
@@ -420,7 +406,7 @@ class DiscordConnection(BaseConnection):
             "Authorization": self._get_request_auth_token(),
         }
         print(headers)
-        response = requests.request("GET", url, headers=headers, data={})
+        response = transport.request("GET", url, headers=headers, data={})
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call GET to Discord: {response.status_code} - {response.text}"
@@ -435,7 +421,7 @@ class DiscordConnection(BaseConnection):
         try:
             url = f"{self.base_url}/users/@me"
             headers = {"Accept": "application/json", "Authorization": f"Bot {api_key}"}
-            response = requests.request("GET", url, headers=headers, data={})
+            response = transport.request("GET", url, headers=headers, data={})
             if response.status_code != 200:
                 raise DiscordAPIError(
                     f"Failed to call GET to Discord: {response.status_code} - {response.text}"
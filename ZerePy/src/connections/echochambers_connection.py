@@ -5,6 +5,7 @@ from collections import deque
 
 import requests
 from dotenv import load_dotenv
+from src import transport
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.echochambers_connection")
@@ -22,6 +23,8 @@ class EchochambersAPIError(EchochambersConnectionError):
     pass
 
 class EchochambersConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-room-info", "get-room-history"})
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("✨ Initializing Echochambers adapter")
         super().__init__(config)
@@ -40,6 +43,9 @@ class EchochambersConnection(BaseConnection):
                        if not getattr(self, k)]
             raise EchochambersConfigurationError(f"Missing configuration fields: {', '.join(missing)}")
 
+        transport.configure_host(self.api_url, pool_size=config.get("http_pool_size"),
+                                 timeout=config.get("http_timeout"))
+
         logger.info(f"✨ Connected to: {self.api_url}")
         logger.info(f"✨ Entered room: {self.room}")
 
@@ -211,7 +217,7 @@ class EchochambersConnection(BaseConnection):
 
         for attempt in range(3):
             try:
-                response = requests.request(method, url, timeout=10, **kwargs)
+                response = transport.request(method, url, timeout=10, **kwargs)
                 if response.status_code == 429:  # Rate limit
                     retry_after = int(response.headers.get('Retry-After', 60))
                     logger.warning(f"Rate limit hit, waiting {retry_after}s")
@@ -283,20 +289,3 @@ class EchochambersConnection(BaseConnection):
             if verbose:
                 logger.error(f"Echochambers connection test failed: {str(e)}")
             return False
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute an Echochambers action with validation"""
-        action = self.actions.get(action_name)
-        if not action:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name, None)
-        if method:
-            return method(**kwargs)
-        else:
-            raise NotImplementedError(f"The action '{action_name}' is not implemented.")
\ No newline at end of file
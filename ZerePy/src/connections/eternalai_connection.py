@@ -1,12 +1,12 @@
 import logging
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from web3 import Web3
-import requests
+from src import transport
 
 logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
@@ -63,6 +63,15 @@ class EternalAIConnection(BaseConnection):
                 ],
                 description="Generate text using EternalAI models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text token by token using EternalAI models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -147,12 +156,12 @@ class EternalAIConnection(BaseConnection):
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
+            response = transport.get(light_house)
             if response.status_code == 200:
                 return response.text
             else:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
+                response = transport.get(gcs)
                 if response.status_code == 200:
                     return response.text
                 else:
@@ -163,6 +172,35 @@ class EternalAIConnection(BaseConnection):
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _resolve_chain_id(self, chain_id: str = None) -> str:
+        chain_id = chain_id or self.config["chain_id"]
+        if not chain_id or chain_id == "":
+            chain_id = "45762"
+        logger.info(f"chain_id {chain_id}")
+        return chain_id
+
+    def _resolve_system_prompt(self, system_prompt: str) -> str:
+        """Replace the system prompt with the agent's on-chain one when an agent contract is configured"""
+        agent_id = self.config["agent_id"] or None
+        contract_address = self.config["contract_address"] or None
+        rpc = self.config["rpc_url"] or None
+
+        if agent_id and contract_address and rpc:
+            logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
+            # call on-chain system prompt
+            web3 = Web3(Web3.HTTPProvider(rpc))
+            logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
+            contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
+            result = contract.functions.getAgentSystemPrompt(agent_id).call()
+            logger.info(f"on-chain system_prompt: {result}")
+            if len(result) > 0:
+                try:
+                    system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
+                    logging.info(f"new system_prompt: {system_prompt}")
+                except Exception as e:
+                    logger.error(f"get on-chain system_prompt fail {e}")
+        return system_prompt
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
@@ -170,29 +208,8 @@ class EternalAIConnection(BaseConnection):
             model = model or self.config["model"]
             logger.info(f"model {model}")
 
-            chain_id = chain_id or self.config["chain_id"]
-            if not chain_id or chain_id == "":
-                chain_id = "45762"
-            logger.info(f"chain_id {chain_id}")
-
-            agent_id = self.config["agent_id"] or None
-            contract_address = self.config["contract_address"] or None
-            rpc = self.config["rpc_url"] or None
-
-            if agent_id and contract_address and rpc:
-                logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
-                # call on-chain system prompt
-                web3 = Web3(Web3.HTTPProvider(rpc))
-                logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
-                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
-                result = contract.functions.getAgentSystemPrompt(agent_id).call()
-                logger.info(f"on-chain system_prompt: {result}")
-                if len(result) > 0:
-                    try:
-                        system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
-                        logging.info(f"new system_prompt: {system_prompt}")
-                    except Exception as e:
-                        logger.error(f"get on-chain system_prompt fail {e}")
+            chain_id = self._resolve_chain_id(chain_id)
+            system_prompt = self._resolve_system_prompt(system_prompt)
 
             completion = client.chat.completions.create(
                 model=model,
@@ -215,6 +232,26 @@ class EternalAIConnection(BaseConnection):
         except Exception as e:
             raise EternalAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from EternalAI models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": self._resolve_system_prompt(system_prompt)},
+                    {"role": "user", "content": prompt},
+                ],
+                extra_body={"chain_id": self._resolve_chain_id(chain_id)},
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise EternalAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -246,17 +283,3 @@ class EternalAIConnection(BaseConnection):
 
         except Exception as e:
             raise EternalAIAPIError(f"Listing models failed: {e}")
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute an action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
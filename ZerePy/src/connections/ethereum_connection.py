@@ -1,7 +1,7 @@
 import logging
 import os
 import time
-import requests
+from src import transport
 from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv, set_key
 from web3 import Web3
@@ -17,6 +17,8 @@ class EthereumConnectionError(Exception):
     pass
 
 class EthereumConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-balance", "get-token-by-ticker", "get-address"})
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Ethereum connection...")
         self._web3 = None
@@ -202,7 +204,7 @@ class EthereumConnection(BaseConnection):
     def _get_token_address(self, ticker: str) -> Optional[str]:
         """Helper function to get token address from DEXScreener"""
         try:
-            response = requests.get(
+            response = transport.get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -308,7 +310,7 @@ class EthereumConnection(BaseConnection):
             # Try to get ETH value using Kyberswap price API
             try:
                 kyber_url = f"{self.aggregator_api}/tokens/rates"
-                response = requests.get(kyber_url, params={
+                response = transport.get(kyber_url, params={
                     "tokenIn": token_address, 
                     "tokenOut": self.NATIVE_TOKEN, 
                     "amount": str(raw_balance) 
@@ -441,7 +443,7 @@ class EthereumConnection(BaseConnection):
                 "gasInclude": "true"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = transport.get(url, headers=headers, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -479,7 +481,7 @@ class EthereumConnection(BaseConnection):
                 "source": "zerepy"
             }
             
-            response = requests.post(url, headers=headers, json=payload)
+            response = transport.post(url, headers=headers, json=payload)
             response.raise_for_status()
             
             data = response.json()
@@ -628,21 +630,8 @@ class EthereumConnection(BaseConnection):
         except Exception as e:
             return f"Swap failed: {str(e)}"
 
-    def perform_action(self, action_name: str, kwargs: Dict[str, Any]) -> Any:
-        """Execute an Ethereum action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         load_dotenv()
         
         if not self.is_configured(verbose=True):
-            raise EthereumConnectionError("Ethereum connection is not properly configured")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
+            raise EthereumConnectionError("Ethereum connection is not properly configured")
\ No newline at end of file
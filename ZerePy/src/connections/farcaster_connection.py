@@ -21,6 +21,8 @@ class FarcasterAPIError(FarcasterConnectionError):
     pass
 
 class FarcasterConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-latest-casts", "read-timeline", "get-cast-replies"})
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Farcaster connection...")
         super().__init__(config)
@@ -194,24 +196,10 @@ class FarcasterConnection(BaseConnection):
                 logger.error(f"Configuration validation failed: {error_msg}")
             return False
     
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Farcaster action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         # Add config parameters if not provided
         if action_name == "read-timeline" and "count" not in kwargs:
             kwargs["count"] = self.config["timeline_read_count"]
-
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
     
     def get_latest_casts(self, fid: int, cursor: Optional[int] = None, limit: Optional[int] = 25) -> IterableCastsResult:
         """Get the latest casts from a user"""
@@ -1,8 +1,8 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 
-import requests
+from src import transport
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -58,6 +58,15 @@ class GaladrielConnection(BaseConnection):
                 ],
                 description="Generate text using Galadriel models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text token by token using Galadriel models"
+            ),
         }
 
     def _get_client(self) -> OpenAI:
@@ -127,7 +136,7 @@ class GaladrielConnection(BaseConnection):
             return False
 
     def _is_api_key_valid(self, api_key):
-        response = requests.get(
+        response = transport.get(
             f"{API_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}"
@@ -158,17 +167,21 @@ class GaladrielConnection(BaseConnection):
         except Exception as e:
             raise GaladrielAPIError(f"Text generation failed: {e}")
 
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute an action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Galadriel models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
+        except Exception as e:
+            raise GaladrielAPIError(f"Text streaming failed: {e}")
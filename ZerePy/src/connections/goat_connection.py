@@ -29,9 +29,13 @@ class GoatConfigurationError(GoatConnectionError):
 
 
 class GoatConnection(BaseConnection):
+    # Tools validate their own input against the plugin's pydantic schema
+    check_params = False
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("🐐 Initializing Goat connection...")
 
+        self._dispatch = {}
         self._is_configured = False
         self._wallet_client: WalletClientBase | None = None
         self._plugins: Dict[str, PluginBase] = {}
@@ -252,7 +256,7 @@ class GoatConnection(BaseConnection):
 
             register_action(tool.name)(
                 lambda agent, tool_name=tool.name, **kwargs: self.perform_action(
-                    tool_name, **kwargs
+                    tool_name, kwargs
                 )
             )
 
@@ -392,11 +396,7 @@ class GoatConnection(BaseConnection):
             logger.error(error_msg)
             raise GoatConfigurationError(error_msg)
 
-    def perform_action(self, action_name: str, **kwargs) -> Any:
-        """Execute a GOAT action using a plugin's tool"""
-        action = self.actions.get(action_name)
-        if not action:
-            raise KeyError(f"Unknown action: {action_name}")
-
+    def action_handler(self, action_name: str):
+        """GOAT actions run a plugin's tool rather than a method"""
         tool = self._action_registry[action_name]
-        return tool.execute(kwargs)
+        return lambda **kwargs: tool.execute(kwargs)
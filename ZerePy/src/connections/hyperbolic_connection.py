@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -55,6 +55,16 @@ class HyperbolicConnection(BaseConnection):
                 ],
                 description="Generate text using Hyperbolic models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation"),
+                    ActionParameter("temperature", False, float, "A decimal number that determines the degree of randomness in the response.")
+                ],
+                description="Stream generated text token by token using Hyperbolic models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -163,6 +173,25 @@ class HyperbolicConnection(BaseConnection):
         except Exception as e:
             raise HyperbolicAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Hyperbolic models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise HyperbolicAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -194,23 +223,9 @@ class HyperbolicConnection(BaseConnection):
         except Exception as e:
             raise HyperbolicAPIError(f"Listing models failed: {e}")
     
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Hyperbolic action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         # Explicitly reload environment variables
         load_dotenv()
         
         if not self.is_configured(verbose=True):
-            raise HyperbolicConfigurationError("Hyperbolic is not properly configured")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
+            raise HyperbolicConfigurationError("Hyperbolic is not properly configured")
\ No newline at end of file
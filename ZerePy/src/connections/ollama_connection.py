@@ -1,7 +1,7 @@
 import logging
-import requests
+from src import transport
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 
 logger = logging.getLogger("connections.ollama_connection")
@@ -21,6 +21,8 @@ class OllamaConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = config.get("base_url", "http://localhost:11434")  # Default to local Ollama setup
+        transport.configure_host(self.base_url, pool_size=config.get("http_pool_size"),
+                                 timeout=config.get("http_timeout"))
 
     @property
     def is_llm_provider(self) -> bool:
@@ -53,6 +55,15 @@ class OllamaConnection(BaseConnection):
                 ],
                 description="Generate text using Ollama's running model"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation"),
+                ],
+                description="Stream generated text token by token using Ollama's running model"
+            ),
         }
 
     def configure(self) -> bool:
@@ -79,7 +90,7 @@ class OllamaConnection(BaseConnection):
         """Test if Ollama is reachable"""
         try:
             url = f"{self.base_url}/v1/models"
-            response = requests.get(url)
+            response = transport.get(url)
             if response.status_code != 200:
                 raise OllamaAPIError(f"Failed to connect to Ollama: {response.status_code} - {response.text}")
         except Exception as e:
@@ -104,7 +115,7 @@ class OllamaConnection(BaseConnection):
                 "prompt": prompt,
                 "system": system_prompt,
             }
-            response = requests.post(url, json=payload, stream=True)
+            response = transport.post(url, json=payload, stream=True)
 
             if response.status_code != 200:
                 raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
@@ -128,16 +139,32 @@ class OllamaConnection(BaseConnection):
         except Exception as e:
             raise OllamaAPIError(f"Text generation failed: {e}")
 
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from Ollama, yielding tokens as they arrive"""
+        try:
+            url = f"{self.base_url}/api/generate"
+            payload = {
+                "model": model or self.config["model"],
+                "prompt": prompt,
+                "system": system_prompt,
+            }
+            response = transport.post(url, json=payload, stream=True)
+
+            if response.status_code != 200:
+                raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
 
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
+            with response:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        data = json.loads(line.decode("utf-8"))
+                    except json.JSONDecodeError as e:
+                        raise OllamaAPIError(f"Failed to parse JSON: {e}")
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        break
 
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
+        except Exception as e:
+            raise OllamaAPIError(f"Text streaming failed: {e}")
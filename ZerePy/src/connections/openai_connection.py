@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -54,6 +54,15 @@ class OpenAIConnection(BaseConnection):
                 ],
                 description="Generate text using OpenAI models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text token by token using OpenAI models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -152,6 +161,25 @@ class OpenAIConnection(BaseConnection):
         except Exception as e:
             raise OpenAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from OpenAI models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise OpenAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model, **kwargs):
         try:
             client = self._get_client()
@@ -189,18 +217,3 @@ class OpenAIConnection(BaseConnection):
                     
         except Exception as e:
             raise OpenAIAPIError(f"Listing models failed: {e}")
-    
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Twitter action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
@@ -0,0 +1,358 @@
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from src.connections.base_connection import BaseConnection, Action, ActionParameter
+
+logger = logging.getLogger("connections.router_connection")
+
+DEFAULT_TIMEOUT = 60        # seconds one provider gets before the router fails over
+DEFAULT_WINDOW = 50         # rolling samples kept per provider/model
+DEFAULT_MAX_ERROR_RATE = 0.5
+DEFAULT_COOLDOWN = 60       # seconds a tripped provider is skipped
+MIN_SAMPLES_TO_TRIP = 3
+# Success rate floor used when ranking, so a provider that always failed still gets a finite score
+MIN_SUCCESS_RATE = 0.05
+# Timed-out calls a provider may still have running before it is skipped; the pool
+# keeps this many extra workers per provider so abandoned calls can't starve live ones
+MAX_ABANDONED_CALLS = 2
+
+
+class RouterConnectionError(Exception):
+    """Base exception for router connection errors"""
+    pass
+
+
+class RouterAPIError(RouterConnectionError):
+    """Raised when no provider could serve a request"""
+    pass
+
+
+class _Attempt:
+    """One provider call; only the first of the call finishing and its timeout records an outcome"""
+
+    __slots__ = ("_lock", "_settled")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settled = False
+
+    def settle(self) -> bool:
+        with self._lock:
+            if self._settled:
+                return False
+            self._settled = True
+            return True
+
+
+class ProviderStats:
+    """Rolling latency and error samples for one provider/model"""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.last_failure = 0.0
+
+    def record(self, success: bool, latency: Optional[float] = None) -> None:
+        self.outcomes.append(success)
+        if latency is not None:
+            self.latencies.append(latency)
+        if not success:
+            self.last_failure = time.monotonic()
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def as_dict(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "samples": len(self.outcomes),
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class RouterConnection(BaseConnection):
+    """
+    LLM connection that fronts every other configured LLM provider.
+
+    Requests go to the provider/model with the lowest expected time to a
+    good answer (rolling p50 latency over its success rate) among those that
+    are healthy and not tripped by a high error rate. Calls go through the
+    ConnectionManager, so they get its health checks, events and caching. Errors
+    and timeouts fail over to the next provider, and with `hedge_after` set a
+    duplicate request is sent to the runner-up once the first one is slow.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self._manager = None
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+        # Provider -> timed-out calls still running in the pool
+        self._abandoned: Dict[str, int] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def is_llm_provider(self) -> bool:
+        return True
+
+    def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate router configuration from JSON"""
+        providers = config.get("providers")
+        if providers is not None and (not isinstance(providers, list) or
+                                      not all(isinstance(p, str) for p in providers)):
+            raise ValueError("providers must be a list of connection names")
+        if config.get("name") in (providers or []):
+            raise ValueError("router cannot route to itself")
+
+        for key in ("timeout", "hedge_after", "cooldown"):
+            value = config.get(key)
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ValueError(f"{key} must be a positive number")
+
+        max_error_rate = config.get("max_error_rate", DEFAULT_MAX_ERROR_RATE)
+        if not 0 < max_error_rate <= 1:
+            raise ValueError("max_error_rate must be between 0 and 1")
+
+        return config
+
+    def register_actions(self) -> None:
+        """Register available router actions"""
+        self.actions = {
+            "generate-text": Action(
+                name="generate-text",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                ],
+                description="Generate text with the fastest healthy LLM provider"
+            ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", True, str, "System prompt to guide the model"),
+                ],
+                description="Stream generated text token by token from the fastest healthy LLM provider"
+            ),
+            "provider-stats": Action(
+                name="provider-stats",
+                parameters=[],
+                description="Show rolling latency and error rate per provider/model"
+            ),
+        }
+
+    def attach(self, manager) -> None:
+        """Give the router access to the connections it routes between"""
+        self._manager = manager
+        workers = self.config.get("max_workers", 8) + MAX_ABANDONED_CALLS * len(self.providers())
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-router")
+
+    def configure(self, **kwargs) -> bool:
+        """The router has no credentials of its own"""
+        logger.info("\n🔀 The router uses the LLM connections configured in this agent.")
+        return self.is_configured(verbose=True)
+
+    def is_configured(self, verbose=False) -> bool:
+        healthy = [name for name in self.providers() if self._manager.health.is_healthy(name)]
+        if not healthy and verbose:
+            logger.error("No configured LLM provider available for the router")
+        return bool(healthy)
+
+    def providers(self) -> List[str]:
+        """LLM connections the router may use, in configured preference order"""
+        if self._manager is None:
+            return []
+        connections = self._manager.connections
+        names = self.config.get("providers") or list(connections)
+        return [
+            name for name in names
+            if name != self.config["name"] and name in connections and connections[name].is_llm_provider
+        ]
+
+    def _stats_key(self, provider: str) -> str:
+        return f"{provider}/{self._manager.connections[provider].config.get('model', '')}"
+
+    def _stats_for(self, provider: str) -> ProviderStats:
+        key = self._stats_key(provider)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = ProviderStats(self.config.get("window", DEFAULT_WINDOW))
+            return self._stats[key]
+
+    def _is_tripped(self, stats: ProviderStats) -> bool:
+        if len(stats.outcomes) < MIN_SAMPLES_TO_TRIP:
+            return False
+        if stats.error_rate < self.config.get("max_error_rate", DEFAULT_MAX_ERROR_RATE):
+            return False
+        return time.monotonic() - stats.last_failure < self.config.get("cooldown", DEFAULT_COOLDOWN)
+
+    def ranked_providers(self) -> List[str]:
+        """
+        Healthy providers, best first; tripped ones stay at the end as a last
+        resort. Providers with MAX_ABANDONED_CALLS timed-out calls still
+        running are left out until those calls return.
+        """
+        with self._lock:
+            stuck = {name for name, count in self._abandoned.items() if count >= MAX_ABANDONED_CALLS}
+        healthy = [name for name in self.providers()
+                   if name not in stuck and self._manager.health.is_healthy(name)]
+        stats = {name: self._stats_for(name) for name in healthy}
+        known = [p50 for p50 in (entry.percentile(50) for entry in stats.values()) if p50 is not None]
+        # Providers without latency samples (untried, or never succeeded) get the typical latency
+        typical = statistics.median(known) if known else 0.0
+
+        ranked = []
+        for order, name in enumerate(healthy):
+            entry = stats[name]
+            p50 = entry.percentile(50)
+            expected = (p50 if p50 is not None else typical) / max(1 - entry.error_rate, MIN_SUCCESS_RATE)
+            ranked.append(((self._is_tripped(entry), expected, order), name))
+        return [name for _, name in sorted(ranked)]
+
+    def _call(self, provider: str, kwargs: Dict[str, Any], attempt: _Attempt) -> str:
+        stats = self._stats_for(provider)
+        started = time.monotonic()
+        try:
+            result = self._manager.perform_action(
+                provider, "generate-text", [kwargs["prompt"], kwargs["system_prompt"]], raise_errors=True
+            )
+            if not result:
+                raise RouterAPIError("empty response")
+        except Exception:
+            if attempt.settle():
+                stats.record(False)
+            else:
+                self._call_returned(provider)
+            raise
+        if attempt.settle():
+            stats.record(True, time.monotonic() - started)
+        else:
+            # Already recorded as a timeout by generate_text
+            self._call_returned(provider)
+        return result
+
+    def _abandon(self, provider: str, attempt: _Attempt) -> None:
+        """Give up waiting on a call; it keeps running in the pool"""
+        if attempt.settle():
+            with self._lock:
+                self._abandoned[provider] = self._abandoned.get(provider, 0) + 1
+            self._stats_for(provider).record(False)
+
+    def _call_returned(self, provider: str) -> None:
+        with self._lock:
+            self._abandoned[provider] -= 1
+
+    def generate_text(self, prompt: str, system_prompt: str, **kwargs) -> str:
+        """Generate text, failing over (and optionally hedging) across providers"""
+        candidates = self.ranked_providers()
+        if not candidates:
+            raise RouterAPIError("No healthy LLM provider available")
+
+        request = {"prompt": prompt, "system_prompt": system_prompt}
+        timeout = self.config.get("timeout", DEFAULT_TIMEOUT)
+        hedge_after = self.config.get("hedge_after")
+        pending: Dict[Future, Tuple[str, float, _Attempt]] = {}
+        errors = []
+        hedged = False
+
+        def launch() -> None:
+            provider = candidates.pop(0)
+            logger.debug(f"Routing generate-text to {provider}")
+            attempt = _Attempt()
+            pending[self._executor.submit(self._call, provider, request, attempt)] = (
+                provider, time.monotonic(), attempt
+            )
+
+        launch()
+        while pending:
+            now = time.monotonic()
+            deadlines = [started + timeout for _, started, _ in pending.values()]
+            if hedge_after and not hedged and candidates and len(pending) == 1:
+                deadlines.append(min(started for _, started, _ in pending.values()) + hedge_after)
+            done, _ = wait(pending, timeout=max(0.0, min(deadlines) - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                provider, _, _ = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.warning(f"LLM provider {provider} failed: {e}")
+                    errors.append(f"{provider}: {e}")
+
+            now = time.monotonic()
+            for future, (provider, started, attempt) in list(pending.items()):
+                # A call that finished meanwhile is picked up by the next wait
+                if now - started >= timeout and not future.done():
+                    pending.pop(future)
+                    self._abandon(provider, attempt)
+                    logger.warning(f"LLM provider {provider} timed out after {timeout}s")
+                    errors.append(f"{provider}: timed out")
+
+            if not candidates:
+                continue
+            if not pending:
+                launch()
+            elif hedge_after and not hedged and now - min(s for _, s, _ in pending.values()) >= hedge_after:
+                hedged = True
+                logger.info(f"Hedging slow LLM request with {candidates[0]}")
+                launch()
+
+        raise RouterAPIError(f"All LLM providers failed: {'; '.join(errors)}")
+
+    def generate_text_stream(self, prompt: str, system_prompt: str, **kwargs) -> Iterator[str]:
+        """Stream text from the best provider; fails over only until the first token arrives"""
+        candidates = self.ranked_providers()
+        if not candidates:
+            raise RouterAPIError("No healthy LLM provider available")
+
+        request = {"prompt": prompt, "system_prompt": system_prompt}
+        errors = []
+        for provider in candidates:
+            stats = self._stats_for(provider)
+            try:
+                stream = self._manager.perform_action(
+                    provider, "generate-text-stream", [prompt, system_prompt], raise_errors=True
+                )
+                first = next(stream, None)
+            except Exception as e:
+                stats.record(False)
+                logger.warning(f"LLM provider {provider} failed to start streaming: {e}")
+                errors.append(f"{provider}: {e}")
+                continue
+
+            if first is not None:
+                yield first
+            try:
+                yield from stream
+            except Exception:
+                stats.record(False)
+                raise
+            stats.record(True)
+            return
+
+        raise RouterAPIError(f"All LLM providers failed: {'; '.join(errors)}")
+
+    def provider_stats(self, **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Rolling p50/p95 latency (seconds) and error rate per provider/model"""
+        report = {}
+        for provider in self.providers():
+            stats = self._stats_for(provider)
+            report[self._stats_key(provider)] = dict(stats.as_dict(), tripped=self._is_tripped(stats))
+        return report
@@ -44,6 +44,8 @@ class SolanaConfigurationError(SolanaConnectionError):
 
 
 class SolanaConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-balance", "fetch-price", "get-tps", "get-token-by-ticker", "get-token-by-address"})
+
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Solana connection...")
         super().__init__(config)
@@ -414,17 +416,3 @@ class SolanaConnection(BaseConnection):
         #    f"Launched Pump & Fun token {token_ticker}\nToken Mint: {res['mint']}"
         # )
         # return res
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Solana action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace("-", "_")
-        method = getattr(self, method_name)
-        return method(**kwargs)
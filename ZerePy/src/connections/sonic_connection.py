@@ -1,6 +1,6 @@
 import logging
 import os
-import requests
+from src import transport
 import time
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv, set_key
@@ -19,6 +19,7 @@ class SonicConnectionError(Exception):
 
 
 class SonicConnection(BaseConnection):
+    coalesce_actions = frozenset({"get-balance", "get-token-by-ticker"})
 
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Sonic connection...")
@@ -80,7 +81,7 @@ class SonicConnection(BaseConnection):
             if ticker.lower() in ["s", "S"]:
                 return "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
 
-            response = requests.get(
+            response = transport.get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
             )
             response.raise_for_status()
@@ -314,7 +315,7 @@ class SonicConnection(BaseConnection):
                 "gasInclude": "true"
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            response = transport.get(url, headers=headers, params=params)
             response.raise_for_status()
 
             data = response.json()
@@ -345,7 +346,7 @@ class SonicConnection(BaseConnection):
                 "source": "ZerePyBot"
             }
 
-            response = requests.post(url, headers=headers, json=payload)
+            response = transport.post(url, headers=headers, json=payload)
             response.raise_for_status()
 
             data = response.json()
@@ -464,21 +465,8 @@ class SonicConnection(BaseConnection):
             logger.error(f"Swap failed: {e}")
             raise
 
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Sonic action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         load_dotenv()
 
         if not self.is_configured(verbose=True):
-            raise SonicConnectionError("Sonic is not properly configured")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
\ No newline at end of file
+            raise SonicConnectionError("Sonic is not properly configured")
\ No newline at end of file
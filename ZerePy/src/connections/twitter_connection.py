@@ -1,19 +1,55 @@
 import base64
+import hashlib
 import os
 import logging
+import re
 import time
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 import requests
 from requests_oauthlib import OAuth1Session
 from dotenv import set_key, load_dotenv
 
-from src.actions.twitter_actions import generate_image
-from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.connections.base_connection import BaseConnection, Action, ActionParameter, InvalidActionRequest
 from src.helpers import print_h_bar
+from src.helpers.images import render_tweet_image
+from src.helpers.media_upload import (
+    ChunkedMediaUpload, DEFAULT_SEGMENT_SIZE, MediaSource, MediaUploadError, UploadState
+)
+from src.rate_limits import RateLimitTracker
+from src.seen_index import SeenIndex, DEFAULT_MAX_ENTRIES
 
 logger = logging.getLogger("connections.twitter_connection")
 
+# One index per agent ({scope} is the agent name, or the account's user ID outside an agent)
+DEFAULT_SEEN_INDEX_PATH = "~/.zerepy/twitter_seen/{scope}.sqlite"
+# The timeline endpoint returns at most this many tweets per page
+TIMELINE_PAGE_SIZE = 100
+# Pages read_timeline fetches to reach its cursor (the endpoint only goes back about 800 tweets)
+MAX_TIMELINE_CATCH_UP_PAGES = 8
+# Longest a write waits in the pacing queue before it is rejected instead (seconds)
+DEFAULT_RATE_LIMIT_MAX_WAIT = 30
+# Retry delay after a 429 that carried no x-rate-limit-reset header (the window length)
+RATE_LIMIT_FALLBACK_WAIT = 15 * 60
+
+# Connection action -> (method, endpoint) it spends budget on; numeric path segments become ":id"
+ACTION_ENDPOINTS = {
+    "post-tweet": ("post", "tweets"),
+    "post-tweet-with-image": ("post", "tweets"),
+    "reply-to-tweet": ("post", "tweets"),
+    "like-tweet": ("post", "users/:id/likes"),
+    "read-timeline": ("get", "users/:id/timelines/reverse_chronological"),
+    "get-timeline": ("get", "users/:id/timelines/reverse_chronological"),
+    "get-latest-tweets": ("get", "tweets/search/recent"),
+    "get-tweet-replies": ("get", "tweets/search/recent"),
+    "get-tweet": ("get", "tweets/:id"),
+}
+# Most tweet ids one GET /2/tweets lookup accepts
+MAX_TWEET_LOOKUP_IDS = 100
+TWEET_LOOKUP_FIELDS = "author_id,created_at,conversation_id,text"
+# Endpoints exempt from write pacing: chunked uploads send many APPENDs back to back
+UNPACED_ENDPOINTS = ("media/upload",)
+
 
 class TwitterConnectionError(Exception):
     """Base exception for Twitter connection errors"""
@@ -30,10 +66,26 @@ class TwitterAPIError(TwitterConnectionError):
     pass
 
 
+class TwitterRateLimitError(TwitterAPIError):
+    """Raised when an endpoint's rate-limit window is spent"""
+
+    def __init__(self, endpoint: str, retry_at: float):
+        super().__init__(f"Rate limit reached for {endpoint}, retry in {max(0, retry_at - time.time()):.0f}s")
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+
+
 class TwitterConnection(BaseConnection):
+    # read-timeline is left out: each call advances the since_id cursor and claims its tweets
+    coalesce_actions = frozenset({"get-timeline", "get-latest-tweets", "get-tweet-replies", "get-tweet"})
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._oauth_session = None
+        self._seen_index = None
+        self._rate_limits = RateLimitTracker()
+        # Chunked uploads that failed part-way, keyed by media fingerprint, so a retry resumes them
+        self._partial_uploads: Dict[str, UploadState] = {}
 
     @property
     def is_llm_provider(self) -> bool:
@@ -81,6 +133,14 @@ class TwitterConnection(BaseConnection):
                 ],
                 description="Post a new tweet with an AI-generated image"
             ),
+            "post-tweet-with-media": Action(
+                name="post-tweet-with-media",
+                parameters=[
+                    ActionParameter("message", True, str, "Text content of the tweet"),
+                    ActionParameter("media", True, bytes, "Image bytes to attach")
+                ],
+                description="Post a new tweet with an image that was already generated"
+            ),
             "read-timeline": Action(
                 name="read-timeline",
                 parameters=[
@@ -88,6 +148,13 @@ class TwitterConnection(BaseConnection):
                 ],
                 description="Read tweets from user's timeline"
             ),
+            "get-timeline": Action(
+                name="get-timeline",
+                parameters=[
+                    ActionParameter("count", False, int, "Number of tweets to return")
+                ],
+                description="Latest timeline tweets, without moving the read-timeline cursor"
+            ),
             "like-tweet": Action(
                 name="like-tweet",
                 parameters=[
@@ -109,6 +176,18 @@ class TwitterConnection(BaseConnection):
                     ActionParameter("tweet_id", True, str, "ID of the tweet to query for replies")
                 ],
                 description="Fetch tweet replies"
+            ),
+            "get-tweet": Action(
+                name="get-tweet",
+                parameters=[
+                    ActionParameter("tweet_id", True, str, "ID of the tweet to fetch")
+                ],
+                description="Fetch a single tweet by ID"
+            ),
+            "get-rate-limits": Action(
+                name="get-rate-limits",
+                parameters=[],
+                description="Show the remaining rate-limit budget per endpoint"
             )
         }
 
@@ -141,10 +220,19 @@ class TwitterConnection(BaseConnection):
         logger.debug("All required credentials found")
         return credentials
 
+    @staticmethod
+    def _endpoint_key(method: str, endpoint: str) -> str:
+        """Rate-limit bucket for a request, e.g. 'POST users/:id/likes'"""
+        path = "/".join(":id" if part.isdigit() else part for part in endpoint.strip("/").split("/"))
+        return f"{method.upper()} {path}"
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> dict:
         """
         Make a request to the Twitter API with error handling
 
+        Writes are paced to fit the endpoint's rate-limit window, and calls to
+        an endpoint whose window is spent fail fast with TwitterRateLimitError.
+
         Args:
             method: HTTP method ('get', 'post', etc.)
             endpoint: API endpoint path
@@ -154,13 +242,29 @@ class TwitterConnection(BaseConnection):
             Dict containing the API response
         """
         logger.debug(f"Making {method.upper()} request to {endpoint}")
+        key = self._endpoint_key(method, endpoint)
         try:
+            retry_at = self._rate_limits.acquire(
+                key,
+                paced=method.lower() != "get" and endpoint.strip("/") not in UNPACED_ENDPOINTS,
+                max_wait=self.config.get("rate_limit_max_wait", DEFAULT_RATE_LIMIT_MAX_WAIT)
+            )
+            if retry_at is not None:
+                raise TwitterRateLimitError(key, retry_at)
+
             oauth = self._get_oauth()
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
             response = getattr(oauth, method.lower())(full_url, **kwargs)
+            self._rate_limits.update(key, response.headers)
 
-            if response.status_code not in [200, 201]:
+            if response.status_code == 429:
+                reset_at = float(response.headers.get("x-rate-limit-reset", time.time() + RATE_LIMIT_FALLBACK_WAIT))
+                self._rate_limits.mark_exhausted(key, reset_at)
+                logger.warning(f"Rate limited on {key} until {time.ctime(reset_at)}")
+                raise TwitterRateLimitError(key, reset_at)
+
+            if response.status_code not in [200, 201, 202, 204]:
                 logger.error(
                     f"Request failed: {response.status_code} - {response.text}"
                 )
@@ -169,11 +273,25 @@ class TwitterConnection(BaseConnection):
                 )
 
             logger.debug(f"Request successful: {response.status_code}")
-            return response.json()
+            # APPEND and some write endpoints answer with an empty body
+            return response.json() if response.content else {}
 
+        except TwitterRateLimitError:
+            raise
         except Exception as e:
             raise TwitterAPIError(f"API request failed: {str(e)}")
 
+    def ready_at(self, action_name: str) -> float:
+        """Earliest unix time a connection action fits its endpoint's rate limit (0 if now)"""
+        method, endpoint = ACTION_ENDPOINTS.get(action_name, (None, None))
+        if method is None:
+            return 0
+        return self._rate_limits.ready_at(self._endpoint_key(method, endpoint), paced=method != "get")
+
+    def get_rate_limits(self, **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Remaining budget and seconds until reset for every endpoint seen so far"""
+        return self._rate_limits.snapshot()
+
     def _get_oauth(self) -> OAuth1Session:
         """Get or create OAuth session using stored credentials"""
         if self._oauth_session is None:
@@ -216,11 +334,11 @@ class TwitterConnection(BaseConnection):
         if not text:
             error_msg = f"{context} text cannot be empty"
             logger.error(error_msg)
-            raise ValueError(error_msg)
+            raise InvalidActionRequest(error_msg)
         if len(text) > 280:
             error_msg = f"{context} exceeds 280 character limit"
             logger.error(error_msg)
-            raise ValueError(error_msg)
+            raise InvalidActionRequest(error_msg)
         logger.debug(f"Tweet text validation passed for {context.lower()}")
 
     def configure(self) -> None:
@@ -362,60 +480,74 @@ class TwitterConnection(BaseConnection):
                 logger.error(f"Configuration validation failed: {error_msg}")
             return False
 
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute a Twitter action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
+    def before_action(self, action_name: str, kwargs: Dict[str, Any]) -> None:
         # Add config parameters if not provided
         if action_name == "read-timeline" and "count" not in kwargs:
             kwargs["count"] = self.config["timeline_read_count"]
 
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
+    def _get_seen_index(self) -> SeenIndex:
+        """Tweets already delivered by read_timeline, plus the timeline's since_id cursor"""
+        if self._seen_index is None:
+            # "seen_index_path": null keeps the index in memory only
+            path = self.config.get("seen_index_path", DEFAULT_SEEN_INDEX_PATH) or ":memory:"
+            scope = self.config.get("seen_index_scope") or self._get_credentials()['TWITTER_USER_ID']
+            path = path.replace("{scope}", re.sub(r"[^\w.-]", "_", scope))
+            self._seen_index = SeenIndex(
+                path, max_entries=self.config.get("seen_index_size", DEFAULT_MAX_ENTRIES)
+            )
+        return self._seen_index
 
-    def read_timeline(self, count: int = None, **kwargs) -> list:
-        """Read tweets from the user's timeline"""
-        if count is None:
-            count = self.config["timeline_read_count"]
+    def _fetch_timeline(self, count: int, since_id: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        Up to `count` timeline tweets, newest first, with author names.
 
-        logger.debug(f"Reading timeline, count: {count}")
+        Without `since_id` these are the latest tweets. With it, pages are
+        fetched back to `since_id` and the `count` oldest new tweets are kept,
+        so tweets beyond `count` are left for the next read instead of being
+        skipped. Returns (tweets, id of the newest tweet returned).
+        """
+        if count <= 0:
+            return [], None
         credentials = self._get_credentials()
-
         params = {
             "tweet.fields": "created_at,author_id,attachments",
             "expansions": "author_id",
             "user.fields": "name,username",
-            "max_results": count
+            "max_results": TIMELINE_PAGE_SIZE if since_id else min(count, TIMELINE_PAGE_SIZE)
         }
+        if since_id:
+            params["since_id"] = since_id
 
-        response = self._make_request(
-            'get',
-            f"users/{credentials['TWITTER_USER_ID']}/timelines/reverse_chronological",
-            params=params
-        )
-
-        tweets = response.get("data", [])
-        user_info = response.get("includes", {}).get("users", [])
+        tweets = []
+        user_dict = {}
+        pages = 0
+        while since_id or len(tweets) < count:
+            response = self._make_request(
+                'get',
+                f"users/{credentials['TWITTER_USER_ID']}/timelines/reverse_chronological",
+                params=params
+            )
+            pages += 1
+            meta = response.get("meta", {})
+
+            tweets.extend(response.get("data", []))
+            for user in response.get("includes", {}).get("users", []):
+                user_dict[user['id']] = {
+                    'name': user['name'],
+                    'username': user['username']
+                }
 
-        user_dict = {
-            user['id']: {
-                'name': user['name'],
-                'username': user['username']
-            }
-            for user in user_info
-        }
+            if not meta.get("next_token"):
+                break
+            if since_id and pages >= MAX_TIMELINE_CATCH_UP_PAGES:
+                logger.warning(f"Timeline has more than {len(tweets)} new tweets; older ones are skipped")
+                break
+            params["pagination_token"] = meta["next_token"]
 
+        # Reverse chronological, so the oldest new tweets are at the end
+        tweets = tweets[-count:] if since_id else tweets[:count]
         for tweet in tweets:
-            author_id = tweet['author_id']
-            author_info = user_dict.get(author_id, {
+            author_info = user_dict.get(tweet['author_id'], {
                 'name': "Unknown",
                 'username': "Unknown"
             })
@@ -423,8 +555,42 @@ class TwitterConnection(BaseConnection):
                 'author_name': author_info['name'],
                 'author_username': author_info['username']
             })
+        newest_id = max((tweet['id'] for tweet in tweets), key=int, default=None)
+        return tweets, newest_id
 
-        logger.debug(f"Retrieved {len(tweets)} tweets")
+    def read_timeline(self, count: int = None, **kwargs) -> list:
+        """
+        Read new tweets from the user's timeline
+
+        Only tweets posted since the last read (tracked with `since_id`) are
+        fetched, oldest first when more than `count` arrived, and tweets that
+        were already returned before, including before a restart, are
+        filtered out.
+        """
+        if count is None:
+            count = self.config["timeline_read_count"]
+
+        logger.debug(f"Reading timeline, count: {count}")
+        seen_index = self._get_seen_index()
+        # Keyed by account, so switching credentials doesn't reuse another account's cursor
+        cursor = f"timeline_since_id:{self._get_credentials()['TWITTER_USER_ID']}"
+
+        tweets, newest_id = self._fetch_timeline(count, seen_index.get_cursor(cursor))
+        new_ids = set(seen_index.filter_new(tweet['id'] for tweet in tweets))
+        seen_index.add(tweet['id'] for tweet in tweets)
+        if newest_id:
+            seen_index.set_cursor(cursor, newest_id)
+
+        new_tweets = [tweet for tweet in tweets if tweet['id'] in new_ids]
+        logger.debug(f"Retrieved {len(new_tweets)} new tweets ({len(tweets) - len(new_tweets)} already seen)")
+        return new_tweets
+
+    def get_timeline(self, count: int = None, **kwargs) -> list:
+        """Latest timeline tweets, whether or not read_timeline returned them before; leaves its cursor alone"""
+        if count is None:
+            count = self.config["timeline_read_count"]
+        logger.debug(f"Getting latest timeline tweets, count: {count}")
+        tweets, _ = self._fetch_timeline(count)
         return tweets
 
     def get_latest_tweets(self,
@@ -459,13 +625,44 @@ class TwitterConnection(BaseConnection):
         logger.info("Tweet posted successfully")
         return response
 
-    def upload_media(self, media_path: str) -> str:
-        """Uploads an image to Twitter and returns the media ID."""
-        logger.debug(f"Uploading media: {media_path}")
+    @staticmethod
+    def _media_fingerprint(media: MediaSource) -> str:
+        if isinstance(media, str):
+            stat = os.stat(media)
+            return f"{os.path.abspath(media)}:{stat.st_size}:{stat.st_mtime_ns}"
+        return hashlib.sha256(media).hexdigest()
+
+    def upload_media(self, media: MediaSource, media_type: str = "image/jpeg",
+                     resume: Optional[UploadState] = None) -> str:
+        """
+        Uploads media to Twitter and returns the media ID.
+
+        `media` is a buffer or a file path. Files and buffers larger than
+        `media_chunk_size` go through the chunked INIT/APPEND/FINALIZE flow,
+        which streams segments instead of loading everything at once; pass the
+        `state` of a failed chunked upload as `resume` to send only what is missing.
+        """
+        chunk_size = self.config.get("media_chunk_size", DEFAULT_SEGMENT_SIZE)
+        if resume is not None or isinstance(media, str) or len(media) > chunk_size:
+            fingerprint = self._media_fingerprint(media)
+            upload = ChunkedMediaUpload(
+                self._make_request, media, media_type, segment_size=chunk_size,
+                max_workers=self.config.get("media_upload_workers", 3)
+            )
+            try:
+                media_id = upload.run(resume or self._partial_uploads.pop(fingerprint, None))
+            except MediaUploadError as e:
+                if e.state is not None:
+                    self._partial_uploads[fingerprint] = e.state
+                raise
+            logger.info(f"Media uploaded in chunks, ID: {media_id}")
+            return media_id
+
+        logger.debug(f"Uploading media: {len(media)} bytes")
 
-        with open(media_path, "rb") as media_file:
-            files = {"media": media_file}  # This sends the image as multipart/form-data
-            response = self._make_request("post", "media/upload", files=files)
+        # Sent as multipart/form-data straight from memory, no temp file
+        files = {"media": ("image", media, media_type)}
+        response = self._make_request("post", "media/upload", files=files)
 
         # Check for media_id_string; if not available, try 'id'
         if "media_id_string" in response:
@@ -479,41 +676,39 @@ class TwitterConnection(BaseConnection):
         logger.info(f"Media uploaded successfully, ID: {media_id}")
         return media_id
 
+    def post_tweet_with_media(self, message: str, media: bytes, **kwargs) -> dict:
+        """Post a new tweet with an already generated image"""
+        logger.debug("Posting new tweet with media")
+        self._validate_tweet_text(message)
+
+        # Errors propagate with the API's text and any retry_at, so the outbox can
+        # spot a duplicate of a post that already went through and wait out a rate limit
+        media_id = self.upload_media(media)
+        response = self._make_request(
+            'post',
+            'tweets',
+            json={
+                'text': message,
+                'media': {'media_ids': [media_id]}  # Must be media_ids, not media_keys
+            }
+        )
+
+        logger.info("Tweet posted successfully with image!")
+        return response
+
     def post_tweet_with_image(self, message: str, image_prompt: str, **kwargs) -> dict:
         """Post a new tweet with an AI-generated image"""
         logger.debug("Posting new tweet with image")
         self._validate_tweet_text(message)
 
         try:
-            image_path = generate_image(image_prompt, "./generated_image.jpeg")
-            logger.info(f"Generated image saved to {image_path}")
+            image = render_tweet_image(image_prompt, self.config.get("image_debug_path"))
+            logger.info(f"Generated image ({len(image)} bytes)")
         except Exception as e:
             logger.error(f"Image generation failed: {e}")
             return {"error": "Image generation failed"}
 
-        # Upload the image and get media_id
-        try:
-            media_id = self.upload_media("./generated_image.jpeg")
-        except Exception as e:
-            logger.error(f"Failed to upload media: {e}")
-            return {"error": "Media upload failed"}
-
-        # Post the tweet with media
-        try:
-            response = self._make_request(
-                'post',
-                'tweets',
-                json={
-                    'text': message,
-                    'media': {'media_ids': [media_id]}  # Must be media_ids, not media_keys
-                }
-            )
-        except Exception as e:
-            logger.error(f"Error posting tweet with image: {e}")
-            return {"error": "Tweet posting failed"}
-
-        logger.info("Tweet posted successfully with image!")
-        return response
+        return self.post_tweet_with_media(message, image)
 
     def reply_to_tweet(self, tweet_id: str, message: str, **kwargs) -> dict:
         """Reply to an existing tweet"""
@@ -559,4 +754,36 @@ class TwitterConnection(BaseConnection):
         replies = response.get("data", [])
 
         logger.info(f"Retrieved {len(replies)} replies")
-        return replies
\ No newline at end of file
+        return replies
+
+    def get_tweet(self, tweet_id: str, **kwargs) -> dict:
+        """Fetch a single tweet"""
+        logger.debug(f"Fetching tweet {tweet_id}")
+        response = self._make_request('get', f"tweets/{tweet_id}",
+                                      params={"tweet.fields": TWEET_LOOKUP_FIELDS})
+        return response.get("data", {})
+
+    def get_tweet_batch(self, calls: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Batch form of get-tweet for ConnectionManager.perform_actions: one
+        GET /2/tweets?ids=... per 100 ids instead of one request per tweet.
+        Ids the lookup doesn't return (deleted, protected) fail on their own.
+        """
+        ids = list(dict.fromkeys(call["tweet_id"] for call in calls))
+        found: Dict[str, dict] = {}
+        errors: Dict[str, str] = {}
+        for start in range(0, len(ids), MAX_TWEET_LOOKUP_IDS):
+            chunk = ids[start:start + MAX_TWEET_LOOKUP_IDS]
+            logger.debug(f"Looking up {len(chunk)} tweets")
+            response = self._make_request('get', "tweets",
+                                          params={"ids": ",".join(chunk), "tweet.fields": TWEET_LOOKUP_FIELDS})
+            for tweet in response.get("data", []):
+                found[tweet["id"]] = tweet
+            for error in response.get("errors", []):
+                errors[error.get("value") or error.get("resource_id")] = error.get("detail") or error.get("title")
+
+        return [
+            found[call["tweet_id"]] if call["tweet_id"] in found
+            else TwitterAPIError(f"Tweet {call['tweet_id']} not found: {errors.get(call['tweet_id'], 'no data returned')}")
+            for call in calls
+        ]
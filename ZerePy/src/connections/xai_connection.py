@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Iterator
 from openai import OpenAI
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
@@ -53,6 +53,15 @@ class XAIConnection(BaseConnection):
                 ],
                 description="Generate text using XAI models"
             ),
+            "generate-text-stream": Action(
+                name="generate-text-stream",
+                parameters=[
+                    ActionParameter("prompt", True, str, "The input prompt for text generation"),
+                    ActionParameter("system_prompt", False, str, "System prompt to guide the model"),
+                    ActionParameter("model", False, str, "Model to use for generation")
+                ],
+                description="Stream generated text token by token using XAI models"
+            ),
             "check-model": Action(
                 name="check-model",
                 parameters=[
@@ -152,6 +161,25 @@ class XAIConnection(BaseConnection):
         except Exception as e:
             raise XAIAPIError(f"Text generation failed: {e}")
 
+    def generate_text_stream(self, prompt: str, system_prompt: str = None, model: str = None, **kwargs) -> Iterator[str]:
+        """Stream text from XAI models, yielding tokens as they arrive"""
+        try:
+            client = self._get_client()
+            stream = client.chat.completions.create(
+                model=model or self.config["model"],
+                messages=[
+                    {"role": "system", "content": system_prompt or ""},
+                    {"role": "user", "content": prompt},
+                ],
+                stream=True,
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            raise XAIAPIError(f"Text streaming failed: {e}")
+
     def check_model(self, model: str, **kwargs) -> bool:
         """Check if a specific model is available"""
         try:
@@ -176,18 +204,3 @@ class XAIConnection(BaseConnection):
                 
         except Exception as e:
             raise XAIAPIError(f"Listing models failed: {e}")
-
-    def perform_action(self, action_name: str, kwargs) -> Any:
-        """Execute an action with validation"""
-        if action_name not in self.actions:
-            raise KeyError(f"Unknown action: {action_name}")
-
-        action = self.actions[action_name]
-        errors = action.validate_params(kwargs)
-        if errors:
-            raise ValueError(f"Invalid parameters: {', '.join(errors)}")
-
-        # Call the appropriate method based on action name
-        method_name = action_name.replace('-', '_')
-        method = getattr(self, method_name)
-        return method(**kwargs)
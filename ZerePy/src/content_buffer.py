@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from src.action_handler import action_pregenerators
+from src.events import run_as_agent
+
+logger = logging.getLogger("content_buffer")
+
+DEFAULT_SIZE = 2
+DEFAULT_TTL = 1800            # seconds a candidate stays postable
+DEFAULT_REFILL_INTERVAL = 30  # seconds between checks once every buffer is full
+# Seconds to back off after a generation failed, so a dead provider isn't hammered
+FAILURE_BACKOFF = 60
+
+
+@dataclass
+class Candidate:
+    text: str
+    created_at: float
+
+
+class ContentBuffer:
+    """
+    Keeps a few ready-to-post texts per posting task (post-tweet, post-echochambers, ...).
+
+    A background thread fills each buffer with the task's registered
+    `pregenerate` function while the agent is waiting for its next task, so a
+    post becomes a buffer pop plus a single API call. Candidates older than
+    `ttl` are dropped instead of posted.
+    """
+
+    def __init__(self, agent, tasks: Iterable[str], size: int = DEFAULT_SIZE, ttl: float = DEFAULT_TTL,
+                 refill_interval: float = DEFAULT_REFILL_INTERVAL):
+        self.agent = agent
+        self.size = size
+        self.ttl = ttl
+        self.refill_interval = refill_interval
+        self._buffers: Dict[str, Deque[Candidate]] = {
+            task: deque() for task in tasks if task in action_pregenerators
+        }
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.served = 0
+        self.expired = 0
+
+    @classmethod
+    def from_config(cls, agent, config: Dict[str, Any]) -> "ContentBuffer":
+        """Build a buffer from the `content_buffer` block of an agent file"""
+        tasks = config.get("tasks") or [task["name"] for task in agent.tasks if task.get("weight", 0) > 0]
+        return cls(
+            agent,
+            tasks=tasks,
+            size=config.get("size", DEFAULT_SIZE),
+            ttl=config.get("ttl", DEFAULT_TTL),
+            refill_interval=config.get("refill_interval", DEFAULT_REFILL_INTERVAL),
+        )
+
+    @property
+    def tasks(self):
+        return list(self._buffers)
+
+    def _drop_stale(self, task_name: str, now: float) -> None:
+        buffer = self._buffers[task_name]
+        while buffer and now - buffer[0].created_at > self.ttl:
+            buffer.popleft()
+            self.expired += 1
+
+    def take(self, task_name: str) -> Optional[str]:
+        """Pop the oldest fresh candidate for a task, or None if the buffer is empty"""
+        if task_name not in self._buffers:
+            return None
+        with self._lock:
+            self._drop_stale(task_name, time.time())
+            candidate = self._buffers[task_name].popleft() if self._buffers[task_name] else None
+            if candidate:
+                self.served += 1
+        self._wake.set()
+        return candidate.text if candidate else None
+
+    def deficit(self, task_name: str) -> int:
+        with self._lock:
+            self._drop_stale(task_name, time.time())
+            return self.size - len(self._buffers[task_name])
+
+    def refill_once(self) -> bool:
+        """Generate one candidate for the emptiest buffer; returns False if all are full"""
+        deficits = {task: self.deficit(task) for task in self._buffers}
+        task_name = max(deficits, key=deficits.get, default=None)
+        if task_name is None or deficits[task_name] <= 0:
+            return False
+
+        text = action_pregenerators[task_name](self.agent)
+        if not text:
+            raise RuntimeError(f"no text generated for {task_name}")
+        with self._lock:
+            self._buffers[task_name].append(Candidate(text, time.time()))
+        logger.debug(f"Buffered a candidate for {task_name}")
+        return True
+
+    def _refill_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.clear()
+            try:
+                if self.refill_once():
+                    continue
+                delay = self.refill_interval
+            except Exception as e:
+                logger.warning(f"Pre-generation failed: {e}")
+                delay = FAILURE_BACKOFF
+            self._wake.wait(timeout=delay)
+
+    def start(self) -> None:
+        """Start the background refill thread"""
+        if not self._buffers or (self._thread and self._thread.is_alive()):
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=run_as_agent, args=(self.agent.agent_name, self._refill_loop),
+                                        name="content-buffer", daemon=True)
+        self._thread.start()
+        logger.info(f"Pre-generating content for: {', '.join(self._buffers)}")
+
+    def stop(self) -> None:
+        if self._thread:
+            self._stop_event.set()
+            self._wake.set()
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = {task: len(buffer) for task, buffer in self._buffers.items()}
+        return {"buffered": buffered, "served": self.served, "expired": self.expired}
@@ -0,0 +1,178 @@
+import asyncio
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("events")
+
+DEFAULT_REPLAY_SIZE = 500
+# Events queued for one subscriber before the oldest are dropped
+DEFAULT_SUBSCRIBER_QUEUE = 1000
+# Loggers whose records are forwarded to the bus as `log` events
+LOG_EVENT_LOGGERS = ("agent", "actions", "connections", "scheduler", "server/runner", "content_buffer", "image_service")
+
+# Host name of the agent whose work the current thread or task is doing, so its logs reach its own bus
+current_agent: ContextVar[Optional[str]] = ContextVar("current_agent", default=None)
+
+# Explorer links (`.../tx/<hash>`) in the results of chain actions
+TX_LINK_PATTERN = re.compile(r"/tx/([0-9a-zA-Z]+)")
+
+
+@dataclass
+class Event:
+    id: int
+    type: str
+    data: Dict[str, Any]
+    time: float = field(default_factory=time.time)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "type": self.type, "time": self.time, "data": self.data}
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class Subscription:
+    """An asyncio-side queue of events for one subscriber; slow subscribers lose their oldest events"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.loop = loop
+        self.dropped = 0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def _deliver(self, event: Event) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        return await self._queue.get()
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for agent activity.
+
+    Publishers are plain threads (connection calls, the agent loop);
+    subscribers are asyncio consumers such as the server's `/events` stream.
+    Every event gets an increasing id, and the last `replay_size` events are
+    kept so a late or reconnecting subscriber can catch up from an id.
+    Publishing with no subscribers only costs an append to the replay buffer.
+    """
+
+    def __init__(self, replay_size: int = DEFAULT_REPLAY_SIZE, subscriber_queue: int = DEFAULT_SUBSCRIBER_QUEUE):
+        self.subscriber_queue = subscriber_queue
+        self._replay = deque(maxlen=replay_size)
+        self._subscribers: List[Subscription] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, **data) -> Event:
+        with self._lock:
+            event = Event(next(self._ids), event_type, data)
+            self._replay.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; it will never unsubscribe itself
+                self.unsubscribe(subscription)
+        return event
+
+    def recent(self, after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Event]:
+        """Buffered events newer than `after_id`, or the last `limit` of them"""
+        with self._lock:
+            events = list(self._replay)
+        if after_id is not None:
+            events = [event for event in events if event.id > after_id]
+        if limit is not None:
+            events = events[-limit:] if limit > 0 else []
+        return events
+
+    def subscribe(self, after_id: Optional[int] = None, replay: Optional[int] = None) -> Subscription:
+        """
+        Subscribe from inside a running event loop.
+
+        Buffered events after `after_id` (or the last `replay` events) are
+        queued first, then live events follow without gaps.
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.subscriber_queue)
+        with self._lock:
+            # Registering under the lock means no event falls between replay and live delivery
+            backlog = list(self._replay)
+            self._subscribers.append(subscription)
+        if after_id is not None:
+            backlog = [event for event in backlog if event.id > after_id]
+        elif replay is not None:
+            backlog = backlog[-replay:] if replay > 0 else []
+        for event in backlog:
+            subscription._deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+
+@contextmanager
+def agent_context(name: Optional[str]) -> Iterator[None]:
+    """Attribute the logs of the enclosed work to agent `name`"""
+    token = current_agent.set(name)
+    try:
+        yield
+    finally:
+        current_agent.reset(token)
+
+
+def run_as_agent(name: Optional[str], func: Callable, *args) -> Any:
+    """Call func(*args) with its logs attributed to agent `name`; used as a thread target"""
+    with agent_context(name):
+        return func(*args)
+
+
+class EventLogHandler(logging.Handler):
+    """
+    Forwards log records as `log` events to the bus of the agent that produced them.
+
+    `resolve_bus` maps the `current_agent` name (None outside any agent's
+    work) to the bus to publish on, or None to drop the record.
+    """
+
+    def __init__(self, resolve_bus: Callable[[Optional[str]], Optional[EventBus]], level: int = logging.INFO):
+        super().__init__(level)
+        self.resolve_bus = resolve_bus
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            bus = self.resolve_bus(current_agent.get())
+            if bus is not None:
+                bus.publish("log", logger=record.name, level=record.levelname, message=record.getMessage().strip())
+        except Exception:
+            self.handleError(record)
+
+
+def find_tx_hashes(result: Any) -> List[str]:
+    """Transaction hashes in an action result (explorer links or a bare hash)"""
+    if not isinstance(result, str):
+        return []
+    hashes = TX_LINK_PATTERN.findall(result)
+    if not hashes and re.fullmatch(r"0x[0-9a-fA-F]{64}", result.strip()):
+        hashes = [result.strip()]
+    return hashes
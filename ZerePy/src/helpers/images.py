@@ -0,0 +1,85 @@
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from src import transport
+
+logger = logging.getLogger("helpers.images")
+
+STABILITY_URL = "https://api.stability.ai/v2beta/stable-image/generate/ultra"
+# Twitter rejects images above 5 MB
+TWITTER_MAX_IMAGE_BYTES = 5 * 1024 * 1024
+TWITTER_MAX_IMAGE_SIDE = 4096
+
+
+def generate_image(prompt: str, debug_path: Optional[str] = None, **params) -> bytes:
+    """
+    Generate a JPEG with Stability AI and return its bytes.
+
+    Extra `params` (seed, aspect_ratio, style_preset, ...) are passed to the
+    API as form fields. The image is only written to disk when `debug_path` is given.
+    """
+    load_dotenv()
+    api_key = os.getenv("STABILITY_AI_API_KEY")
+    if not api_key:
+        raise ValueError("API key is missing. Ensure STABILITY_AI_API_KEY is set in the .env file.")
+
+    response = transport.post(
+        STABILITY_URL,
+        headers={
+            "authorization": f"Bearer {api_key}",
+            "accept": "image/*"
+        },
+        files={"none": ''},
+        data={
+            **params,
+            "prompt": prompt,
+            "output_format": 'jpeg',
+        },
+    )
+    if response.status_code != 200:
+        raise Exception(str(response.json()))
+
+    if debug_path:
+        Path(debug_path).write_bytes(response.content)
+        logger.debug(f"Saved generated image to {debug_path}")
+    return response.content
+
+
+def fit_for_twitter(image: bytes, max_bytes: int = TWITTER_MAX_IMAGE_BYTES,
+                    max_side: int = TWITTER_MAX_IMAGE_SIDE) -> bytes:
+    """
+    Downscale and re-encode an image that exceeds Twitter's upload limits.
+
+    Needs Pillow (`pip install pillow`); without it oversized images are
+    returned unchanged and left for the API to reject.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        if len(image) > max_bytes:
+            logger.warning("Pillow is not installed, uploading the image without resizing")
+        return image
+
+    with Image.open(io.BytesIO(image)) as img:
+        if len(image) <= max_bytes and max(img.size) <= max_side:
+            return image
+
+        img = img.convert("RGB")
+        img.thumbnail((max_side, max_side))
+        quality = 90
+        while True:
+            buffer = io.BytesIO()
+            img.save(buffer, format="JPEG", quality=quality, optimize=True)
+            if buffer.tell() <= max_bytes or quality <= 40:
+                return buffer.getvalue()
+            quality -= 10
+
+
+def render_tweet_image(prompt: str, debug_path: Optional[str] = None, **params) -> bytes:
+    """Generate an image and fit it to Twitter's limits, entirely in memory"""
+    return fit_for_twitter(generate_image(prompt, debug_path, **params))
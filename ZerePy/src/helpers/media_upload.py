@@ -0,0 +1,151 @@
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set, Union
+
+logger = logging.getLogger("helpers.media_upload")
+
+DEFAULT_SEGMENT_SIZE = 1024 * 1024  # Twitter accepts APPEND segments up to 5 MB
+DEFAULT_MAX_WORKERS = 3
+DEFAULT_MAX_RETRIES = 3
+# Longest we poll FINALIZE processing (GIF/video) before giving up
+MAX_PROCESSING_WAIT = 300
+
+MEDIA_CATEGORIES = {
+    "image/gif": "tweet_gif",
+    "video/mp4": "tweet_video",
+}
+
+MediaSource = Union[bytes, bytearray, memoryview, str]
+
+
+class MediaUploadError(Exception):
+    """Raised when a chunked upload fails; `state` can be passed back in to resume it"""
+
+    def __init__(self, message: str, state: Optional["UploadState"] = None):
+        super().__init__(message)
+        self.state = state
+
+
+@dataclass
+class UploadState:
+    """Progress of a chunked upload, enough to resume it while the media ID is valid"""
+    media_id: str
+    total_bytes: int
+    segment_size: int
+    expires_at: float
+    completed: Set[int] = field(default_factory=set)
+
+    @property
+    def segment_count(self) -> int:
+        return max(1, math.ceil(self.total_bytes / self.segment_size))
+
+    def pending(self):
+        return [index for index in range(self.segment_count) if index not in self.completed]
+
+
+class ChunkedMediaUpload:
+    """
+    INIT / APPEND / FINALIZE upload of a file or in-memory buffer.
+
+    Segments are read one at a time from the source (files are never loaded
+    whole) and appended concurrently, since APPEND carries its own
+    `segment_index`. Failed segments are retried; if one still fails, the
+    raised MediaUploadError carries the UploadState so a later `run(state)`
+    only sends the missing segments.
+    """
+
+    def __init__(self, request: Callable[..., Dict[str, Any]], source: MediaSource, media_type: str,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE, max_workers: int = DEFAULT_MAX_WORKERS,
+                 max_retries: int = DEFAULT_MAX_RETRIES, endpoint: str = "media/upload"):
+        self.request = request
+        self.source = source
+        self.media_type = media_type
+        self.segment_size = segment_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.endpoint = endpoint
+
+    @property
+    def total_bytes(self) -> int:
+        if isinstance(self.source, str):
+            return os.path.getsize(self.source)
+        return len(self.source)
+
+    def _read_segment(self, index: int) -> bytes:
+        offset = index * self.segment_size
+        if isinstance(self.source, str):
+            # Each worker opens its own handle so segments can be read in parallel
+            with open(self.source, "rb") as media_file:
+                media_file.seek(offset)
+                return media_file.read(self.segment_size)
+        return bytes(memoryview(self.source)[offset:offset + self.segment_size])
+
+    def _init(self) -> UploadState:
+        data = {
+            "command": "INIT",
+            "total_bytes": self.total_bytes,
+            "media_type": self.media_type,
+        }
+        if self.media_type in MEDIA_CATEGORIES:
+            data["media_category"] = MEDIA_CATEGORIES[self.media_type]
+        response = self.request("post", self.endpoint, data=data)
+        media_id = response.get("media_id_string") or response.get("media_id") or response.get("id")
+        if not media_id:
+            raise MediaUploadError(f"INIT returned no media ID: {response}")
+        media_id = str(media_id)
+        expires_after = response.get("expires_after_secs", 24 * 3600)
+        return UploadState(media_id, data["total_bytes"], self.segment_size, time.time() + expires_after)
+
+    def _append(self, state: UploadState, index: int) -> int:
+        last_error = None
+        for attempt in range(self.max_retries):
+            try:
+                self.request(
+                    "post", self.endpoint,
+                    data={"command": "APPEND", "media_id": state.media_id, "segment_index": index},
+                    files={"media": self._read_segment(index)}
+                )
+                return index
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Segment {index} of media {state.media_id} failed (attempt {attempt + 1}): {e}")
+                time.sleep(2 ** attempt)
+        raise MediaUploadError(f"Segment {index} failed: {last_error}")
+
+    def _finalize(self, state: UploadState) -> None:
+        response = self.request("post", self.endpoint, data={"command": "FINALIZE", "media_id": state.media_id})
+        deadline = time.time() + MAX_PROCESSING_WAIT
+        processing = response.get("processing_info")
+        # Images finalize immediately; GIFs and videos are processed asynchronously
+        while processing and processing.get("state") in ("pending", "in_progress"):
+            if time.time() > deadline:
+                raise MediaUploadError(f"Media {state.media_id} still processing after {MAX_PROCESSING_WAIT}s", state)
+            time.sleep(processing.get("check_after_secs", 1))
+            response = self.request("get", self.endpoint, params={"command": "STATUS", "media_id": state.media_id})
+            processing = response.get("processing_info")
+        if processing and processing.get("state") == "failed":
+            raise MediaUploadError(f"Media processing failed: {processing.get('error')}", state)
+
+    def run(self, state: Optional[UploadState] = None) -> str:
+        """Upload the media (resuming `state` if given) and return its media ID"""
+        if state is None or state.expires_at <= time.time():
+            state = self._init()
+        logger.debug(f"Uploading {len(state.pending())} of {state.segment_count} segments for media {state.media_id}")
+
+        failures = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media-append") as pool:
+            futures = [pool.submit(self._append, state, index) for index in state.pending()]
+            for future in as_completed(futures):
+                try:
+                    state.completed.add(future.result())
+                except MediaUploadError as e:
+                    failures.append(str(e))
+        if failures:
+            raise MediaUploadError(f"Upload of media {state.media_id} incomplete: {'; '.join(failures)}", state)
+
+        self._finalize(state)
+        return state.media_id
@@ -0,0 +1,26 @@
+import asyncio
+from typing import AsyncIterator, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def aiter_in_thread(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Consume a blocking iterator (e.g. a generate-text-stream result) from async code.
+
+    Each `next()` runs in a worker thread so the event loop keeps serving
+    other requests while waiting for the provider's next token.
+    """
+    try:
+        while True:
+            item = await asyncio.to_thread(next, iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        # Stop the underlying HTTP stream if the consumer went away early
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await asyncio.to_thread(close)
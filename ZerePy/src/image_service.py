@@ -0,0 +1,180 @@
+import hashlib
+import itertools
+import json
+import logging
+import contextvars
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.helpers.images import render_tweet_image
+
+logger = logging.getLogger("image_service")
+
+DEFAULT_PROMPTS = ["Astronaut in a jungle, cold color palette, muted colors, detailed, 8k"]
+DEFAULT_CACHE_DIR = "~/.zerepy/image_cache"
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_WORKERS = 2
+# Images rendered ahead of the next image posts
+DEFAULT_PRERENDER = 1
+# Stability AI accepts seeds in [0, MAX_SEED]
+MAX_SEED = 4294967294
+
+
+class ImageService:
+    """
+    Renders tweet images through a content-addressed cache and a bounded worker pool.
+
+    Images are cached on disk under the hash of their prompt and generation
+    parameters, so the same request is only ever sent to Stability AI once.
+    Image posts draw prompts from a configurable rotation (`prompts`) and get
+    a fresh seed each, so repeating a prompt still gives a new image. The next
+    `prerender` images are rendered in the background so a post only waits
+    for its upload.
+    """
+
+    def __init__(self, prompts: List[str] = None, params: Dict[str, Any] = None,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_workers: int = DEFAULT_MAX_WORKERS, prerender: int = DEFAULT_PRERENDER,
+                 debug_path: Optional[str] = None):
+        self.prompts = prompts or DEFAULT_PROMPTS
+        self.params = params or {}
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+        self.max_entries = max_entries
+        self.prerender = prerender
+        self.debug_path = debug_path
+        self.hits = 0
+        self.misses = 0
+
+        self._rotation = itertools.cycle(self.prompts)
+        # (prompt, per-post params, render) for the next image posts, in posting order
+        self._upcoming: List[Tuple[str, Dict[str, Any], Future]] = []
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-render")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], debug_path: Optional[str] = None) -> "ImageService":
+        """Build the service from the `image_service` block of an agent file"""
+        return cls(
+            prompts=config.get("prompts"),
+            params=config.get("params"),
+            cache_dir=config.get("cache_dir", DEFAULT_CACHE_DIR),
+            max_entries=config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            max_workers=config.get("max_workers", DEFAULT_MAX_WORKERS),
+            prerender=config.get("prerender", DEFAULT_PRERENDER),
+            debug_path=debug_path,
+        )
+
+    def cache_key(self, prompt: str, params: Dict[str, Any]) -> str:
+        raw = json.dumps({"prompt": prompt, "params": params}, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.jpeg" if self.cache_dir else None
+
+    def _load(self, key: str) -> Optional[bytes]:
+        path = self._cache_path(key)
+        if path is None or not path.exists():
+            return None
+        path.touch()  # mtime doubles as the LRU clock
+        return path.read_bytes()
+
+    def _store(self, key: str, image: bytes) -> None:
+        path = self._cache_path(key)
+        if path is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(image)
+        tmp_path.replace(path)
+
+        entries = sorted(self.cache_dir.glob("*.jpeg"), key=lambda entry: entry.stat().st_mtime)
+        for stale in entries[:max(0, len(entries) - self.max_entries)]:
+            stale.unlink(missing_ok=True)
+
+    def _render(self, key: str, prompt: str, params: Dict[str, Any]) -> bytes:
+        try:
+            image = self._load(key)
+            with self._lock:
+                if image is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+            if image is not None:
+                return image
+            logger.info(f"Rendering image for prompt: {prompt[:60]}")
+            image = render_tweet_image(prompt, self.debug_path, **params)
+            self._store(key, image)
+            return image
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def submit(self, prompt: str, **params) -> Future:
+        """Render (or load) an image on the pool; concurrent requests for the same image share one render"""
+        params = {**self.params, **params}
+        key = self.cache_key(prompt, params)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                # Carry the caller's context so the render's logs reach the requesting agent
+                future = self._pool.submit(contextvars.copy_context().run, self._render, key, prompt, params)
+                self._inflight[key] = future
+        return future
+
+    def get(self, prompt: str, **params) -> bytes:
+        """Image bytes for a prompt, rendering it only if it is not cached"""
+        return self.submit(prompt, **params).result()
+
+    def post_params(self) -> Dict[str, Any]:
+        """Per-post parameters: a new seed for every post, unless `params` pins one"""
+        if "seed" in self.params:
+            return {}
+        return {"seed": random.randint(0, MAX_SEED)}
+
+    def submit_post(self, prompt: str) -> Future:
+        """Render a new image for a post; unlike submit, the same prompt twice gives two images"""
+        return self.submit(prompt, **self.post_params())
+
+    def _next_prompt(self) -> str:
+        with self._lock:
+            return next(self._rotation)
+
+    def warm_up(self) -> None:
+        """Start rendering the images for the next `prerender` image posts"""
+        while True:
+            with self._lock:
+                if len(self._upcoming) >= self.prerender:
+                    return
+            prompt = self._next_prompt()
+            params = self.post_params()
+            render = self.submit(prompt, **params)
+            with self._lock:
+                self._upcoming.append((prompt, params, render))
+
+    def next_post_image(self) -> Future:
+        """Image for the next image post (usually rendered already); queues the one after it"""
+        with self._lock:
+            entry = self._upcoming.pop(0) if self._upcoming else None
+        if entry is None:
+            render = self.submit_post(self._next_prompt())
+        elif entry[2].done() and entry[2].exception() is not None:
+            # The background render failed, give the prompt another try
+            render = self.submit(entry[0], **entry[1])
+        else:
+            render = entry[2]
+        self.warm_up()
+        return render
+
+    def stop(self) -> None:
+        """Shut the render pool down; renders not started yet are dropped"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._inflight)
+            upcoming = [prompt for prompt, _, _ in self._upcoming]
+            return {"hits": self.hits, "misses": self.misses, "rendering": inflight, "upcoming": upcoming}
@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger("llm_cache")
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 3600
+# Posting tasks want fresh creative output, and platforms reject duplicate posts anyway
+DEFAULT_BYPASS_TASKS = ("post-tweet", "post-tweet-with-image", "post-echochambers")
+# Expired rows are purged from the disk tier once every this many writes
+DISK_PURGE_EVERY = 100
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class LLMCache:
+    """
+    Response cache for `generate-text` keyed by (provider, model, system prompt, prompt).
+
+    A bounded in-memory LRU sits in front of an optional sqlite tier that
+    survives restarts. Entries expire after a TTL that can be set per task,
+    and tasks listed in `bypass_tasks` always go to the provider.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 disk_path: Optional[str] = None, task_ttls: Dict[str, float] = None,
+                 bypass_tasks: Iterable[str] = DEFAULT_BYPASS_TASKS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.task_ttls = task_ttls or {}
+        self.bypass_tasks = set(bypass_tasks)
+        self.stats = CacheStats()
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+        if disk_path:
+            self._open_disk_tier(disk_path)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LLMCache":
+        """Build a cache from the `llm_cache` block of an agent file"""
+        disk_path = config.get("disk_path")
+        if disk_path:
+            disk_path = str(Path(disk_path).expanduser())
+        return cls(
+            max_entries=config.get("max_entries", DEFAULT_MAX_ENTRIES),
+            ttl=config.get("ttl", DEFAULT_TTL),
+            disk_path=disk_path,
+            task_ttls=config.get("task_ttls"),
+            bypass_tasks=config.get("bypass_tasks", DEFAULT_BYPASS_TASKS),
+        )
+
+    def _open_disk_tier(self, disk_path: str) -> None:
+        Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(disk_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self._db.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], system_prompt: Optional[str], prompt: str) -> str:
+        raw = "\x1f".join([provider, model or "", system_prompt or "", prompt])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def should_bypass(self, task: Optional[str]) -> bool:
+        return task in self.bypass_tasks
+
+    def ttl_for(self, task: Optional[str]) -> float:
+        return self.task_ttls.get(task, self.ttl)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] > now:
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row:
+                    self._remember(key, row[0], row[1])
+                    self.stats.hits += 1
+                    self.stats.disk_hits += 1
+                    return row[0]
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, value: str, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+                self._writes += 1
+                if self._writes % DISK_PURGE_EVERY == 0:
+                    self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.stats.bypasses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.as_dict()
+            stats["memory_entries"] = len(self._memory)
+        return stats
@@ -0,0 +1,368 @@
+import base64
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.connections.base_connection import InvalidActionRequest
+from src.events import run_as_agent
+
+logger = logging.getLogger("outbox")
+
+DEFAULT_OUTBOX_PATH = "~/.zerepy/outbox.sqlite"
+# Entries claimed per dispatcher pass
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_MAX_ATTEMPTS = 5
+# Backoff before retry n is RETRY_BASE_DELAY * 2 ** (n - 1), unless the error says when to retry
+RETRY_BASE_DELAY = 5
+MAX_RETRY_DELAY = 900
+# Committed and failed entries are purged on start once older than this
+RETENTION = 7 * 24 * 3600
+
+PENDING, DISPATCHING, COMMITTED, FAILED, UNCERTAIN = "pending", "dispatching", "committed", "failed", "uncertain"
+
+# Writes that may be sent again when a crash left their outcome unknown: a like is
+# idempotent, and Twitter rejects a repeated tweet or reply text as a duplicate
+REDISPATCH_SAFE = {
+    ("twitter", "post-tweet"),
+    ("twitter", "post-tweet-with-media"),
+    ("twitter", "reply-to-tweet"),
+    ("twitter", "like-tweet"),
+}
+# Error text meaning an earlier attempt of the same write already went through
+ALREADY_DONE_MARKERS = ("duplicate content",)
+
+
+def _encode_params(params: List[Any]) -> str:
+    # Media bytes (post-tweet-with-media) are kept as base64
+    return json.dumps([
+        {"__bytes__": base64.b64encode(param).decode("ascii")} if isinstance(param, (bytes, bytearray)) else param
+        for param in params
+    ], default=str)
+
+
+def _decode_params(raw: str) -> List[Any]:
+    return [
+        base64.b64decode(param["__bytes__"]) if isinstance(param, dict) and set(param) == {"__bytes__"} else param
+        for param in json.loads(raw)
+    ]
+
+
+def run_commit_hooks(agent, entry: "OutboxEntry") -> None:
+    """Let the action modules update agent state for a write that went through"""
+    from src.action_handler import write_commit_hooks
+
+    for hook in write_commit_hooks.get((entry.connection, entry.action), ()):
+        try:
+            hook(agent, entry)
+        except Exception as e:
+            logger.error(f"Commit hook for {entry.connection} {entry.action} failed: {e}")
+
+
+@dataclass
+class OutboxEntry:
+    """One write action, recorded before it is sent"""
+    id: str
+    agent: str
+    connection: str
+    action: str
+    params: List[Any] = field(default_factory=list)
+    idempotency_key: Optional[str] = None
+    status: str = PENDING
+    attempts: int = 0
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    next_attempt_at: float = 0.0
+    committed_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        values = asdict(self)
+        values["params"] = [f"<{len(p)} bytes>" if isinstance(p, (bytes, bytearray)) else p for p in self.params]
+        return values
+
+
+class Outbox:
+    """
+    Durable queue of an agent's write actions (tweets, replies, likes, room messages, transfers).
+
+    `enqueue` records the write in sqlite before anything is sent, so the
+    loop moves on straight away and a crash cannot drop it. A dispatcher
+    thread claims due entries in batches, sends them through the connection
+    manager and marks each one committed as soon as it succeeds. Failures
+    are retried with exponential backoff (or when a rate limit resets) up to
+    `max_attempts`; bad requests (InvalidActionRequest) fail straight away.
+
+    An idempotency key makes a repeated enqueue of the same write return the
+    existing entry. Entries a crash left in flight are sent again only if
+    that cannot duplicate the side effect (REDISPATCH_SAFE); the rest are
+    marked `uncertain` for a human to check, never re-sent blindly.
+    Registered commit hooks (`action_handler.write_commit_hooks`) update
+    agent state, such as `last_tweet_time`, once a write has really happened.
+    """
+
+    COLUMNS = ("id", "agent", "connection", "action", "params", "idempotency_key", "status", "attempts",
+               "max_attempts", "result", "error", "created_at", "next_attempt_at", "committed_at")
+
+    def __init__(self, agent, path: str = DEFAULT_OUTBOX_PATH, batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.agent = agent
+        self.agent_name = agent.agent_name
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        # Crash recovery runs once per process; a restart after stop() has nothing left in flight
+        self._recovered = False
+        self._start_lock = threading.Lock()
+        if path != ":memory:":
+            path = str(Path(path).expanduser())
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id TEXT PRIMARY KEY, agent TEXT NOT NULL, connection TEXT NOT NULL, action TEXT NOT NULL, "
+            "params TEXT NOT NULL, idempotency_key TEXT, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+            "max_attempts INTEGER NOT NULL, result TEXT, error TEXT, created_at REAL NOT NULL, "
+            "next_attempt_at REAL NOT NULL, committed_at REAL, UNIQUE (agent, idempotency_key))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (agent, status, next_attempt_at)")
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, agent, config: Dict[str, Any]) -> "Outbox":
+        """Build an outbox from the `outbox` block of an agent file"""
+        return cls(
+            agent,
+            path=config.get("path", DEFAULT_OUTBOX_PATH),
+            batch_size=config.get("batch_size", DEFAULT_BATCH_SIZE),
+            max_attempts=config.get("max_attempts", DEFAULT_MAX_ATTEMPTS),
+        )
+
+    # Storage
+
+    def _row(self, entry: OutboxEntry) -> Tuple:
+        values = asdict(entry)
+        values["params"] = _encode_params(entry.params)
+        values["result"] = json.dumps(entry.result, default=str) if entry.result is not None else None
+        return tuple(values[column] for column in self.COLUMNS)
+
+    def _entry(self, row: Tuple) -> OutboxEntry:
+        values = dict(zip(self.COLUMNS, row))
+        values["params"] = _decode_params(values["params"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return OutboxEntry(**values)
+
+    def _select(self, where: str, args: Iterable[Any] = ()) -> List[OutboxEntry]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {','.join(self.COLUMNS)} FROM outbox WHERE agent = ? AND {where}", (self.agent_name, *args)
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def _save(self, entry: OutboxEntry) -> None:
+        assignments = ",".join(f"{column} = ?" for column in self.COLUMNS[1:])
+        row = self._row(entry)
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE outbox SET {assignments} WHERE id = ?", row[1:] + row[:1])
+
+    def get(self, entry_id: str) -> Optional[OutboxEntry]:
+        entries = self._select("id = ?", (entry_id,))
+        return entries[0] if entries else None
+
+    def list(self, status: Optional[str] = None, limit: int = 50) -> List[OutboxEntry]:
+        if status:
+            return self._select("status = ? ORDER BY created_at DESC LIMIT ?", (status, limit))
+        return self._select("1 ORDER BY created_at DESC LIMIT ?", (limit,))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM outbox WHERE agent = ? GROUP BY status", (self.agent_name,)
+            ).fetchall()
+        return dict(rows)
+
+    def pending_since(self, connection: str, actions: Iterable[str], key_prefix: str = "") -> Optional[float]:
+        """Creation time of the oldest unsent write among `actions` (and idempotency keys with `key_prefix`)"""
+        actions = list(actions)
+        placeholders = ",".join("?" * len(actions))
+        query = (f"SELECT MIN(created_at) FROM outbox WHERE agent = ? AND connection = ? AND action IN ({placeholders}) "
+                 f"AND status IN (?, ?)")
+        args = [self.agent_name, connection, *actions, PENDING, DISPATCHING]
+        if key_prefix:
+            query += " AND idempotency_key LIKE ?"
+            args.append(key_prefix.replace("%", "") + "%")
+        with self._lock:
+            row = self._db.execute(query, args).fetchone()
+        return row[0]
+
+    # Producer side
+
+    def enqueue(self, connection: str, action: str, params: List[Any] = None,
+                idempotency_key: Optional[str] = None) -> Tuple[OutboxEntry, bool]:
+        """Record a write; returns (entry, created), where created is False for a repeated idempotency key"""
+        entry = OutboxEntry(
+            id=uuid.uuid4().hex, agent=self.agent_name, connection=connection, action=action,
+            params=params or [], idempotency_key=idempotency_key, max_attempts=self.max_attempts
+        )
+        placeholders = ",".join("?" * len(self.COLUMNS))
+        try:
+            with self._lock, self._db:
+                self._db.execute(f"INSERT INTO outbox VALUES ({placeholders})", self._row(entry))
+        except sqlite3.IntegrityError:
+            existing = self._select("idempotency_key = ?", (idempotency_key,))
+            if not existing:
+                raise
+            return existing[0], False
+
+        self.agent.events.publish("outbox_queued", entry_id=entry.id, connection=connection, action=action)
+        with self._cond:
+            self._cond.notify()
+        return entry, True
+
+    # Dispatcher
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if not self._recovered:
+                self._recover()
+                self._recovered = True
+            self._stopped = False
+            self._thread = threading.Thread(target=run_as_agent, args=(self.agent_name, self._dispatch_loop),
+                                            name=f"outbox-{self.agent_name}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def _recover(self) -> None:
+        """Settle entries a crash left in flight and purge old finished ones"""
+        for entry in self._select("status = ?", (DISPATCHING,)):
+            if (entry.connection, entry.action) in REDISPATCH_SAFE:
+                entry.status = PENDING
+                self._save(entry)
+                continue
+            entry.status = UNCERTAIN
+            entry.error = "Interrupted while sending; not re-sent since it may already have gone through"
+            self._save(entry)
+            logger.warning(f"Outbox entry {entry.id} ({entry.connection} {entry.action}) has an unknown outcome")
+            self.agent.events.publish("outbox_uncertain", entry_id=entry.id, connection=entry.connection,
+                                      action=entry.action)
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM outbox WHERE agent = ? AND status IN (?, ?) AND created_at < ?",
+                (self.agent_name, COMMITTED, FAILED, time.time() - RETENTION)
+            )
+
+    def _claim(self) -> List[OutboxEntry]:
+        """Mark the next due batch as in flight, in one transaction"""
+        with self._lock, self._db:
+            rows = self._db.execute(
+                f"SELECT {','.join(self.COLUMNS)} FROM outbox WHERE agent = ? AND status = ? AND next_attempt_at <= ? "
+                f"ORDER BY created_at LIMIT ?", (self.agent_name, PENDING, time.time(), self.batch_size)
+            ).fetchall()
+            entries = [self._entry(row) for row in rows]
+            self._db.executemany(
+                "UPDATE outbox SET status = ? WHERE id = ?", [(DISPATCHING, entry.id) for entry in entries]
+            )
+        for entry in entries:
+            entry.status = DISPATCHING
+        return entries
+
+    def _release(self, entries: List[OutboxEntry]) -> None:
+        """Hand claimed but unsent entries back, e.g. when stopping mid-batch"""
+        with self._lock, self._db:
+            self._db.executemany("UPDATE outbox SET status = ? WHERE id = ?", [(PENDING, entry.id) for entry in entries])
+
+    def _next_due(self) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE agent = ? AND status = ?", (self.agent_name, PENDING)
+            ).fetchone()
+        return row[0]
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+            batch = self._claim()
+            if not batch:
+                due = self._next_due()
+                with self._cond:
+                    if not self._stopped:
+                        self._cond.wait(timeout=None if due is None else max(0.0, due - time.time()))
+                continue
+            for index, entry in enumerate(batch):
+                if self._stopped:
+                    self._release(batch[index:])
+                    return
+                try:
+                    self._dispatch(entry)
+                except Exception as e:
+                    logger.error(f"Outbox dispatcher failed on {entry.id}: {e}")
+
+    def _dispatch(self, entry: OutboxEntry) -> None:
+        entry.attempts += 1
+        try:
+            result = self.agent.connection_manager.perform_action(
+                connection_name=entry.connection,
+                action_name=entry.action,
+                params=entry.params,
+                raise_errors=True
+            )
+            if isinstance(result, dict) and result.get("error"):
+                raise RuntimeError(result["error"])
+        except Exception as e:
+            if any(marker in str(e).lower() for marker in ALREADY_DONE_MARKERS):
+                logger.info(f"Outbox entry {entry.id} was already sent before; marking it committed")
+                self.commit(entry, None)
+                return
+            self._fail(entry, e)
+            return
+        self.commit(entry, result)
+
+    def commit(self, entry: OutboxEntry, result: Any) -> None:
+        entry.status = COMMITTED
+        entry.result = result
+        entry.error = None
+        entry.committed_at = time.time()
+        self._save(entry)
+        run_commit_hooks(self.agent, entry)
+        self.agent.events.publish("outbox_committed", entry_id=entry.id, connection=entry.connection,
+                                  action=entry.action, attempts=entry.attempts)
+
+    def _fail(self, entry: OutboxEntry, error: Exception) -> None:
+        entry.error = str(error)
+        if isinstance(error, InvalidActionRequest) or entry.attempts >= entry.max_attempts:
+            entry.status = FAILED
+            self._save(entry)
+            logger.error(f"Outbox entry {entry.id} ({entry.connection} {entry.action}) failed: {entry.error}")
+            self.agent.events.publish("outbox_failed", entry_id=entry.id, connection=entry.connection,
+                                      action=entry.action, error=entry.error, attempts=entry.attempts)
+            return
+
+        retry_at = getattr(error, "retry_at", None)
+        delay = min(RETRY_BASE_DELAY * 2 ** (entry.attempts - 1), MAX_RETRY_DELAY)
+        entry.status = PENDING
+        entry.next_attempt_at = retry_at or time.time() + delay
+        self._save(entry)
+        self.agent.events.publish("outbox_retry", entry_id=entry.id, connection=entry.connection,
+                                  action=entry.action, error=entry.error, retry_at=entry.next_attempt_at)
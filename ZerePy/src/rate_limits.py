@@ -0,0 +1,115 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger("rate_limits")
+
+
+@dataclass
+class EndpointBudget:
+    """Last known rate-limit window for one endpoint"""
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: float = 0.0
+    last_request: float = 0.0
+
+    def exhausted(self, now: float) -> bool:
+        return self.remaining is not None and self.remaining <= 0 and self.reset_at > now
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": max(0, round(self.reset_at - time.time())),
+        }
+
+
+class RateLimitTracker:
+    """
+    Per-endpoint request budget built from `x-rate-limit-*` response headers.
+
+    `ready_at` tells when an endpoint can be called again: after the window
+    resets if the budget is spent, and for paced endpoints (writes) no sooner
+    than the remaining budget spread evenly over what is left of the window.
+    `acquire` queues callers until that time, up to `max_wait` seconds.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[str, EndpointBudget] = {}
+        self._lock = threading.Lock()
+        # One per endpoint: serialises its paced calls so they leave the queue one
+        # at a time, without making other endpoints wait on its pacing sleep
+        self._paced_locks: Dict[str, threading.Lock] = {}
+
+    def update(self, key: str, headers: Mapping[str, str]) -> None:
+        """Record the rate-limit headers of a response"""
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            budget = self._budgets.setdefault(key, EndpointBudget())
+            budget.remaining = int(remaining)
+            budget.reset_at = float(reset)
+            if headers.get("x-rate-limit-limit") is not None:
+                budget.limit = int(headers["x-rate-limit-limit"])
+
+    def mark_exhausted(self, key: str, reset_at: float) -> None:
+        """Record a 429 for an endpoint"""
+        with self._lock:
+            budget = self._budgets.setdefault(key, EndpointBudget())
+            budget.remaining = 0
+            budget.reset_at = max(budget.reset_at, reset_at)
+
+    def _paced_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._paced_locks.setdefault(key, threading.Lock())
+
+    def ready_at(self, key: str, paced: bool = False) -> float:
+        """Earliest unix time the endpoint should be called again (0 if now)"""
+        now = time.time()
+        with self._lock:
+            budget = self._budgets.get(key)
+            if budget is None or budget.remaining is None:
+                return 0
+            if budget.exhausted(now):
+                return budget.reset_at
+            if not paced or budget.reset_at <= now:
+                return 0
+            spacing = (budget.reset_at - now) / max(budget.remaining, 1)
+            return budget.last_request + spacing
+
+    def acquire(self, key: str, paced: bool = False, max_wait: float = 0) -> Optional[float]:
+        """
+        Wait for the endpoint's next slot and claim it.
+
+        Returns None when the call may go ahead, or the unix time it can be
+        retried if that is more than `max_wait` seconds away.
+        """
+        lock = self._paced_lock(key) if paced else None
+        if lock:
+            lock.acquire()
+        try:
+            ready = self.ready_at(key, paced)
+            wait = ready - time.time()
+            if wait > max_wait:
+                return ready
+            if wait > 0:
+                logger.info(f"Rate limit pacing: waiting {wait:.1f}s before {key}")
+                time.sleep(wait)
+            with self._lock:
+                budget = self._budgets.setdefault(key, EndpointBudget())
+                budget.last_request = time.time()
+                if budget.remaining:
+                    # Assume this call spends one; the response headers will correct it
+                    budget.remaining -= 1
+            return None
+        finally:
+            if lock:
+                lock.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: budget.as_dict() for key, budget in self._budgets.items()}
@@ -0,0 +1,143 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.action_handler import action_eligibility
+
+logger = logging.getLogger("scheduler")
+
+# Seconds a task waits before retrying after it failed or could not run
+FAILURE_DELAY = 60
+# Random spread applied to each interval so actions don't fire on a fixed beat
+INTERVAL_JITTER = 0.2
+
+
+@dataclass(order=True)
+class ScheduledTask:
+    due: float
+    seq: int
+    name: str = field(compare=False)
+
+
+class TaskScheduler:
+    """
+    Deadline-driven replacement for weighted random task selection.
+
+    Every task sits in a priority queue keyed by the next time it should run.
+    Task weights (and `time_based_multipliers`, when enabled) become a rate
+    policy: a task with weight w runs about every
+    `loop_delay * total_weight / w` seconds, which keeps the overall pace of
+    one action per `loop_delay`. Tasks registered with `next_eligible` (e.g.
+    post-tweet inside `tweet_interval`) are never woken before they can act.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.tasks = [task for task in agent.tasks if task.get("weight", 0) > 0]
+        self._queue: List[ScheduledTask] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+        now = time.time()
+        for task in self.tasks:
+            # Stagger the first runs so they don't all land at startup
+            offset = random.uniform(0, min(self.rate_interval(task["name"]), agent.loop_delay))
+            self.schedule(task["name"], now + offset)
+
+    def _current_weights(self) -> Dict[str, float]:
+        weights = self.agent.task_weights
+        if self.agent.use_time_based_weights:
+            weights = self.agent._adjust_weights_for_time(datetime.now().hour, weights)
+        return {task["name"]: weight for task, weight in zip(self.agent.tasks, weights)}
+
+    def rate_interval(self, task_name: str) -> float:
+        """Average seconds between two runs of a task under the current weights"""
+        weights = self._current_weights()
+        weight = weights.get(task_name, 0)
+        if weight <= 0:
+            return float("inf")
+        return self.agent.loop_delay * sum(weights.values()) / weight
+
+    def eligible_at(self, task_name: str) -> float:
+        """Earliest unix time the task can do useful work"""
+        next_eligible = action_eligibility.get(task_name)
+        if not next_eligible:
+            return 0
+        try:
+            return next_eligible(self.agent)
+        except Exception as e:
+            logger.debug(f"Could not compute eligibility for {task_name}: {e}")
+            return 0
+
+    def schedule(self, task_name: str, not_before: float) -> float:
+        due = max(not_before, self.eligible_at(task_name))
+        with self._lock:
+            heapq.heappush(self._queue, ScheduledTask(due, next(self._counter), task_name))
+        return due
+
+    def next_due(self, task_name: str, success: bool) -> float:
+        """Next unix time a task should run after it just ran"""
+        if success:
+            interval = self.rate_interval(task_name)
+            delay = interval * random.uniform(1 - INTERVAL_JITTER, 1 + INTERVAL_JITTER)
+        else:
+            delay = FAILURE_DELAY
+        return max(time.time() + delay, self.eligible_at(task_name))
+
+    def complete(self, task_name: str, success: bool) -> float:
+        """Reschedule a task after it ran; returns its next due time"""
+        return self.schedule(task_name, self.next_due(task_name, success))
+
+    def peek(self) -> Optional[ScheduledTask]:
+        with self._lock:
+            return self._queue[0] if self._queue else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def snapshot(self) -> List[Dict[str, float]]:
+        """Upcoming tasks ordered by due time"""
+        with self._lock:
+            queue = sorted(self._queue)
+        return [{"task": entry.name, "due": entry.due} for entry in queue]
+
+    def wait_for_next(self, stop_event: threading.Event = None) -> Optional[str]:
+        """
+        Block until the earliest task is due and pop it.
+
+        Returns None if `stop_event` was set while waiting.
+        """
+        while True:
+            entry = self.peek()
+            if entry is None:
+                raise ValueError("No weighted tasks to schedule")
+
+            wait = entry.due - time.time()
+            if wait > 0:
+                logger.info(f"\n⏳ Next task '{entry.name}' in {wait:.0f} seconds...")
+                if stop_event is not None:
+                    if stop_event.wait(timeout=wait):
+                        return None
+                else:
+                    time.sleep(wait)
+                # Another caller may have changed the queue while we slept
+                continue
+
+            with self._lock:
+                if not self._queue or self._queue[0] is not entry:
+                    continue
+                heapq.heappop(self._queue)
+
+            # State may have moved the eligibility window since the task was queued
+            eligible_at = self.eligible_at(entry.name)
+            if eligible_at > time.time():
+                self.schedule(entry.name, eligible_at)
+                continue
+            return entry.name
@@ -0,0 +1,81 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger("seen_index")
+
+DEFAULT_MAX_ENTRIES = 10000
+# The oldest rows are trimmed once every this many inserts
+TRIM_EVERY = 200
+
+
+class SeenIndex:
+    """
+    Persistent, bounded set of item IDs (tweets, messages) the agent already processed.
+
+    Backed by sqlite so it survives restarts; only the newest `max_entries`
+    IDs are kept. Also stores small named cursors such as a timeline's
+    `since_id`. Pass ":memory:" as the path for a non-persistent index.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inserts = 0
+        if path != ":memory:":
+            path = str(Path(path).expanduser())
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS seen_by_age ON seen (seen_at)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cursors (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.commit()
+
+    def __contains__(self, item_id: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM seen WHERE id = ?", (str(item_id),)).fetchone() is not None
+
+    def filter_new(self, item_ids: Iterable[str]) -> List[str]:
+        """Return the IDs that are not in the index, preserving order"""
+        item_ids = [str(item_id) for item_id in item_ids]
+        if not item_ids:
+            return []
+        with self._lock:
+            placeholders = ",".join("?" * len(item_ids))
+            seen = {row[0] for row in self._db.execute(
+                f"SELECT id FROM seen WHERE id IN ({placeholders})", item_ids
+            )}
+        return [item_id for item_id in item_ids if item_id not in seen]
+
+    def add(self, item_ids: Iterable[str]) -> None:
+        now = time.time()
+        rows = [(str(item_id), now) for item_id in item_ids]
+        if not rows:
+            return
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO seen (id, seen_at) VALUES (?, ?)", rows)
+            self._inserts += len(rows)
+            if self._inserts >= TRIM_EVERY:
+                self._inserts = 0
+                self._db.execute(
+                    "DELETE FROM seen WHERE id NOT IN (SELECT id FROM seen ORDER BY seen_at DESC LIMIT ?)",
+                    (self.max_entries,)
+                )
+            self._db.commit()
+
+    def get_cursor(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, name: str, value: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO cursors (name, value) VALUES (?, ?)", (name, str(value)))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
@@ -6,3 +6,11 @@ def start_server(host: str = "0.0.0.0", port: int = 8000):
     """Start the ZerePy server"""
     app = create_app()
     uvicorn.run(app, host=host, port=port)
+
+
+def start_supervisor(host: str = "0.0.0.0", port: int = 8000, workers: int = None, agents=()):
+    """Start the server in supervisor mode, with agents spread over `workers` processes"""
+    from .supervisor_app import create_supervisor_app
+
+    app = create_supervisor_app(workers, list(agents))
+    uvicorn.run(app, host=host, port=port)
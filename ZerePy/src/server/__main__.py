@@ -0,0 +1,16 @@
+import argparse
+
+from src.server import start_server, start_supervisor
+
+parser = argparse.ArgumentParser(description="Run the ZerePy server")
+parser.add_argument("--host", default="0.0.0.0")
+parser.add_argument("--port", type=int, default=8000)
+parser.add_argument("--workers", type=int, default=0,
+                    help="run agents in this many worker processes (supervisor mode); 0 runs them in-process")
+parser.add_argument("--agents", nargs="*", default=[], help="agents to load at startup in supervisor mode")
+args = parser.parse_args()
+
+if args.workers:
+    start_supervisor(args.host, args.port, args.workers, args.agents)
+else:
+    start_server(args.host, args.port)
@@ -1,22 +1,45 @@
 import time
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Header, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import logging
 import asyncio
-import threading
-from pathlib import Path
+import contextvars
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
 
-from src.actions.twitter_actions import generate_image
 from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
 
-from src.cli import ZerePyCLI
+from src.agent_host import AgentHost
+from src.events import LOG_EVENT_LOGGERS, EventLogHandler, current_agent
+from src.outbox import COMMITTED, DISPATCHING, FAILED, PENDING, UNCERTAIN, OutboxEntry
+from src.server.jobs import DEFAULT_JOB_STORE_PATH, DEFAULT_JOB_WORKERS, DEFAULT_MAX_ATTEMPTS, JobQueue, JobStore
+from src.server.runner import AgentRunner
+from src.helpers.streaming import aiter_in_thread
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
 
+# Threads that run blocking connection calls (LLM generations, Twitter requests, probes)
+SERVER_WORKERS = 16
+# Blocking calls an endpoint may have in flight; further requests queue without holding the event loop
+ENDPOINT_CONCURRENCY = {
+    "post-tweet": 2,
+    "post-with-image": 2,
+    "reply-to-tweet": 2,
+    "like-tweet": 4,
+    "agent-action": 8,
+}
+DEFAULT_ENDPOINT_CONCURRENCY = 4
+# Buffered events sent to a new /events subscriber that gives no Last-Event-ID
+DEFAULT_EVENT_REPLAY = 50
+# Seconds between SSE comments that keep idle connections open through proxies
+SSE_KEEPALIVE = 15
+
 app = FastAPI(title="ZerePy Server")
 
 # Enable CORS
@@ -33,12 +56,30 @@ class TweetRequest(BaseModel):
     """Model for receiving tweet prompts from the frontend"""
     prompt: str
 
+class GenerateRequest(BaseModel):
+    """Request model for streamed text generation"""
+    prompt: str
+    system_prompt: Optional[str] = None
+
 class ActionRequest(BaseModel):
     """Request model for agent actions"""
     connection: str
     action: str
     params: Optional[List[str]] = []
 
+class BatchActionRequest(BaseModel):
+    """Request model for running several agent actions concurrently"""
+    actions: List[ActionRequest]
+
+
+class JobRequest(BaseModel):
+    """Request model for background jobs"""
+    connection: str
+    action: str
+    params: Optional[List[Any]] = []
+    idempotency_key: Optional[str] = None
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+
 
 class ConfigureRequest(BaseModel):
     """Request model for configuring connections"""
@@ -46,58 +87,159 @@ class ConfigureRequest(BaseModel):
     params: Optional[Dict[str, Any]] = {}
 
 
+# Outbox entry status -> status the write routes report
+WRITE_STATUS = {PENDING: "queued", DISPATCHING: "queued", COMMITTED: "success", FAILED: "failed",
+                UNCERTAIN: "uncertain"}
+
+
+def _write_status(entry: OutboxEntry, done: str, queued: str) -> Dict[str, Any]:
+    """
+    Response for a write sent with perform_write. A queued write may still
+    fail, so it is reported as `queued` with the `outbox_id` to follow at
+    `/agent/outbox/{outbox_id}`, never as a success.
+    """
+    status = WRITE_STATUS[entry.status]
+    if status == "success":
+        message = done
+    elif status == "queued":
+        message = queued
+    else:
+        message = f"An earlier attempt of this write ended {status}: {entry.error}"
+    return {"status": status, "queued": status == "queued", "outbox_id": entry.id or None, "message": message}
+
+
 class ServerState:
-    """Simple state management for the server"""
+    """
+    Server-wide state: the hosted agents, their loop runners, the job queue
+    and the executor for blocking calls.
 
-    def __init__(self):
-        self.cli = ZerePyCLI()
-        self.agent_running = False
-        self.agent_task = None
-        self._stop_event = threading.Event()
+    `/agent/...` routes act on the default agent (the last one loaded with
+    `/agents/{name}/load`); `/agents/{agent_name}/...` routes address any
+    loaded agent by its file name.
+    """
 
-        self.cli._load_agent_from_file("social_agent")
+    def __init__(self):
+        self.host = AgentHost()
+        self.default_agent: Optional[str] = None
+        self.runners: Dict[str, AgentRunner] = {}
+        self.executor = ThreadPoolExecutor(max_workers=SERVER_WORKERS, thread_name_prefix="server")
+        self._endpoint_limits: Dict[str, asyncio.Semaphore] = {}
+        # Records are published on the bus of the agent whose work logged them, else the default agent's
+        self._log_handler = EventLogHandler(self._log_bus)
+        for name in LOG_EVENT_LOGGERS:
+            logging.getLogger(name).addHandler(self._log_handler)
+
+        self.jobs = JobQueue(JobStore(DEFAULT_JOB_STORE_PATH), self.host.get, workers=DEFAULT_JOB_WORKERS)
 
-    def _run_agent_loop(self):
-        """Run agent loop in a separate thread"""
         try:
-            log_once = False
-            while not self._stop_event.is_set():
-                if self.cli.agent:
-                    try:
-                        if not log_once:
-                            logger.info("Loop logic not implemented")
-                            log_once = True
-
-                    except Exception as e:
-                        logger.error(f"Error in agent action: {e}")
-                        if self._stop_event.wait(timeout=30):
-                            break
+            self.load_agent("social_agent")
         except Exception as e:
-            logger.error(f"Error in agent loop thread: {e}")
-        finally:
-            self.agent_running = False
-            logger.info("Agent loop stopped")
-
-    async def start_agent_loop(self):
+            logger.error(f"Error loading agent: {e}")
+        # Queued jobs survive a restart; load the agents they belong to so they can run
+        for name in self.jobs.waiting_agents():
+            if name in self.host:
+                continue
+            try:
+                self.load_agent(name, make_default=False)
+            except Exception as e:
+                logger.error(f"Error loading agent {name} for its queued jobs: {e}")
+
+        self.jobs.start()
+
+    @property
+    def agent(self):
+        """The default agent, if one is loaded"""
+        return self.host.get(self.default_agent) if self.default_agent else None
+
+    def resolve_name(self, agent_name: Optional[str] = None) -> str:
+        """Host name of the agent a request addresses (the default agent if none is named)"""
+        name = agent_name or self.default_agent
+        if name is None or name not in self.host:
+            raise HTTPException(status_code=404 if agent_name else 400,
+                                detail=f"Agent {agent_name} is not loaded" if agent_name else "No agent loaded")
+        return name
+
+    def get_agent(self, agent_name: Optional[str] = None):
+        name = self.resolve_name(agent_name)
+        # Requests run in their own context, so this attributes the rest of the request's logs to the agent
+        current_agent.set(name)
+        return self.host.get(name)
+
+    def _log_bus(self, agent_name: Optional[str]):
+        agent = (self.host.get(agent_name) if agent_name else None) or self.agent
+        return agent.events if agent else None
+
+    def load_agent(self, name: str, make_default: bool = True):
+        """Load an agent into the host (replacing an earlier copy of it), stopping its old loop first"""
+        runner = self.runners.pop(name, None)
+        if runner:
+            runner.stop()
+        agent = self.host.load(name)
+        if make_default or self.default_agent is None:
+            self.default_agent = name
+        self.jobs.agent_loaded(name)
+        return agent
+
+    def unload_agent(self, name: str):
+        runner = self.runners.pop(name, None)
+        if runner:
+            runner.stop()
+        self.host.unload(name)
+        if self.default_agent == name:
+            names = self.host.names()
+            self.default_agent = names[-1] if names else None
+
+    async def run_blocking(self, endpoint: str, func, *args, **kwargs):
+        """Run a blocking call on the server executor, within the endpoint's concurrency limit"""
+        limit = self._endpoint_limits.get(endpoint)
+        if limit is None:
+            limit = asyncio.Semaphore(ENDPOINT_CONCURRENCY.get(endpoint, DEFAULT_ENDPOINT_CONCURRENCY))
+            self._endpoint_limits[endpoint] = limit
+        async with limit:
+            loop = asyncio.get_running_loop()
+            # The worker thread keeps the request's context, and with it the agent its logs belong to
+            call = functools.partial(func, *args, **kwargs)
+            return await loop.run_in_executor(self.executor, contextvars.copy_context().run, call)
+
+    def is_running(self, agent_name: Optional[str] = None) -> bool:
+        runner = self.runners.get(agent_name or self.default_agent)
+        return runner is not None and runner.running
+
+    @property
+    def agent_running(self) -> bool:
+        return self.is_running()
+
+    def runner_for(self, agent_name: Optional[str] = None) -> AgentRunner:
+        """The running loop of an agent"""
+        name = self.resolve_name(agent_name)
+        if not self.is_running(name):
+            raise ValueError("Agent is not running")
+        return self.runners[name]
+
+    async def start_agent_loop(self, agent_name: Optional[str] = None):
         """Start the agent loop in background thread"""
-        if not self.cli.agent:
-            raise ValueError("No agent loaded")
-
-        if self.agent_running:
+        name = self.resolve_name(agent_name)
+        if self.is_running(name):
             raise ValueError("Agent already running")
 
-        self.agent_running = True
-        self._stop_event.clear()
-        self.agent_task = threading.Thread(target=self._run_agent_loop)
-        self.agent_task.start()
+        # A new runner per start, so counters describe the current run
+        runner = AgentRunner(self.host.get(name))
+        self.runners[name] = runner
+        runner.start()
 
-    async def stop_agent_loop(self):
+    async def stop_agent_loop(self, agent_name: Optional[str] = None):
         """Stop the agent loop"""
-        if self.agent_running:
-            self._stop_event.set()
-            if self.agent_task:
-                self.agent_task.join(timeout=5)
-            self.agent_running = False
+        runner = self.runners.get(agent_name or self.default_agent)
+        if runner:
+            # Joining waits for the action in progress, keep it off the event loop
+            await asyncio.to_thread(runner.stop)
+
+    def agent_status(self, agent_name: Optional[str] = None) -> Dict[str, Any]:
+        runner = self.runners.get(self.resolve_name(agent_name))
+        if runner:
+            return runner.status()
+        return {"state": "stopped", "current_task": None, "actions": 0, "failures": 0,
+                "actions_per_minute": 0, "queue_depth": 0}
 
 
 class ZerePyServer:
@@ -112,29 +254,30 @@ class ZerePyServer:
             """Server status endpoint"""
             return {
                 "status": "running",
-                "agent": self.state.cli.agent.name if self.state.cli.agent else None,
+                "agent": self.state.agent.name if self.state.agent else None,
                 "agent_running": self.state.agent_running,
+                "loaded_agents": self.state.host.names(),
             }
 
         @self.app.get("/agents")
         async def list_agents():
-            """List available agents"""
+            """List available agents and the ones loaded in this server"""
             try:
-                agents = []
-                agents_dir = Path("agents")
-                if agents_dir.exists():
-                    for agent_file in agents_dir.glob("*.json"):
-                        if agent_file.stem != "general":
-                            agents.append(agent_file.stem)
-                return {"agents": agents}
+                return {
+                    "agents": self.state.host.available(),
+                    "loaded": self.state.host.names(),
+                    "default": self.state.default_agent,
+                    # LLM connections the loaded agents share instead of holding one each
+                    "shared_connections": len(self.state.host.shared),
+                }
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.post("/agents/{name}/load")
-        async def load_agent(name: str):
-            """Load a specific agent"""
+        async def load_agent(name: str, make_default: bool = True):
+            """Load an agent next to the ones already loaded; by default it also becomes the default agent"""
             try:
-                self.state.cli._load_agent_from_file(name)
+                await self.state.run_blocking("load-agent", self.state.load_agent, name, make_default)
                 return {
                     "status": "success",
                     "agent": name
@@ -142,32 +285,47 @@ class ZerePyServer:
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.delete("/agents/{name}")
+        async def unload_agent(name: str):
+            """Stop an agent's loop and remove it from the server"""
+            try:
+                await self.state.run_blocking("load-agent", self.state.unload_agent, name)
+                return {"status": "success", "agent": name}
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+
         @self.app.get("/connections")
-        async def list_connections():
+        @self.app.get("/agents/{agent_name}/connections")
+        async def list_connections(agent_name: Optional[str] = None):
             """List all available connections"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            agent = self.state.get_agent(agent_name)
 
-            try:
-                connections = {}
-                for name, conn in self.state.cli.agent.connection_manager.connections.items():
-                    connections[name] = {
-                        "configured": conn.is_configured(),
+            def collect():
+                # Cached health answers are cheap, but a stale entry triggers a probe
+                connection_manager = agent.connection_manager
+                return {
+                    name: {
+                        "configured": connection_manager.health.is_healthy(name),
                         "is_llm_provider": conn.is_llm_provider
                     }
-                return {"connections": connections}
+                    for name, conn in connection_manager.connections.items()
+                }
+
+            try:
+                return {"connections": await self.state.run_blocking("connections", collect)}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.post("/agent/action")
-        async def agent_action(action_request: ActionRequest):
+        @self.app.post("/agents/{agent_name}/action")
+        async def agent_action(action_request: ActionRequest, agent_name: Optional[str] = None):
             """Execute a single agent action"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            agent = self.state.get_agent(agent_name)
 
             try:
-                result = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
+                result = await self.state.run_blocking(
+                    "agent-action",
+                    agent.perform_action,
                     connection=action_request.connection,
                     action=action_request.action,
                     params=action_request.params
@@ -176,39 +334,209 @@ class ZerePyServer:
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.post("/agent/actions")
+        @self.app.post("/agents/{agent_name}/actions")
+        async def agent_actions(batch_request: BatchActionRequest, agent_name: Optional[str] = None):
+            """Execute independent agent actions concurrently; results come back in request order"""
+            agent = self.state.get_agent(agent_name)
+            calls = [(request.connection, request.action, request.params) for request in batch_request.actions]
+            results = await agent.connection_manager.perform_actions_async(calls)
+            return {"status": "success", "results": [result.as_dict() for result in results]}
+
+        @self.app.post("/agent/generate-stream")
+        @self.app.post("/agents/{agent_name}/generate-stream")
+        async def generate_stream(request: GenerateRequest, agent_name: Optional[str] = None):
+            """Stream generated text from the agent's LLM provider as plain text chunks"""
+            agent = self.state.get_agent(agent_name)
+
+            try:
+                if not agent.is_llm_set:
+                    await self.state.run_blocking("generate-stream", agent._setup_llm_provider)
+                stream = await self.state.run_blocking(
+                    "generate-stream", agent.prompt_llm_stream, request.prompt, request.system_prompt
+                )
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            # The manager pulls the first chunk before returning, so a provider that fails to start ends up here
+            if stream is None:
+                raise HTTPException(status_code=502, detail="Text generation failed")
+
+            async def tokens():
+                try:
+                    async for token in aiter_in_thread(stream):
+                        yield token
+                except Exception as e:
+                    # Headers are already sent, so the error can only be logged
+                    logger.error(f"Streaming generation failed: {e}")
+
+            return StreamingResponse(tokens(), media_type="text/plain; charset=utf-8")
+
         @self.app.post("/agent/start")
-        async def start_agent():
+        @self.app.post("/agents/{agent_name}/start")
+        async def start_agent(agent_name: Optional[str] = None):
             """Start the agent loop"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-
             try:
-                await self.state.start_agent_loop()
+                await self.state.start_agent_loop(agent_name)
                 return {"status": "success", "message": "Agent started"}
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
         @self.app.post("/agent/stop")
-        async def stop_agent():
+        @self.app.post("/agents/{agent_name}/stop")
+        async def stop_agent(agent_name: Optional[str] = None):
             """Stop the agent loop"""
             try:
-                await self.state.stop_agent_loop()
+                await self.state.stop_agent_loop(agent_name)
                 return {"status": "success", "message": "Agent stopped"}
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.post("/agent/pause")
+        @self.app.post("/agents/{agent_name}/pause")
+        async def pause_agent(agent_name: Optional[str] = None):
+            """Pause the agent loop once the current action finishes"""
+            try:
+                self.state.runner_for(agent_name).pause()
+                return {"status": "success", "message": "Agent paused"}
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.post("/agent/resume")
+        @self.app.post("/agents/{agent_name}/resume")
+        async def resume_agent(agent_name: Optional[str] = None):
+            """Resume a paused agent loop"""
+            try:
+                self.state.runner_for(agent_name).resume()
+                return {"status": "success", "message": "Agent resumed"}
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.get("/agent/status")
+        @self.app.get("/agents/{agent_name}/status")
+        async def agent_status(agent_name: Optional[str] = None):
+            """Loop state, current task, queue depth and throughput counters"""
+            agent = self.state.get_agent(agent_name)
+            return {"agent": agent.name, **self.state.agent_status(agent_name),
+                    "single_flight": agent.connection_manager.single_flight.get_stats()}
+
+        @self.app.post("/jobs", status_code=202)
+        @self.app.post("/agents/{agent_name}/jobs", status_code=202)
+        async def submit_job(job_request: JobRequest, response: Response,
+                             idempotency_key: Optional[str] = Header(None), agent_name: Optional[str] = None):
+            """Queue an agent action as a background job; repeating an idempotency key returns the first job"""
+            name = self.state.resolve_name(agent_name)
+
+            try:
+                job, created = await self.state.run_blocking(
+                    "jobs",
+                    self.state.jobs.submit,
+                    agent=name,
+                    connection=job_request.connection,
+                    action=job_request.action,
+                    params=job_request.params,
+                    idempotency_key=idempotency_key or job_request.idempotency_key,
+                    max_attempts=job_request.max_attempts
+                )
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if not created:
+                response.status_code = 200
+            return {"job": job.as_dict(), "created": created}
+
+        @self.app.get("/jobs/{job_id}")
+        async def get_job(job_id: str):
+            """Status, attempts and result of a job"""
+            job = await self.state.run_blocking("jobs", self.state.jobs.get, job_id)
+            if job is None:
+                raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+            return {"job": job.as_dict()}
+
+        @self.app.get("/jobs")
+        @self.app.get("/agents/{agent_name}/jobs")
+        async def list_jobs(status: Optional[str] = None, limit: int = 50, agent_name: Optional[str] = None):
+            """Most recent jobs, optionally filtered by status"""
+            jobs = await self.state.run_blocking(
+                "jobs", self.state.jobs.store.list, status=status, agent=agent_name, limit=limit
+            )
+            return {"jobs": [job.as_dict() for job in jobs]}
+
+        @self.app.get("/agent/outbox/{entry_id}")
+        @self.app.get("/agents/{agent_name}/outbox/{entry_id}")
+        async def get_outbox_entry(entry_id: str, agent_name: Optional[str] = None):
+            """Status of a queued write (the `outbox_id` the tweet, reply and like routes return)"""
+            agent = self.state.get_agent(agent_name)
+            if not agent.outbox:
+                raise HTTPException(status_code=404, detail="Outbox is disabled for this agent")
+            entry = await self.state.run_blocking("outbox", agent.outbox.get, entry_id)
+            if entry is None or entry.agent != agent.agent_name:
+                raise HTTPException(status_code=404, detail=f"Outbox entry {entry_id} not found")
+            return {"entry": entry.as_dict()}
+
+        @self.app.get("/events")
+        @self.app.get("/agents/{agent_name}/events")
+        async def stream_events(replay: int = DEFAULT_EVENT_REPLAY, last_event_id: Optional[int] = Header(None),
+                                agent_name: Optional[str] = None):
+            """Server-Sent Events stream of agent activity; reconnects resume from Last-Event-ID"""
+            agent = self.state.get_agent(agent_name)
+            bus = agent.events
+
+            async def events():
+                subscription = bus.subscribe(after_id=last_event_id, replay=replay)
+                try:
+                    while True:
+                        try:
+                            event = await asyncio.wait_for(subscription.get(), SSE_KEEPALIVE)
+                        except asyncio.TimeoutError:
+                            yield ": keepalive\n\n"
+                            continue
+                        yield event.to_sse()
+                finally:
+                    bus.unsubscribe(subscription)
+
+            return StreamingResponse(events(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+        @self.app.websocket("/events")
+        @self.app.websocket("/agents/{agent_name}/events")
+        async def events_socket(websocket: WebSocket, replay: int = DEFAULT_EVENT_REPLAY,
+                                last_event_id: Optional[int] = None, agent_name: Optional[str] = None):
+            """WebSocket stream of agent activity, one JSON event per message"""
+            await websocket.accept()
+            try:
+                bus = self.state.get_agent(agent_name).events
+            except HTTPException as e:
+                await websocket.close(code=1011, reason=e.detail)
+                return
+            subscription = bus.subscribe(after_id=last_event_id, replay=replay)
+
+            async def forward():
+                while True:
+                    event = await subscription.get()
+                    await websocket.send_text(json.dumps(event.as_dict(), default=str))
+
+            sender = asyncio.create_task(forward())
+            try:
+                # Clients don't send anything, receiving only tells us when they leave
+                while (await websocket.receive())["type"] != "websocket.disconnect":
+                    pass
+            finally:
+                sender.cancel()
+                bus.unsubscribe(subscription)
+
         @self.app.post("/connections/{name}/configure")
-        async def configure_connection(name: str, config: ConfigureRequest):
+        @self.app.post("/agents/{agent_name}/connections/{name}/configure")
+        async def configure_connection(name: str, config: ConfigureRequest, agent_name: Optional[str] = None):
             """Configure a specific connection"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            agent = self.state.get_agent(agent_name)
 
             try:
-                connection = self.state.cli.agent.connection_manager.connections.get(name)
+                connection = agent.connection_manager.connections.get(name)
                 if not connection:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
 
-                success = connection.configure(**config.params)
+                success = await self.state.run_blocking("configure", connection.configure, **config.params)
+                agent.connection_manager.health.invalidate(name)
                 if success:
                     return {"status": "success", "message": f"Connection {name} configured successfully"}
                 else:
@@ -218,19 +546,24 @@ class ZerePyServer:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.get("/connections/{name}/status")
-        async def connection_status(name: str):
+        @self.app.get("/agents/{agent_name}/connections/{name}/status")
+        async def connection_status(name: str, agent_name: Optional[str] = None):
             """Get configuration status of a connection"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            agent = self.state.get_agent(agent_name)
 
             try:
-                connection = self.state.cli.agent.connection_manager.connections.get(name)
+                connection_manager = agent.connection_manager
+                connection = connection_manager.connections.get(name)
                 if not connection:
                     raise HTTPException(status_code=404, detail=f"Connection {name} not found")
 
+                # Status requests are explicit, so run a deep probe instead of trusting the cache
+                configured = await self.state.run_blocking(
+                    "status", connection_manager.health.is_healthy, name, deep=True, verbose=True
+                )
                 return {
                     "name": name,
-                    "configured": connection.is_configured(verbose=True),
+                    "configured": configured,
                     "is_llm_provider": connection.is_llm_provider
                 }
 
@@ -238,186 +571,210 @@ class ZerePyServer:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.get("/connections/sonic/balance")
-        async def get_sonic_balance():
+        @self.app.get("/agents/{agent_name}/connections/sonic/balance")
+        async def get_sonic_balance(agent_name: Optional[str] = None):
             """Fetch Sonic Balance"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            agent = self.state.get_agent(agent_name)
 
             try:
                 # Get Sonic connection
-                connection = self.state.cli.agent.connection_manager.connections.get("sonic")
+                connection = agent.connection_manager.connections.get("sonic")
                 if not connection:
                     raise HTTPException(status_code=404, detail="Sonic connection not found")
 
                 # Check if the connection is configured
-                if not connection.is_configured():
+                health = agent.connection_manager.health
+                if not await self.state.run_blocking("sonic-balance", health.is_healthy, "sonic"):
                     raise HTTPException(status_code=400, detail="Sonic connection is not configured")
 
-                # Fetch balance (assuming Sonic API has a `get_balance()` method)
-                balance = connection.get_balance()
+                # Through the manager, so concurrent balance requests share one RPC call
+                balance = await self.state.run_blocking(
+                    "sonic-balance", agent.connection_manager.perform_action, "sonic", "get-balance", [],
+                    raise_errors=True
+                )
                 return {"status": "success", "balance": balance}
 
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
-        @app.post("/agent/like-tweet")
-        async def like_tweet():
+        @self.app.post("/agent/like-tweet")
+        @self.app.post("/agents/{agent_name}/like-tweet")
+        async def like_tweet(agent_name: Optional[str] = None):
             """Automatically like a tweet from the agent's timeline"""
-            agent = self.state.cli.agent  # Ensure the agent exists
-
-            if not agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-
-            tweet_connection = agent.connection_manager.connections.get("twitter")
-            timeline_data = tweet_connection.read_timeline(count=1)
-            agent.logger.info(timeline_data)
-            tweet_id = timeline_data[0]["id"] if timeline_data else ""
+            agent = self.state.get_agent(agent_name)
 
-            if timeline_data:
-                if not tweet_id:
-                    return False
-
-                agent.connection_manager.perform_action(
-                    connection_name="twitter",
-                    action_name="like-tweet",
-                    params=[tweet_id]
+            def like():
+                # The newest tweet, without moving the loop's read-timeline cursor
+                timeline_data = agent.connection_manager.perform_action(
+                    connection_name="twitter", action_name="get-timeline", params=[1], raise_errors=True
                 )
-                agent.logger.info("✅ Tweet liked successfully!")
-                return {"status": "success", "message": "Tweet liked successfully!", "timeline": timeline_data}
-            else:
-                agent.logger.info("\n👀 No tweets found to like...")
-            return False
-
-        @app.post("/agent/post-tweet")
-        async def post_tweet(request: TweetRequest):
-            """Post a tweet with a prompt from the frontend"""
-            agent = self.state.cli.agent  # Ensure agent exists
+                agent.logger.info(timeline_data)
+                tweet_id = timeline_data[0]["id"] if timeline_data else ""
+
+                if timeline_data:
+                    if not tweet_id:
+                        return False
+
+                    entry = agent.perform_write("twitter", "like-tweet", [tweet_id],
+                                                idempotency_key=f"like-tweet:{tweet_id}")
+                    if not entry:
+                        agent.logger.error("❌ Failed to like tweet.")
+                        return {"status": "failed", "message": "Failed to like tweet", "timeline": timeline_data}
+                    status = _write_status(entry, "Tweet liked successfully!", "Like sent to the outbox!")
+                    agent.logger.info(f"✅ {status['message']}")
+                    return {**status, "timeline": timeline_data}
+                else:
+                    agent.logger.info("\n👀 No tweets found to like...")
+                return False
 
-            if not agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            return await self.state.run_blocking("like-tweet", like)
 
-            current_time = time.time()
-            last_tweet_time = agent.state.get("last_tweet_time", 0)
+        @self.app.post("/agent/post-tweet")
+        @self.app.post("/agents/{agent_name}/post-tweet")
+        async def post_tweet(request: TweetRequest, agent_name: Optional[str] = None):
+            """Post a tweet with a prompt from the frontend"""
+            agent = self.state.get_agent(agent_name)
+            from src.actions.twitter_actions import last_tweet_time, text_key
 
-            # Check if we can post a new tweet based on the interval
-            if current_time - last_tweet_time < agent.tweet_interval:
+            # A tweet still waiting in the outbox counts toward the interval
+            if time.time() - last_tweet_time(agent) < agent.tweet_interval:
                 return {"status": "failed", "message": "Tweet interval not elapsed"}
 
-            agent.logger.info("\n📝 Generating a new tweet from the provided prompt")
+            def post():
+                agent.logger.info("\n📝 Generating a new tweet from the provided prompt")
 
-            # Use the prompt from the frontend
-            prompt = request.prompt
-            agent.logger.info(f"user prompt: {prompt}")
-            connection = self.state.cli.agent.connection_manager.connections.get("ollama")
-            tweet_text = connection.generate_text(prompt=prompt, system_prompt=POST_TWEET_PROMPT)
-            agent.logger.info(f"tweet text: {tweet_text}")
+                # Use the prompt from the frontend
+                prompt = request.prompt
+                agent.logger.info(f"user prompt: {prompt}")
+                tweet_text = agent.connection_manager.perform_action(
+                    connection_name="ollama",
+                    action_name="generate-text",
+                    params=[prompt, POST_TWEET_PROMPT],
+                    task="post-tweet"
+                )
+                agent.logger.info(f"tweet text: {tweet_text}")
 
-            if not tweet_text:
-                raise HTTPException(status_code=400, detail="Tweet generation failed")
+                if not tweet_text:
+                    raise HTTPException(status_code=400, detail="Tweet generation failed")
 
-            agent.logger.info("\n🚀 Posting tweet:")
-            agent.logger.info(f"'{tweet_text}'")
+                agent.logger.info("\n🚀 Posting tweet:")
+                agent.logger.info(f"'{tweet_text}'")
 
-            # Perform the tweet post action
-            result = agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="post-tweet",
-                params=[tweet_text]
-            )
+                # Same outbox path as the loop; last_tweet_time moves once the tweet is sent (record_tweet)
+                entry = agent.perform_write("twitter", "post-tweet", [tweet_text],
+                                            idempotency_key=text_key("post-tweet", tweet_text))
+                if not entry:
+                    return {"status": "failed", "message": "Failed to post tweet", "tweetText": tweet_text}
 
-            # Update last tweet time
-            agent.state["last_tweet_time"] = current_time
+                status = _write_status(entry, "Tweet posted successfully!", "Tweet sent to the outbox!")
+                return {**status, "tweetText": tweet_text}
 
-            return {"status": "success", "message": "Tweet posted successfully!", "result": result, "tweetText": tweet_text}
+            return await self.state.run_blocking("post-tweet", post)
 
-        @app.post("/agent/reply-to-tweet")
-        async def reply_to_tweet():
+        @self.app.post("/agent/reply-to-tweet")
+        @self.app.post("/agents/{agent_name}/reply-to-tweet")
+        async def reply_to_tweet(agent_name: Optional[str] = None):
             """Reply to tweet"""
 
-            agent = self.state.cli.agent  # Ensure agent exists
-
-            if not agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-
-            tweet_connection = agent.connection_manager.connections.get("twitter")
-            timeline_data = tweet_connection.read_timeline(count=1)
-            agent.logger.info(f"timeline: {timeline_data}")
-            tweet_id = timeline_data[0]["id"] if timeline_data else ""
-            agent.logger.info(f"Tweet id: {tweet_id}")
+            agent = self.state.get_agent(agent_name)
 
-            if timeline_data:
-                if not tweet_id:
-                    return
-
-                connection = self.state.cli.agent.connection_manager.connections.get("ollama")
-                base_prompt = REPLY_TWEET_PROMPT.format(tweet_text=timeline_data[0]['text'])
-                system_prompt = agent._construct_system_prompt()
-                reply_text = connection.generate_text(prompt=base_prompt, system_prompt=system_prompt)
-
-                if reply_text:
-                    agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
-                    agent.connection_manager.perform_action(
-                        connection_name="twitter",
-                        action_name="reply-to-tweet",
-                        params=[tweet_id, reply_text]
+            def reply():
+                # The newest tweet, without moving the loop's read-timeline cursor
+                timeline_data = agent.connection_manager.perform_action(
+                    connection_name="twitter", action_name="get-timeline", params=[1], raise_errors=True
+                )
+                agent.logger.info(f"timeline: {timeline_data}")
+                tweet_id = timeline_data[0]["id"] if timeline_data else ""
+                agent.logger.info(f"Tweet id: {tweet_id}")
+
+                if timeline_data:
+                    if not tweet_id:
+                        return
+
+                    base_prompt = REPLY_TWEET_PROMPT.format(tweet_text=timeline_data[0]['text'])
+                    system_prompt = agent._construct_system_prompt()
+                    reply_text = agent.connection_manager.perform_action(
+                        connection_name="ollama",
+                        action_name="generate-text",
+                        params=[base_prompt, system_prompt],
+                        task="reply-to-tweet"
                     )
-                    agent.logger.info("✅ Reply posted successfully!")
-                return {"status": "success", "message": "Tweet Reply successfully!", "timeline": timeline_data, "replyText" : reply_text}
 
-            else:
-                agent.logger.info("\n👀 No tweets found to reply to...")
-                return False
+                    if not reply_text:
+                        return {"status": "failed", "message": "Reply generation failed", "timeline": timeline_data}
 
-        @app.post("/agent/post-with-image")
-        async def post_with_image(request: TweetRequest):
-            """Post image tweet  with a prompt from the frontend"""
+                    agent.logger.info(f"\n🚀 Posting reply: '{reply_text}'")
+                    entry = agent.perform_write("twitter", "reply-to-tweet", [tweet_id, reply_text],
+                                                idempotency_key=f"reply-to-tweet:{tweet_id}")
+                    if not entry:
+                        agent.logger.error("❌ Failed to post reply.")
+                        return {"status": "failed", "message": "Failed to post reply", "timeline": timeline_data,
+                                "replyText": reply_text}
+                    status = _write_status(entry, "Reply posted successfully!", "Reply sent to the outbox!")
+                    agent.logger.info(f"✅ {status['message']}")
+                    return {**status, "timeline": timeline_data, "replyText": reply_text}
 
-            agent = self.state.cli.agent  # Ensure agent exists
+                else:
+                    agent.logger.info("\n👀 No tweets found to reply to...")
+                    return False
 
-            if not agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
+            return await self.state.run_blocking("reply-to-tweet", reply)
 
-            current_time = time.time()
+        @self.app.post("/agent/post-with-image")
+        @self.app.post("/agents/{agent_name}/post-with-image")
+        async def post_with_image(request: TweetRequest, agent_name: Optional[str] = None):
+            """Post image tweet  with a prompt from the frontend"""
 
-            if "last_tweet_time" not in agent.state:
-                last_tweet_time = 0
-            else:
-                last_tweet_time = agent.state["last_tweet_time"]
+            agent = self.state.get_agent(agent_name)
+            from src.actions.twitter_actions import last_tweet_time, text_key
 
-            if current_time - last_tweet_time >= agent.tweet_interval:
+            if time.time() - last_tweet_time(agent) >= agent.tweet_interval:
                 agent.logger.info("\n📝 GENERATING NEW TWEET WITH IMAGE")
 
 
-                # Generate tweet text
+                # Generate tweet text and image concurrently, the image stays in memory
                 prompt = request.prompt
                 agent.logger.info(f"user prompt: {prompt}")
-                connection = agent.connection_manager.connections.get("ollama")
-                tweet_text = connection.generate_text(prompt=prompt, system_prompt=POST_TWEET_PROMPT)
+                agent.logger.info("\n🎨 Generating image with Stable Diffusion...")
+                text_result, image_result = await asyncio.gather(
+                    self.state.run_blocking(
+                        "post-with-image",
+                        agent.connection_manager.perform_action,
+                        connection_name="ollama",
+                        action_name="generate-text",
+                        params=[prompt, POST_TWEET_PROMPT],
+                        task="post-tweet-with-image"
+                    ),
+                    asyncio.wrap_future(agent.image_service.submit_post(prompt)),
+                    return_exceptions=True
+                )
+                tweet_text = None if isinstance(text_result, Exception) else text_result
                 agent.logger.info(f"tweet text: {tweet_text}")
 
-                # Generate image using Stable Diffusion
-                # Usage in tweet posting function
-                try:
-                    agent.logger.info("\n🎨 Generating image with Stable Diffusion...")
-                    image_path = generate_image(prompt, "./generated_image.jpeg")
-                    agent.logger.info(f"\n📷 Image generated and saved to: {image_path}")
-                except Exception as e:
-                    agent.logger.error(f"\n❌ Failed to generate image: {e}")
+                if isinstance(image_result, Exception):
+                    agent.logger.error(f"\n❌ Failed to generate image: {image_result}")
                     return False
+                agent.logger.info(f"\n📷 Image generated ({len(image_result)} bytes)")
 
-                if tweet_text and image_path:
+                if tweet_text:
                     agent.logger.info("\n🚀 Posting tweet with image:")
                     agent.logger.info(f"'{tweet_text}'")
-                    agent.logger.info(f"📷 Image path: {image_path}")
 
-                    result = agent.connection_manager.perform_action(
-                        connection_name="twitter",
-                        action_name="post-tweet-with-image",
-                        params=[tweet_text, image_path]
+                    entry = await self.state.run_blocking(
+                        "post-with-image",
+                        agent.perform_write,
+                        "twitter",
+                        "post-tweet-with-media",
+                        [tweet_text, image_result],
+                        idempotency_key=text_key("post-tweet-with-media", tweet_text)
                     )
-                    agent.state["last_tweet_time"] = current_time
-                    agent.logger.info("\n✅ Tweet with image posted successfully!")
-                    return {"status": "success", "message": "Tweet posted successfully!","result": result, "tweetText": tweet_text}
+                    if not entry:
+                        agent.logger.error("\n❌ Failed to post tweet with image.")
+                        return {"status": "failed", "message": "Failed to post tweet", "tweetText": tweet_text}
+                    status = _write_status(entry, "Tweet with image posted successfully!",
+                                           "Tweet with image sent to the outbox!")
+                    agent.logger.info(f"\n✅ {status['message']}")
+                    return {**status, "tweetText": tweet_text}
                 else:
                     agent.logger.error("\n❌ Failed to generate tweet or image.")
                     return False
@@ -426,8 +783,6 @@ class ZerePyServer:
                 return False
 
 
-
-
 def create_app():
     server = ZerePyServer()
     return server.app
@@ -1,15 +1,30 @@
+import json
 import requests
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
+
+# Routes that also exist per agent under /agents/{name}/...
+AGENT_ROUTES = ("/agent/", "/connections", "/events", "/jobs")
+
 
 class ZerePyClient:
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(self, base_url: str = "http://localhost:8000", agent: Optional[str] = None):
+        """`agent` addresses one of the server's loaded agents instead of its default agent"""
         self.base_url = base_url.rstrip('/')
+        self.agent = agent
+        self._session = requests.Session()
+
+    def _url(self, endpoint: str) -> str:
+        endpoint = "/" + endpoint.lstrip('/')
+        if self.agent and endpoint.startswith(AGENT_ROUTES) and not endpoint.startswith("/jobs/"):
+            prefix = f"/agents/{self.agent}"
+            endpoint = prefix + endpoint[len("/agent"):] if endpoint.startswith("/agent/") else prefix + endpoint
+        return f"{self.base_url}{endpoint}"
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request with error handling"""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._url(endpoint)
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._session.request(method, url, **kwargs)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -24,9 +39,13 @@ class ZerePyClient:
         response = self._make_request("GET", "/agents")
         return response.get("agents", [])
 
-    def load_agent(self, agent_name: str) -> Dict[str, Any]:
-        """Load a specific agent"""
-        return self._make_request("POST", f"/agents/{agent_name}/load")
+    def load_agent(self, agent_name: str, make_default: bool = True) -> Dict[str, Any]:
+        """Load an agent into the server, next to the ones already loaded"""
+        return self._make_request("POST", f"/agents/{agent_name}/load", params={"make_default": make_default})
+
+    def unload_agent(self, agent_name: str) -> Dict[str, Any]:
+        """Stop and remove a loaded agent"""
+        return self._make_request("DELETE", f"/agents/{agent_name}")
 
     def list_connections(self) -> Dict[str, Any]:
         """List available connections"""
@@ -41,6 +60,71 @@ class ZerePyClient:
         }
         return self._make_request("POST", "/agent/action", json=data)
 
+    def perform_actions(self, actions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Execute independent actions concurrently on the server. Each action is
+        a dict with connection, action and params; results keep that order.
+        """
+        data = {"actions": [{"params": [], **action} for action in actions]}
+        return self._make_request("POST", "/agent/actions", json=data)
+
+    def generate_stream(self, prompt: str, system_prompt: Optional[str] = None) -> Iterator[str]:
+        """Stream generated text chunks from the agent's LLM provider"""
+        url = self._url("/agent/generate-stream")
+        try:
+            with self._session.post(url, json={"prompt": prompt, "system_prompt": system_prompt}, stream=True) as response:
+                response.raise_for_status()
+                yield from response.iter_content(chunk_size=None, decode_unicode=True)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+
+    def submit_job(self, connection: str, action: str, params: Optional[List[Any]] = None,
+                   idempotency_key: Optional[str] = None, max_attempts: int = 3) -> Dict[str, Any]:
+        """Queue an action as a background job and return it without waiting"""
+        data = {
+            "connection": connection,
+            "action": action,
+            "params": params or [],
+            "idempotency_key": idempotency_key,
+            "max_attempts": max_attempts
+        }
+        return self._make_request("POST", "/jobs", json=data)["job"]
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Get a job's status and result"""
+        return self._make_request("GET", f"/jobs/{job_id}")["job"]
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """List recent jobs"""
+        params = {"limit": limit, **({"status": status} if status else {})}
+        return self._make_request("GET", "/jobs", params=params)["jobs"]
+
+    def stream_events(self, replay: int = 50, last_event_id: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Follow the agent's event stream (SSE), yielding {"id", "type", "data"} dicts"""
+        url = self._url("/events")
+        headers = {"Last-Event-ID": str(last_event_id)} if last_event_id is not None else {}
+        try:
+            with self._session.get(url, params={"replay": replay}, headers=headers, stream=True) as response:
+                response.raise_for_status()
+                event = {}
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line:
+                        if "type" in event:
+                            yield event
+                        event = {}
+                    elif line.startswith("id: "):
+                        event["id"] = int(line[4:])
+                    elif line.startswith("event: "):
+                        event["type"] = line[7:]
+                    elif line.startswith("data: "):
+                        event["data"] = json.loads(line[6:])
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Request failed: {str(e)}")
+
+    def get_outbox_entry(self, entry_id: str) -> Dict[str, Any]:
+        """Status of a queued write, by the `outbox_id` a tweet, reply or like call returned"""
+        return self._make_request("GET", f"/agent/outbox/{entry_id}")["entry"]
+
     def start_agent(self) -> Dict[str, Any]:
         """Start the agent loop"""
         return self._make_request("POST", "/agent/start")
@@ -49,3 +133,14 @@ class ZerePyClient:
         """Stop the agent loop"""
         return self._make_request("POST", "/agent/stop")
 
+    def pause_agent(self) -> Dict[str, Any]:
+        """Pause the agent loop"""
+        return self._make_request("POST", "/agent/pause")
+
+    def resume_agent(self) -> Dict[str, Any]:
+        """Resume a paused agent loop"""
+        return self._make_request("POST", "/agent/resume")
+
+    def get_agent_status(self) -> Dict[str, Any]:
+        """Get the agent loop state and throughput counters"""
+        return self._make_request("GET", "/agent/status")
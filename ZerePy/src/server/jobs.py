@@ -0,0 +1,319 @@
+import heapq
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.connection_manager import ConnectionNotReadyError
+from src.connections.base_connection import InvalidActionRequest
+from src.events import run_as_agent
+
+logger = logging.getLogger("server/jobs")
+
+DEFAULT_JOB_STORE_PATH = "~/.zerepy/jobs.sqlite"
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+# Backoff before retry n is RETRY_BASE_DELAY * 2 ** (n - 1), unless the error says when to retry
+RETRY_BASE_DELAY = 5
+MAX_RETRY_DELAY = 900
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, UNCERTAIN = "queued", "running", "succeeded", "failed", "uncertain"
+
+
+@dataclass
+class Job:
+    """One connection action run in the background"""
+    id: str
+    agent: str
+    connection: str
+    action: str
+    params: List[Any] = field(default_factory=list)
+    idempotency_key: Optional[str] = None
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    status: str = QUEUED
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    run_after: float = 0.0
+    finished_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class JobStore:
+    """
+    sqlite-backed job table.
+
+    Every state change is written through, so queued jobs survive a restart.
+    Idempotency keys are unique: creating a job with a key that was already
+    used returns the existing job instead of a new one.
+    """
+
+    COLUMNS = ("id", "agent", "connection", "action", "params", "idempotency_key", "max_attempts", "status",
+               "attempts", "result", "error", "created_at", "run_after", "finished_at")
+
+    def __init__(self, path: str = DEFAULT_JOB_STORE_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            path = str(Path(path).expanduser())
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, agent TEXT NOT NULL, connection TEXT NOT NULL, action TEXT NOT NULL, "
+            "params TEXT NOT NULL, idempotency_key TEXT UNIQUE, max_attempts INTEGER NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, run_after REAL NOT NULL, finished_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+        self._db.commit()
+
+    def _row(self, job: Job) -> Tuple:
+        values = job.as_dict()
+        values["params"] = json.dumps(job.params, default=str)
+        values["result"] = json.dumps(job.result, default=str) if job.result is not None else None
+        return tuple(values[column] for column in self.COLUMNS)
+
+    def _job(self, row: Tuple) -> Job:
+        values = dict(zip(self.COLUMNS, row))
+        values["params"] = json.loads(values["params"])
+        values["result"] = json.loads(values["result"]) if values["result"] is not None else None
+        return Job(**values)
+
+    def create(self, job: Job) -> Tuple[Job, bool]:
+        """Insert a job; returns (job, created), with the earlier job if the idempotency key was used"""
+        placeholders = ",".join("?" * len(self.COLUMNS))
+        with self._lock:
+            try:
+                self._db.execute(f"INSERT INTO jobs VALUES ({placeholders})", self._row(job))
+                self._db.commit()
+                return job, True
+            except sqlite3.IntegrityError:
+                row = self._db.execute(
+                    f"SELECT {','.join(self.COLUMNS)} FROM jobs WHERE idempotency_key = ?", (job.idempotency_key,)
+                ).fetchone()
+        if row is None:
+            raise ValueError(f"Job {job.id} already exists")
+        return self._job(row), False
+
+    def save(self, job: Job) -> None:
+        assignments = ",".join(f"{column} = ?" for column in self.COLUMNS[1:])
+        row = self._row(job)
+        with self._lock:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", row[1:] + row[:1])
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {','.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def list(self, status: Optional[str] = None, agent: Optional[str] = None, limit: int = 50) -> List[Job]:
+        query = f"SELECT {','.join(self.COLUMNS)} FROM jobs"
+        conditions, args = [], []
+        if status:
+            conditions.append("status = ?")
+            args.append(status)
+        if agent:
+            conditions.append("agent = ?")
+            args.append(agent)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(query, args + [limit]).fetchall()
+        return [self._job(row) for row in rows]
+
+
+class JobQueue:
+    """
+    Bounded worker pool that runs queued jobs through an agent's connection manager.
+
+    Failed attempts are retried with exponential backoff (or at the time a
+    rate-limit error names) up to `max_attempts`, but only when re-running is
+    safe: read-only actions, and errors raised before anything was sent
+    (rate limits, a connection that failed its health check). Any other
+    failure of a write (a transfer, a swap, a post) may already have taken
+    effect, so the job is marked uncertain instead of being run again. A result of
+    None or an `error` dict counts as a failure. Bad requests
+    (InvalidActionRequest) fail straight away. Progress is published on the
+    agent's event bus as `job_*` events.
+
+    A job whose agent is not loaded waits, without using up an attempt,
+    until `agent_loaded` is called for that agent.
+
+    On start, queued jobs from the store are picked up again. Jobs that were
+    running when the process died are marked uncertain rather than re-run,
+    since their side effect (a post, a payment) may already have happened.
+    """
+
+    def __init__(self, store: JobStore, resolve_agent: Callable[[str], Any], workers: int = DEFAULT_JOB_WORKERS):
+        self.store = store
+        self.resolve_agent = resolve_agent
+        self.workers = workers
+        self._ready: List[Tuple[float, float, str]] = []
+        # Agent name -> (created_at, job id) of jobs waiting for that agent to be loaded
+        self._waiting: Dict[str, List[Tuple[float, str]]] = {}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+    def start(self) -> None:
+        for job in self.store.list(status=RUNNING, limit=-1):
+            job.status = UNCERTAIN
+            job.error = "Interrupted by a restart while running; not retried to avoid a duplicate side effect"
+            job.finished_at = time.time()
+            self.store.save(job)
+        for job in self.store.list(status=QUEUED, limit=-1):
+            self._schedule(job)
+
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def submit(self, agent: str, connection: str, action: str, params: List[Any] = None,
+               idempotency_key: Optional[str] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Tuple[Job, bool]:
+        """Queue a job; returns (job, created), where created is False for a repeated idempotency key"""
+        job = Job(
+            id=uuid.uuid4().hex, agent=agent, connection=connection, action=action, params=params or [],
+            idempotency_key=idempotency_key, max_attempts=max(1, max_attempts)
+        )
+        job, created = self.store.create(job)
+        if created:
+            self._publish(job, "job_queued")
+            self._schedule(job)
+        return job, created
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def waiting_agents(self) -> List[str]:
+        """Agents that queued jobs in the store belong to"""
+        return sorted({job.agent for job in self.store.list(status=QUEUED, limit=-1)})
+
+    def agent_loaded(self, agent: str) -> None:
+        """Run the jobs that were waiting for `agent` to be loaded"""
+        with self._cond:
+            waiting = self._waiting.pop(agent, [])
+            for created_at, job_id in waiting:
+                heapq.heappush(self._ready, (0.0, created_at, job_id))
+            self._cond.notify_all()
+        if waiting:
+            logger.info(f"Resuming {len(waiting)} jobs for agent {agent}")
+
+    def _wait_for_agent(self, job: Job) -> None:
+        with self._cond:
+            self._waiting.setdefault(job.agent, []).append((job.created_at, job.id))
+        logger.info(f"Job {job.id} is waiting for agent {job.agent} to be loaded")
+
+    def _schedule(self, job: Job) -> None:
+        with self._cond:
+            heapq.heappush(self._ready, (job.run_after, job.created_at, job.id))
+            self._cond.notify()
+
+    def _next_job(self) -> Optional[str]:
+        with self._cond:
+            while not self._stopped:
+                if self._ready:
+                    wait = self._ready[0][0] - time.time()
+                    if wait <= 0:
+                        return heapq.heappop(self._ready)[2]
+                    self._cond.wait(timeout=wait)
+                else:
+                    self._cond.wait()
+        return None
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._next_job()
+            if job_id is None:
+                return
+            job = self.store.get(job_id)
+            if job is None or job.status != QUEUED:
+                continue
+            try:
+                run_as_agent(job.agent, self._run, job)
+            except Exception as e:
+                logger.error(f"Job worker failed on {job_id}: {e}")
+
+    def _publish(self, job: Job, event_type: str, **data) -> None:
+        agent = self.resolve_agent(job.agent)
+        if agent is not None:
+            agent.events.publish(event_type, job_id=job.id, connection=job.connection, action=job.action, **data)
+
+    @staticmethod
+    def _retry_safe(agent, job: Job, error: Exception) -> bool:
+        if getattr(error, "retry_at", None) is not None or isinstance(error, ConnectionNotReadyError):
+            return True
+        return agent.connection_manager.is_read_only(job.connection, job.action)
+
+    def _finish(self, job: Job, status: str, event_type: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self.store.save(job)
+        self._publish(job, event_type, error=job.error, attempts=job.attempts)
+
+    def _run(self, job: Job) -> None:
+        agent = self.resolve_agent(job.agent)
+        if agent is None:
+            self._wait_for_agent(job)
+            return
+
+        job.status = RUNNING
+        job.attempts += 1
+        self.store.save(job)
+        self._publish(job, "job_started", attempt=job.attempts)
+
+        try:
+            job.result = agent.connection_manager.perform_action(
+                connection_name=job.connection,
+                action_name=job.action,
+                params=job.params,
+                raise_errors=True
+            )
+            # Some actions report failure in their result instead of raising
+            if job.result is None or (isinstance(job.result, dict) and job.result.get("error")):
+                raise RuntimeError(job.result["error"] if job.result else f"{job.action} returned no result")
+        except Exception as e:
+            job.error = str(e)
+            # Only a request that was rejected before anything was sent is a sure failure;
+            # other ValueErrors (a JSONDecodeError, a helper failing mid-swap) may be transient
+            if isinstance(e, InvalidActionRequest):
+                self._finish(job, FAILED, "job_failed")
+                return
+            if not self._retry_safe(agent, job, e):
+                self._finish(job, UNCERTAIN, "job_uncertain")
+                return
+            if job.attempts >= job.max_attempts:
+                self._finish(job, FAILED, "job_failed")
+                return
+
+            retry_at = getattr(e, "retry_at", None)
+            delay = min(RETRY_BASE_DELAY * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+            job.status = QUEUED
+            job.run_after = retry_at or time.time() + delay
+            self.store.save(job)
+            self._publish(job, "job_retry", error=job.error, attempt=job.attempts, retry_at=job.run_after)
+            self._schedule(job)
+            return
+
+        job.status = SUCCEEDED
+        job.error = None
+        job.finished_at = time.time()
+        self.store.save(job)
+        self._publish(job, "job_succeeded", result=job.result)
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from src.events import run_as_agent
+from src.scheduler import TaskScheduler
+
+logger = logging.getLogger("server/runner")
+
+# Window for the actions-per-minute rate
+THROUGHPUT_WINDOW = 60
+# Seconds to wait for the current action to finish on stop
+STOP_TIMEOUT = 5
+
+
+class AgentRunner:
+    """
+    Runs an agent's scheduler-driven loop on a background thread for the server.
+
+    The loop is the same one `agent-loop` runs: the TaskScheduler picks the
+    next due task and `run_next_action` executes it. `pause` lets the action
+    in progress finish and then holds the loop until `resume`; `stop` ends
+    the thread along with the content buffer and outbox threads it started.
+    `status` reports the current task, queue depth and throughput counters.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.scheduler: Optional[TaskScheduler] = None
+        self.started_at: Optional[float] = None
+        self.actions = 0
+        self.failures = 0
+        self.last_action: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+        self._completed = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        # Set on pause or stop to cut short the wait for the next due task
+        self._interrupt = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def paused(self) -> bool:
+        return self.running and not self._resume.is_set()
+
+    @property
+    def state(self) -> str:
+        if not self.running:
+            return "stopped"
+        return "paused" if self.paused else "running"
+
+    def start(self) -> None:
+        if self.running:
+            raise ValueError("Agent already running")
+        self._stop.clear()
+        self._interrupt.clear()
+        self._resume.set()
+        self.error = None
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=run_as_agent, args=(self.agent.agent_name, self._run),
+                                        name="agent-loop", daemon=True)
+        self._thread.start()
+        self.agent.events.publish("loop_state", state="running")
+
+    def stop(self, timeout: float = STOP_TIMEOUT) -> None:
+        self._stop.set()
+        self._resume.set()
+        self._interrupt.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        # Otherwise every start/stop cycle leaks a refill and an outbox thread
+        self.agent.finish_loop()
+
+    def pause(self) -> None:
+        if not self.running:
+            raise ValueError("Agent is not running")
+        self._resume.clear()
+        self._interrupt.set()
+        self.agent.events.publish("loop_state", state="paused")
+
+    def resume(self) -> None:
+        if not self.running:
+            raise ValueError("Agent is not running")
+        self._resume.set()
+        self.agent.events.publish("loop_state", state="running")
+
+    def _record(self, action_name: str, success: bool) -> None:
+        now = time.time()
+        with self._lock:
+            self.actions += 1
+            if not success:
+                self.failures += 1
+            self.last_action = {"task": action_name, "success": success, "at": now}
+            self._completed.append(now)
+
+    def _run(self) -> None:
+        try:
+            self.agent.prepare_loop()
+            self.scheduler = TaskScheduler(self.agent)
+            logger.info("\n🚀 Agent loop started")
+            while not self._stop.is_set():
+                if not self._resume.is_set():
+                    self._resume.wait()
+                    continue
+                self._interrupt.clear()
+                # A pause or stop that landed before the clear must not be lost
+                if self._stop.is_set() or not self._resume.is_set():
+                    continue
+
+                result = self.agent.run_next_action(self.scheduler, self._interrupt)
+                if result is not None:
+                    self._record(*result)
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Error in agent loop thread: {e}")
+            self.agent.events.publish("error", error=self.error)
+        finally:
+            logger.info("Agent loop stopped")
+            self.agent.events.publish("loop_state", state="stopped")
+
+    def actions_per_minute(self) -> float:
+        cutoff = time.time() - THROUGHPUT_WINDOW
+        with self._lock:
+            while self._completed and self._completed[0] < cutoff:
+                self._completed.popleft()
+            return len(self._completed) * 60 / THROUGHPUT_WINDOW
+
+    def status(self) -> Dict[str, Any]:
+        next_task = self.scheduler.peek() if self.scheduler else None
+        return {
+            "state": self.state,
+            "current_task": self.agent.current_task if self.running else None,
+            "uptime": round(time.time() - self.started_at) if self.running else 0,
+            "actions": self.actions,
+            "failures": self.failures,
+            "actions_per_minute": round(self.actions_per_minute(), 2),
+            "queue_depth": len(self.scheduler) if self.scheduler else 0,
+            "next_task": {
+                "task": next_task.name,
+                "due_in": max(0, round(next_task.due - time.time())),
+            } if next_task else None,
+            "last_action": self.last_action,
+            "error": self.error,
+        }
@@ -0,0 +1,358 @@
+import bisect
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("server/supervisor")
+
+# Virtual nodes per worker on the hash ring; more means a more even spread
+RING_REPLICAS = 64
+# Seconds between liveness checks of the worker processes
+MONITOR_INTERVAL = 1.0
+# Restart backoff doubles per consecutive crash, up to this many seconds
+MAX_RESTART_BACKOFF = 60
+# Threads per worker process that execute commands, so a slow action doesn't block status calls
+WORKER_COMMAND_THREADS = 8
+DEFAULT_CALL_TIMEOUT = 300
+
+
+class WorkerError(Exception):
+    """A command failed inside a worker process; `kind` is the original exception class name"""
+
+    def __init__(self, message: str, kind: str = "Exception"):
+        super().__init__(message)
+        self.kind = kind
+
+
+class HashRing:
+    """Consistent hash ring: adding or removing a worker only moves the agents that hashed to it"""
+
+    def __init__(self, nodes: List[str], replicas: int = RING_REPLICAS):
+        self._ring = sorted(
+            (self._hash(f"{node}#{replica}"), node) for node in nodes for replica in range(replicas)
+        )
+        self._keys = [key for key, _ in self._ring]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+    def node_for(self, key: str) -> str:
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class _WorkerAgents:
+    """Command handlers inside a worker process, over its own AgentHost"""
+
+    def __init__(self, worker_id: str):
+        from src.agent_host import AgentHost
+
+        self.worker_id = worker_id
+        self.host = AgentHost()
+        self.runners: Dict[str, Any] = {}
+
+    def _agent(self, agent: str):
+        loaded = self.host.get(agent)
+        if loaded is None:
+            raise LookupError(f"Agent {agent} is not loaded")
+        return loaded
+
+    def _runner(self, agent: str):
+        runner = self.runners.get(agent)
+        if runner is None or not runner.running:
+            raise ValueError("Agent is not running")
+        return runner
+
+    def ping(self) -> str:
+        return self.worker_id
+
+    def load(self, agent: str) -> str:
+        self.stop(agent)
+        return self.host.load(agent).name
+
+    def unload(self, agent: str) -> None:
+        self.stop(agent)
+        self.runners.pop(agent, None)
+        self.host.unload(agent)
+
+    def start(self, agent: str) -> None:
+        from src.server.runner import AgentRunner
+
+        if agent in self.runners and self.runners[agent].running:
+            raise ValueError("Agent already running")
+        runner = AgentRunner(self._agent(agent))
+        self.runners[agent] = runner
+        runner.start()
+
+    def stop(self, agent: str) -> None:
+        runner = self.runners.get(agent)
+        if runner:
+            runner.stop()
+
+    def pause(self, agent: str) -> None:
+        self._runner(agent).pause()
+
+    def resume(self, agent: str) -> None:
+        self._runner(agent).resume()
+
+    def status(self, agent: str) -> Dict[str, Any]:
+        loaded = self._agent(agent)
+        runner = self.runners.get(agent)
+        status = runner.status() if runner else {"state": "stopped", "actions": 0, "failures": 0,
+                                                  "actions_per_minute": 0, "queue_depth": 0}
+        return {"agent": loaded.name, **status}
+
+    def action(self, agent: str, connection: str, action: str, params: List[Any]) -> Any:
+        return self._agent(agent).connection_manager.perform_action(
+            connection_name=connection, action_name=action, params=params, raise_errors=True
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        metrics = {
+            "worker": self.worker_id,
+            "pid": os.getpid(),
+            "agents": {name: self.status(name) for name in self.host.names()},
+        }
+        try:
+            import resource
+            metrics["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+        return metrics
+
+
+def _worker_main(worker_id: str, conn) -> None:
+    """Entry point of a worker process: execute commands from the supervisor until told to shut down"""
+    # Ctrl+C goes to the whole process group; the supervisor decides when workers exit
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=f"[{worker_id}] %(name)s: %(message)s")
+    agents = _WorkerAgents(worker_id)
+    send_lock = threading.Lock()
+
+    def execute(request: Dict[str, Any]) -> None:
+        try:
+            result = getattr(agents, request["op"])(**request.get("args", {}))
+            # Results cross the process boundary, keep them to plain JSON types
+            response = {"id": request["id"], "ok": True, "result": json.loads(json.dumps(result, default=str))}
+        except Exception as e:
+            response = {"id": request["id"], "ok": False, "error": str(e), "kind": type(e).__name__}
+        with send_lock:
+            conn.send(response)
+
+    with ThreadPoolExecutor(max_workers=WORKER_COMMAND_THREADS, thread_name_prefix="worker-command") as pool:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                break
+            if request.get("op") == "shutdown":
+                break
+            pool.submit(execute, request)
+
+    for name in list(agents.runners):
+        agents.stop(name)
+
+
+class WorkerProcess:
+    """Parent-side handle of one worker process and its pipe"""
+
+    def __init__(self, worker_id: str, context):
+        self.worker_id = worker_id
+        self.context = context
+        self.restarts = 0
+        self.process = None
+        self._conn = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_worker_main, args=(self.worker_id, child_conn), name=f"zerepy-{self.worker_id}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        # Each process generation gets its own pending table, so a dying reader only fails its own calls
+        pending: Dict[int, Future] = {}
+        with self._lock:
+            self._conn = parent_conn
+            self._pending = pending
+        threading.Thread(target=self._read_responses, args=(parent_conn, pending), name=f"{self.worker_id}-reader",
+                         daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def _read_responses(self, conn, pending: Dict[int, Future]) -> None:
+        while True:
+            try:
+                response = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = pending.pop(response["id"], None)
+            if future is None:
+                continue
+            if response["ok"]:
+                future.set_result(response["result"])
+            else:
+                future.set_exception(WorkerError(response["error"], response.get("kind", "Exception")))
+        with self._lock:
+            failed = list(pending.values())
+            pending.clear()
+        for future in failed:
+            future.set_exception(WorkerError(f"Worker {self.worker_id} exited", "WorkerCrashed"))
+
+    def request(self, op: str, **args) -> Future:
+        """Send a command; the returned future resolves with the worker's reply"""
+        future = Future()
+        with self._lock:
+            if not self.alive:
+                future.set_exception(WorkerError(f"Worker {self.worker_id} is not running", "WorkerCrashed"))
+                return future
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            try:
+                self._conn.send({"id": request_id, "op": op, "args": args})
+            except (OSError, ValueError) as e:
+                self._pending.pop(request_id, None)
+                future.set_exception(WorkerError(f"Worker {self.worker_id} unreachable: {e}", "WorkerCrashed"))
+        return future
+
+    def shutdown(self, timeout: float = 10) -> None:
+        if self.alive:
+            try:
+                self._conn.send({"op": "shutdown"})
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        if self._conn:
+            self._conn.close()
+
+
+class AgentSupervisor:
+    """
+    Spreads agents over a pool of worker processes, one AgentHost per process.
+
+    Each agent is pinned to a worker by a consistent hash of its name, so the
+    assignment is stable across restarts and only a fraction of agents move
+    when the pool size changes. A monitor thread restarts crashed workers
+    (with backoff), reloads their agents and restarts the loops that were
+    running. Commands travel over a pipe per worker; `metrics` aggregates
+    the workers' loop counters.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.worker_count = workers or os.cpu_count() or 1
+        # Spawned workers don't inherit the front process's threads and locks
+        self.context = multiprocessing.get_context("spawn")
+        self.workers: Dict[str, WorkerProcess] = {
+            f"worker-{index}": WorkerProcess(f"worker-{index}", self.context) for index in range(self.worker_count)
+        }
+        self.ring = HashRing(list(self.workers))
+        # Agents the supervisor restores after a crash: name -> {"running": bool}
+        self.agents: Dict[str, Dict[str, bool]] = {}
+        self._stopping = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        for worker in self.workers.values():
+            worker.start()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="supervisor-monitor", daemon=True)
+        self._monitor.start()
+        logger.info(f"Started {self.worker_count} agent worker processes")
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        for worker in self.workers.values():
+            worker.shutdown()
+
+    def worker_for(self, agent: str) -> WorkerProcess:
+        return self.workers[self.ring.node_for(agent)]
+
+    def request(self, agent: str, op: str, **args) -> Future:
+        """Send a command for an agent to the worker that owns it"""
+        future = self.worker_for(agent).request(op, agent=agent, **args)
+        future.add_done_callback(lambda done: self._track(agent, op, done))
+        return future
+
+    def call(self, agent: str, op: str, timeout: float = DEFAULT_CALL_TIMEOUT, **args) -> Any:
+        return self.request(agent, op, **args).result(timeout=timeout)
+
+    def _track(self, agent: str, op: str, future: Future) -> None:
+        """Remember which agents are loaded and running, so a restarted worker can be restored"""
+        if future.exception() is not None:
+            return
+        with self._lock:
+            if op == "load":
+                self.agents[agent] = {"running": False}
+            elif op == "unload":
+                self.agents.pop(agent, None)
+            elif op in ("start", "stop") and agent in self.agents:
+                self.agents[agent]["running"] = op == "start"
+
+    def _monitor_loop(self) -> None:
+        backoff: Dict[str, float] = {}
+        while not self._stopping.wait(MONITOR_INTERVAL):
+            for worker_id, worker in self.workers.items():
+                if worker.alive or self._stopping.is_set():
+                    continue
+                delay = backoff.get(worker_id, 1)
+                logger.error(f"Worker {worker_id} exited (code {worker.process.exitcode}), restarting in {delay:.0f}s")
+                if self._stopping.wait(delay):
+                    return
+                worker.restarts += 1
+                worker.start()
+                backoff[worker_id] = min(delay * 2, MAX_RESTART_BACKOFF)
+                self._restore(worker_id)
+            # A worker that stayed up for a full interval resets its backoff
+            for worker_id in list(backoff):
+                if self.workers[worker_id].alive:
+                    backoff[worker_id] = max(1, backoff[worker_id] / 2)
+
+    def _restore(self, worker_id: str) -> None:
+        with self._lock:
+            owned = {name: dict(state) for name, state in self.agents.items()
+                     if self.ring.node_for(name) == worker_id}
+        for name, state in owned.items():
+            try:
+                self.call(name, "load")
+                if state["running"]:
+                    self.call(name, "start")
+                logger.info(f"Restored agent {name} on {worker_id}")
+            except Exception as e:
+                logger.error(f"Could not restore agent {name} on {worker_id}: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-worker metrics plus totals over every hosted agent"""
+        futures = {worker_id: worker.request("metrics") for worker_id, worker in self.workers.items()}
+        workers, totals = {}, {"agents": 0, "running": 0, "actions": 0, "failures": 0, "actions_per_minute": 0.0}
+        for worker_id, future in futures.items():
+            worker = self.workers[worker_id]
+            entry = {"alive": worker.alive, "restarts": worker.restarts}
+            try:
+                entry.update(future.result(timeout=10))
+            except Exception as e:
+                entry["error"] = str(e)
+            workers[worker_id] = entry
+            for status in entry.get("agents", {}).values():
+                totals["agents"] += 1
+                totals["running"] += status["state"] != "stopped"
+                totals["actions"] += status["actions"]
+                totals["failures"] += status["failures"]
+                totals["actions_per_minute"] += status["actions_per_minute"]
+        totals["actions_per_minute"] = round(totals["actions_per_minute"], 2)
+        return {"workers": workers, "totals": totals}
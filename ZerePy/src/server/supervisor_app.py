@@ -0,0 +1,121 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+
+from src.server.app import ActionRequest
+from src.server.supervisor import AgentSupervisor, WorkerError
+
+# HTTP status for failures raised inside a worker, by exception class
+WORKER_ERROR_STATUS = {
+    "LookupError": 404,
+    "KeyError": 404,
+    "FileNotFoundError": 404,
+    "ValueError": 400,
+    "WorkerCrashed": 503,
+}
+
+
+def create_supervisor_app(workers: Optional[int] = None, agents: List[str] = ()) -> FastAPI:
+    """
+    Front process for supervisor mode: agents run in a pool of worker
+    processes and every route forwards to the worker that owns the agent.
+    """
+    supervisor = AgentSupervisor(workers)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        supervisor.start()
+        for name in agents:
+            await asyncio.wrap_future(supervisor.request(name, "load"))
+        yield
+        await asyncio.to_thread(supervisor.shutdown)
+
+    app = FastAPI(title="ZerePy Supervisor", lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.state.supervisor = supervisor
+
+    async def forward(agent_name: str, op: str, **args):
+        try:
+            return await asyncio.wrap_future(supervisor.request(agent_name, op, **args))
+        except WorkerError as e:
+            raise HTTPException(status_code=WORKER_ERROR_STATUS.get(e.kind, 500), detail=str(e))
+
+    @app.get("/")
+    async def root():
+        """Supervisor status endpoint"""
+        return {
+            "status": "running",
+            "mode": "supervisor",
+            "workers": supervisor.worker_count,
+            "agents": sorted(supervisor.agents),
+        }
+
+    @app.get("/agents")
+    async def list_agents():
+        """Loaded agents and the worker each one is pinned to"""
+        return {"agents": {name: supervisor.worker_for(name).worker_id for name in sorted(supervisor.agents)}}
+
+    @app.post("/agents/{agent_name}/load")
+    async def load_agent(agent_name: str):
+        """Load an agent on the worker that owns it"""
+        name = await forward(agent_name, "load")
+        return {"status": "success", "agent": agent_name, "name": name,
+                "worker": supervisor.worker_for(agent_name).worker_id}
+
+    @app.delete("/agents/{agent_name}")
+    async def unload_agent(agent_name: str):
+        """Stop and remove an agent"""
+        await forward(agent_name, "unload")
+        return {"status": "success", "agent": agent_name}
+
+    @app.post("/agents/{agent_name}/start")
+    async def start_agent(agent_name: str):
+        """Start the agent loop"""
+        await forward(agent_name, "start")
+        return {"status": "success", "message": "Agent started"}
+
+    @app.post("/agents/{agent_name}/stop")
+    async def stop_agent(agent_name: str):
+        """Stop the agent loop"""
+        await forward(agent_name, "stop")
+        return {"status": "success", "message": "Agent stopped"}
+
+    @app.post("/agents/{agent_name}/pause")
+    async def pause_agent(agent_name: str):
+        """Pause the agent loop once the current action finishes"""
+        await forward(agent_name, "pause")
+        return {"status": "success", "message": "Agent paused"}
+
+    @app.post("/agents/{agent_name}/resume")
+    async def resume_agent(agent_name: str):
+        """Resume a paused agent loop"""
+        await forward(agent_name, "resume")
+        return {"status": "success", "message": "Agent resumed"}
+
+    @app.get("/agents/{agent_name}/status")
+    async def agent_status(agent_name: str):
+        """Loop state, current task, queue depth and throughput counters"""
+        return await forward(agent_name, "status")
+
+    @app.post("/agents/{agent_name}/action")
+    async def agent_action(agent_name: str, action_request: ActionRequest):
+        """Execute a single agent action"""
+        result = await forward(agent_name, "action", connection=action_request.connection,
+                               action=action_request.action, params=action_request.params)
+        return {"status": "success", "result": result}
+
+    @app.get("/metrics")
+    async def metrics():
+        """Per-worker metrics and totals across all agents"""
+        return await asyncio.to_thread(supervisor.metrics)
+
+    return app
@@ -0,0 +1,121 @@
+import copy
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger("singleflight")
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    upstream: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    coalesced_by_label: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def coalesce_rate(self) -> float:
+        return self.coalesced / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream": self.upstream,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "coalesce_rate": round(self.coalesce_rate, 4),
+            "coalesced_by_action": dict(self.coalesced_by_label),
+        }
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "followers")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+def _private_copy(value: Any) -> Any:
+    # Callers treat results as their own (timeline_tweets.pop(0)), so every caller gets its own copy
+    if isinstance(value, (list, dict)):
+        return copy.deepcopy(value)
+    return value
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for it and get its result, or its
+    exception, instead of making their own upstream call. Nothing is kept
+    once the call returns, so this only merges calls that overlap in time.
+    """
+
+    def __init__(self):
+        self.stats = FlightStats()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Stable key for a call, e.g. make_key(connection, action, kwargs)"""
+        return json.dumps(parts, sort_keys=True, default=str)
+
+    def do(self, key: Hashable, func: Callable, *args, label: Optional[str] = None) -> Any:
+        """Run func(*args), or wait for the identical call already running under `key`"""
+        with self._lock:
+            self.stats.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats.upstream += 1
+            else:
+                flight.followers += 1
+                self.stats.coalesced += 1
+                if label:
+                    self.stats.coalesced_by_label[label] = self.stats.coalesced_by_label.get(label, 0) + 1
+        if not leader:
+            return self._follow(flight, label)
+
+        result = None
+        try:
+            result = func(*args)
+            return result
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.stats.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            # No follower can join any more; snapshot before the leader's caller can mutate the result
+            if flight.followers and flight.error is None:
+                flight.result = _private_copy(result)
+            flight.done.set()
+
+    @staticmethod
+    def _follow(flight: _Flight, label: Optional[str]) -> Any:
+        logger.debug(f"Joined in-flight call for {label or 'key'}")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _private_copy(flight.result)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self.stats.as_dict()
+            stats["in_flight"] = len(self._flights)
+        return stats
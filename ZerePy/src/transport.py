@@ -0,0 +1,120 @@
+"""
+Shared HTTP transport for connections.
+
+Every host gets one pooled `requests.Session`, so repeated calls reuse the
+same keep-alive TCP/TLS connection instead of paying a fresh handshake each
+time. Connections call `transport.get/post/request` exactly like the
+`requests` module functions they replace.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("transport")
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (10, 120)  # (connect, read) seconds
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+@dataclass
+class HostSettings:
+    pool_size: int = DEFAULT_POOL_SIZE
+    timeout: Timeout = DEFAULT_TIMEOUT
+
+
+_sessions: Dict[str, requests.Session] = {}
+_host_settings: Dict[str, HostSettings] = {}
+_lock = threading.Lock()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _create_session(settings: HostSettings) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def configure_host(url: str, pool_size: Optional[int] = None, timeout: Optional[Timeout] = None) -> None:
+    """
+    Override pool size and/or default timeout for the host serving `url`.
+
+    Args:
+        url: Any URL on the host (only scheme and netloc are used)
+        pool_size: Maximum number of keep-alive connections kept for the host
+        timeout: Default timeout applied when a call doesn't pass one
+
+    Calling it again with the same (or no) settings keeps the pooled session.
+    """
+    key = _host_key(url)
+    if isinstance(timeout, list):
+        # JSON configs give (connect, read) timeouts as a list
+        timeout = tuple(timeout)
+    with _lock:
+        settings = _host_settings.setdefault(key, HostSettings())
+        if timeout:
+            # Read on every request, so the live session picks it up as is
+            settings.timeout = timeout
+        if pool_size and pool_size != settings.pool_size:
+            settings.pool_size = pool_size
+            # Other connections (or agents) may be mid-request on the current session, so it
+            # is swapped out rather than closed; it is released once nothing references it
+            if key in _sessions:
+                _sessions[key] = _create_session(settings)
+                logger.debug(f"Resized pooled session for {key} (pool size {pool_size})")
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the pooled session for the host serving `url`"""
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            settings = _host_settings.setdefault(key, HostSettings())
+            session = _create_session(settings)
+            _sessions[key] = session
+            logger.debug(f"Created pooled session for {key} (pool size {settings.pool_size})")
+        return session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for `requests.request` that reuses pooled connections"""
+    if "timeout" not in kwargs:
+        with _lock:
+            settings = _host_settings.get(_host_key(url))
+        kwargs["timeout"] = settings.timeout if settings else DEFAULT_TIMEOUT
+    return get_session(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def close_all() -> None:
+    """Close every pooled session (e.g. on shutdown)"""
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
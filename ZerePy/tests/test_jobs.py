@@ -0,0 +1,166 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.connection_manager import ConnectionNotReadyError
+from src.connections.base_connection import InvalidActionRequest
+from src.server import jobs
+from src.server.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, UNCERTAIN, Job, JobQueue, JobStore
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_at):
+        super().__init__("rate limited")
+        self.retry_at = retry_at
+
+
+class FakeConnectionManager:
+    def __init__(self, outcomes, read_only=False):
+        self.outcomes = list(outcomes)
+        self.read_only = read_only
+        self.calls = []
+
+    def perform_action(self, connection_name, action_name, params, raise_errors=False):
+        self.calls.append((connection_name, action_name, params))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def is_read_only(self, connection_name, action_name):
+        return self.read_only
+
+
+class FakeAgent:
+    def __init__(self, outcomes, read_only=False):
+        self.connection_manager = FakeConnectionManager(outcomes, read_only)
+        self.published = []
+        self.events = SimpleNamespace(publish=lambda event_type, **data: self.published.append(event_type))
+
+
+@pytest.fixture
+def store():
+    return JobStore(":memory:")
+
+
+def queue_for(store, agent):
+    return JobQueue(store, lambda name: agent if name == "example" else None)
+
+
+def run(queue, job):
+    queue._run(queue.get(job.id))
+    return queue.get(job.id)
+
+
+def test_success(store):
+    agent = FakeAgent([{"id": "1"}])
+    queue = queue_for(store, agent)
+    job, created = queue.submit("example", "twitter", "post-tweet", ["hello"])
+
+    job = run(queue, job)
+    assert created
+    assert (job.status, job.attempts, job.result) == (SUCCEEDED, 1, {"id": "1"})
+    assert agent.published == ["job_queued", "job_started", "job_succeeded"]
+
+
+def test_repeated_idempotency_key_returns_the_first_job(store):
+    queue = queue_for(store, FakeAgent([]))
+    first, _ = queue.submit("example", "twitter", "post-tweet", ["hello"], idempotency_key="k")
+    second, created = queue.submit("example", "twitter", "post-tweet", ["hello"], idempotency_key="k")
+
+    assert not created
+    assert second.id == first.id
+
+
+def test_invalid_request_fails_without_retry(store):
+    agent = FakeAgent([InvalidActionRequest("Unknown action")])
+    queue = queue_for(store, agent)
+    job, _ = queue.submit("example", "twitter", "nope")
+
+    job = run(queue, job)
+    assert (job.status, job.attempts) == (FAILED, 1)
+
+
+@pytest.mark.parametrize("result", [None, {"error": "insufficient funds"}])
+def test_error_results_of_a_write_are_uncertain(store, result):
+    agent = FakeAgent([result])
+    queue = queue_for(store, agent)
+    job, _ = queue.submit("example", "sonic", "transfer")
+
+    job = run(queue, job)
+    assert job.status == UNCERTAIN
+    assert job.error
+
+
+def test_failed_write_is_not_retried(store):
+    queue = queue_for(store, FakeAgent([TimeoutError("read timed out")]))
+    job, _ = queue.submit("example", "twitter", "post-tweet", ["hello"])
+
+    assert run(queue, job).status == UNCERTAIN
+
+
+def test_read_only_action_retries_with_backoff_then_fails(store):
+    agent = FakeAgent([TimeoutError("slow")] * 2, read_only=True)
+    queue = queue_for(store, agent)
+    job, _ = queue.submit("example", "twitter", "read-timeline", max_attempts=2)
+
+    before = time.time()
+    job = run(queue, job)
+    assert (job.status, job.attempts) == (QUEUED, 1)
+    assert job.run_after >= before + jobs.RETRY_BASE_DELAY
+
+    job = run(queue, job)
+    assert (job.status, job.attempts) == (FAILED, 2)
+    assert agent.published[-1] == "job_failed"
+
+
+def test_errors_raised_before_sending_are_retried_for_writes(store):
+    retry_at = time.time() + 120
+    agent = FakeAgent([RateLimited(retry_at), ConnectionNotReadyError("unhealthy"), {"id": "1"}])
+    queue = queue_for(store, agent)
+    job, _ = queue.submit("example", "twitter", "post-tweet", ["hello"])
+
+    job = run(queue, job)
+    assert (job.status, job.run_after) == (QUEUED, retry_at)
+    job = run(queue, job)
+    assert job.status == QUEUED
+    job = run(queue, job)
+    assert (job.status, job.attempts) == (SUCCEEDED, 3)
+
+
+def test_job_waits_for_its_agent(store):
+    agent = FakeAgent([{"id": "1"}])
+    loaded = {}
+    queue = JobQueue(store, loaded.get)
+    job, _ = queue.submit("example", "twitter", "post-tweet", ["hello"])
+
+    queue._run(queue.get(job.id))
+    assert queue.get(job.id).status == QUEUED
+    assert queue.get(job.id).attempts == 0
+    assert queue.waiting_agents() == ["example"]
+
+    loaded["example"] = agent
+    queue.agent_loaded("example")
+    assert queue._ready[0][2] == job.id
+
+
+def test_restart_marks_running_uncertain_and_resumes_queued(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(path)
+    store.create(Job(id="running", agent="example", connection="sonic", action="transfer", status=RUNNING))
+    store.create(Job(id="queued", agent="example", connection="twitter", action="post-tweet", params=["hi"]))
+
+    agent = FakeAgent([{"id": "1"}])
+    queue = queue_for(JobStore(path), agent)
+    queue.start()
+    try:
+        deadline = time.time() + 5
+        while queue.get("queued").status != SUCCEEDED and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        queue.stop()
+
+    assert queue.get("running").status == UNCERTAIN
+    assert queue.get("queued").status == SUCCEEDED
+    assert agent.connection_manager.calls == [("twitter", "post-tweet", ["hi"])]
@@ -0,0 +1,173 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src import action_handler, outbox
+from src.connections.base_connection import InvalidActionRequest
+from src.outbox import COMMITTED, FAILED, PENDING, UNCERTAIN, Outbox
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_at):
+        super().__init__("rate limited")
+        self.retry_at = retry_at
+
+
+class FakeAgent:
+    agent_name = "example"
+
+    def __init__(self, outcomes=()):
+        self.outcomes = list(outcomes)
+        self.calls = []
+        self.published = []
+        self.events = SimpleNamespace(publish=lambda event_type, **data: self.published.append(event_type))
+        self.connection_manager = SimpleNamespace(perform_action=self.perform_action)
+
+    def perform_action(self, connection_name, action_name, params, raise_errors=False):
+        self.calls.append((connection_name, action_name, params))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def hooks(monkeypatch):
+    committed = []
+    monkeypatch.setattr(action_handler, "write_commit_hooks", {
+        ("twitter", "post-tweet"): [lambda agent, entry: committed.append(entry.id)]
+    })
+    return committed
+
+
+def dispatch_one(box):
+    batch = box._claim()
+    assert len(batch) == 1
+    box._dispatch(batch[0])
+    return box.get(batch[0].id)
+
+
+def test_commit_runs_hooks(hooks):
+    agent = FakeAgent([{"id": "1"}])
+    box = Outbox(agent, path=":memory:")
+    entry, created = box.enqueue("twitter", "post-tweet", ["hello"])
+
+    entry = dispatch_one(box)
+    assert created
+    assert (entry.status, entry.result, entry.attempts) == (COMMITTED, {"id": "1"}, 1)
+    assert hooks == [entry.id]
+    assert agent.published == ["outbox_queued", "outbox_committed"]
+
+
+def test_repeated_idempotency_key_returns_the_first_entry():
+    box = Outbox(FakeAgent(), path=":memory:")
+    first, _ = box.enqueue("twitter", "post-tweet", ["hello"], idempotency_key="k")
+    second, created = box.enqueue("twitter", "post-tweet", ["hello"], idempotency_key="k")
+
+    assert not created
+    assert second.id == first.id
+
+
+def test_duplicate_content_counts_as_committed(hooks):
+    agent = FakeAgent([Exception("403 Forbidden: You are not allowed to create a Tweet with duplicate content.")])
+    box = Outbox(agent, path=":memory:")
+    box.enqueue("twitter", "post-tweet", ["hello"])
+
+    entry = dispatch_one(box)
+    assert entry.status == COMMITTED
+    assert hooks == [entry.id]
+
+
+def test_rate_limit_retries_at_the_reset():
+    retry_at = time.time() + 300
+    box = Outbox(FakeAgent([RateLimited(retry_at)]), path=":memory:")
+    box.enqueue("twitter", "post-tweet", ["hello"])
+
+    entry = dispatch_one(box)
+    assert (entry.status, entry.next_attempt_at) == (PENDING, retry_at)
+    # Not due yet
+    assert box._claim() == []
+
+
+def test_other_errors_back_off_then_fail(hooks):
+    box = Outbox(FakeAgent([TimeoutError("slow")] * 2), path=":memory:", max_attempts=2)
+    box.enqueue("twitter", "post-tweet", ["hello"])
+
+    before = time.time()
+    entry = dispatch_one(box)
+    assert entry.status == PENDING
+    assert entry.next_attempt_at >= before + outbox.RETRY_BASE_DELAY
+
+    box._dispatch(entry)
+    assert box.get(entry.id).status == FAILED
+    assert hooks == []
+
+
+def test_invalid_request_fails_straight_away():
+    box = Outbox(FakeAgent([InvalidActionRequest("Tweet text is empty")]), path=":memory:")
+    box.enqueue("twitter", "post-tweet", [""])
+
+    assert dispatch_one(box).status == FAILED
+
+
+def test_error_result_is_retried():
+    box = Outbox(FakeAgent([{"error": "upstream unavailable"}]), path=":memory:")
+    box.enqueue("twitter", "post-tweet", ["hello"])
+
+    entry = dispatch_one(box)
+    assert (entry.status, entry.error) == (PENDING, "upstream unavailable")
+
+
+def test_media_bytes_survive_storage():
+    agent = FakeAgent([{"id": "1"}])
+    box = Outbox(agent, path=":memory:")
+    box.enqueue("twitter", "post-tweet-with-media", ["look", b"\x89PNG"])
+
+    dispatch_one(box)
+    assert agent.calls == [("twitter", "post-tweet-with-media", ["look", b"\x89PNG"])]
+
+
+def test_recovery_redispatches_safe_writes_only(tmp_path):
+    path = str(tmp_path / "outbox.sqlite")
+    box = Outbox(FakeAgent(), path=path)
+    box.enqueue("twitter", "like-tweet", ["42"])
+    box.enqueue("sonic", "transfer", ["0xabc", 1.0])
+    # Simulate a crash after both were claimed
+    assert len(box._claim()) == 2
+
+    agent = FakeAgent()
+    restarted = Outbox(agent, path=path)
+    restarted._recover()
+
+    statuses = {entry.action: entry.status for entry in restarted.list()}
+    assert statuses == {"like-tweet": PENDING, "transfer": UNCERTAIN}
+    assert agent.published == ["outbox_uncertain"]
+
+
+def test_recovery_purges_old_finished_entries(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.sqlite")
+    box = Outbox(FakeAgent([{"id": "1"}]), path=path)
+    box.enqueue("twitter", "post-tweet", ["hello"])
+    dispatch_one(box)
+
+    later = time.time() + outbox.RETENTION + 60
+    monkeypatch.setattr(outbox.time, "time", lambda: later)
+    box._recover()
+    assert box.list() == []
+
+
+def test_dispatcher_thread_sends_queued_writes():
+    agent = FakeAgent([{"id": "1"}])
+    box = Outbox(agent, path=":memory:")
+    box.start()
+    try:
+        entry, _ = box.enqueue("twitter", "post-tweet", ["hello"])
+        deadline = time.time() + 5
+        while box.get(entry.id).status != COMMITTED and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        box.stop()
+
+    assert box.get(entry.id).status == COMMITTED
+    assert not box._thread.is_alive()
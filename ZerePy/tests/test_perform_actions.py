@@ -0,0 +1,136 @@
+import asyncio
+import sys
+import threading
+import types
+
+import pytest
+
+from src import connection_manager
+from src.connection_manager import ConnectionManager
+from src.connections.base_connection import Action, ActionParameter, BaseConnection
+
+
+class FakeConnection(BaseConnection):
+    """get-tweet has a native batch form; like-tweet does not"""
+
+    def __init__(self, config):
+        self.single_calls = []
+        self.batches = []
+        self.batch_results = None
+        self.fail_ids = set()
+        self.lock = threading.Lock()
+        super().__init__(config)
+
+    @property
+    def is_llm_provider(self):
+        return False
+
+    def validate_config(self, config):
+        return config
+
+    def configure(self, **kwargs):
+        return True
+
+    def is_configured(self, verbose=False):
+        return True
+
+    def register_actions(self):
+        tweet_id = [ActionParameter("tweet_id", True, str, "Tweet ID")]
+        self.actions = {
+            "get-tweet": Action("get-tweet", tweet_id, "Get a tweet"),
+            "like-tweet": Action("like-tweet", tweet_id, "Like a tweet"),
+        }
+
+    def get_tweet(self, tweet_id):
+        with self.lock:
+            self.single_calls.append(("get-tweet", tweet_id))
+        return {"id": tweet_id}
+
+    def get_tweet_batch(self, kwargs_list):
+        with self.lock:
+            self.batches.append([kwargs["tweet_id"] for kwargs in kwargs_list])
+        if self.batch_results is not None:
+            return self.batch_results
+        return [KeyError(kwargs["tweet_id"]) if kwargs["tweet_id"] in self.fail_ids else {"id": kwargs["tweet_id"]}
+                for kwargs in kwargs_list]
+
+    def like_tweet(self, tweet_id):
+        with self.lock:
+            self.single_calls.append(("like-tweet", tweet_id))
+        if tweet_id == "bad":
+            raise RuntimeError("like failed")
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    module = types.ModuleType("fake_connection")
+    module.FakeConnection = FakeConnection
+    monkeypatch.setitem(sys.modules, "fake_connection", module)
+    monkeypatch.setitem(connection_manager.CONNECTION_REGISTRY, "fake", ("fake_connection", "FakeConnection"))
+    manager = ConnectionManager([{"name": "fake"}])
+    yield manager
+    manager.close()
+
+
+def test_calls_to_a_batch_action_are_merged(manager):
+    results = manager.perform_actions([
+        ("fake", "get-tweet", ["1"]),
+        {"connection": "fake", "action": "like-tweet", "params": ["1"]},
+        ("fake", "get-tweet", ["2"]),
+        ("fake", "get-tweet", ["3"]),
+    ])
+    connection = manager.connections["fake"]
+
+    assert connection.batches == [["1", "2", "3"]]
+    assert connection.single_calls == [("like-tweet", "1")]
+    assert [(result.action, result.ok, result.result) for result in results] == [
+        ("get-tweet", True, {"id": "1"}),
+        ("like-tweet", True, True),
+        ("get-tweet", True, {"id": "2"}),
+        ("get-tweet", True, {"id": "3"}),
+    ]
+
+
+def test_a_single_call_skips_the_batch_handler(manager):
+    results = manager.perform_actions([("fake", "get-tweet", ["1"])])
+
+    assert manager.connections["fake"].batches == []
+    assert results[0].result == {"id": "1"}
+
+
+def test_failures_stay_with_their_call(manager):
+    manager.connections["fake"].fail_ids = {"2"}
+    results = manager.perform_actions([
+        ("fake", "get-tweet", ["1"]),
+        ("fake", "get-tweet", ["2"]),
+        ("fake", "get-tweet", []),
+        ("fake", "like-tweet", ["bad"]),
+        ("fake", "no-such-action", []),
+    ])
+
+    assert [result.ok for result in results] == [True, False, False, False, False]
+    assert "Missing required parameters: tweet_id" in results[2].error
+    assert results[3].error == "like failed"
+    assert "Unknown action" in results[4].error
+    # The call with missing params never reached the batch handler
+    assert manager.connections["fake"].batches == [["1", "2"]]
+
+
+def test_short_batch_result_fails_the_uncovered_calls(manager):
+    manager.connections["fake"].batch_results = [{"id": "1"}]
+    results = manager.perform_actions([("fake", "get-tweet", [str(i)]) for i in range(1, 4)])
+
+    assert [result.ok for result in results] == [True, False, False]
+    assert "no result for this call" in results[1].error
+
+
+def test_async_variant_keeps_call_order(manager):
+    results = asyncio.run(manager.perform_actions_async([
+        ("fake", "like-tweet", ["1"]),
+        ("fake", "get-tweet", ["2"]),
+        ("fake", "get-tweet", ["3"]),
+    ]))
+
+    assert [result.action for result in results] == ["like-tweet", "get-tweet", "get-tweet"]
+    assert all(result.ok for result in results)
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from src.rate_limits import RateLimitTracker
+
+
+def headers(remaining, reset_at, limit=None):
+    values = {"x-rate-limit-remaining": str(remaining), "x-rate-limit-reset": str(reset_at)}
+    if limit is not None:
+        values["x-rate-limit-limit"] = str(limit)
+    return values
+
+
+def test_unknown_endpoint_is_ready():
+    tracker = RateLimitTracker()
+
+    assert tracker.ready_at("post tweets") == 0
+    assert tracker.acquire("post tweets", paced=True) is None
+
+
+def test_responses_without_rate_limit_headers_are_ignored():
+    tracker = RateLimitTracker()
+    tracker.update("post tweets", {})
+
+    assert tracker.snapshot() == {}
+
+
+def test_spent_budget_waits_for_the_reset():
+    tracker = RateLimitTracker()
+    reset_at = time.time() + 600
+    tracker.update("get users/:id/timelines", headers(0, reset_at, limit=180))
+
+    assert tracker.ready_at("get users/:id/timelines") == reset_at
+    # More than max_wait away: the caller gets the retry time instead of blocking
+    assert tracker.acquire("get users/:id/timelines", max_wait=1) == reset_at
+    assert tracker.snapshot()["get users/:id/timelines"]["limit"] == 180
+
+
+def test_mark_exhausted_keeps_the_later_reset():
+    tracker = RateLimitTracker()
+    later = time.time() + 900
+    tracker.update("post tweets", headers(5, later))
+    tracker.mark_exhausted("post tweets", time.time() + 60)
+
+    assert tracker.ready_at("post tweets") == later
+
+
+def test_unpaced_endpoint_with_budget_is_ready_now():
+    tracker = RateLimitTracker()
+    tracker.update("get tweets", headers(10, time.time() + 900))
+    tracker.acquire("get tweets")
+
+    assert tracker.ready_at("get tweets") == 0
+
+
+def test_paced_writes_are_spread_over_the_window():
+    tracker = RateLimitTracker()
+    now = time.time()
+    tracker.update("post tweets", headers(10, now + 100))
+
+    assert tracker.acquire("post tweets", paced=True) is None
+    # 9 calls left for ~100 seconds: the next one is due ~11s after the last
+    ready = tracker.ready_at("post tweets", paced=True)
+    assert ready - time.time() == pytest.approx(100 / 9, abs=0.5)
+    assert tracker.snapshot()["post tweets"]["remaining"] == 9
+
+
+def test_paced_acquire_sleeps_until_its_slot():
+    tracker = RateLimitTracker()
+    now = time.time()
+    tracker.update("post tweets", headers(2, now + 0.4))
+    tracker.acquire("post tweets", paced=True)
+
+    started = time.time()
+    assert tracker.acquire("post tweets", paced=True, max_wait=5) is None
+    assert 0.1 < time.time() - started < 1
+
+
+def test_pacing_one_endpoint_does_not_block_another():
+    tracker = RateLimitTracker()
+    now = time.time()
+    tracker.update("post users/:id/likes", headers(1, now + 2))
+    tracker._budgets["post users/:id/likes"].last_request = now
+    waiter = threading.Thread(target=tracker.acquire, args=("post users/:id/likes", True, 30))
+    waiter.start()
+    time.sleep(0.1)
+
+    started = time.time()
+    assert tracker.acquire("post tweets", paced=True, max_wait=30) is None
+    assert time.time() - started < 0.5
+    waiter.join()
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+
+from src import scheduler as scheduler_module
+from src.scheduler import FAILURE_DELAY, TaskScheduler
+
+
+class FakeAgent:
+    def __init__(self, weights, loop_delay=10):
+        self.tasks = [{"name": name, "weight": weight} for name, weight in weights.items()]
+        self.task_weights = list(weights.values())
+        self.use_time_based_weights = False
+        self.loop_delay = loop_delay
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    # First-run offsets and interval jitter both come from random.uniform
+    monkeypatch.setattr(scheduler_module.random, "uniform", lambda low, high: (low + high) / 2)
+
+
+def test_weights_become_rate_intervals():
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1, "like-tweet": 3}))
+
+    assert scheduler.rate_interval("post-tweet") == pytest.approx(40)
+    assert scheduler.rate_interval("like-tweet") == pytest.approx(40 / 3)
+    assert scheduler.rate_interval("unknown") == float("inf")
+
+
+def test_zero_weight_tasks_are_not_scheduled():
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1, "like-tweet": 0}))
+
+    assert [entry["task"] for entry in scheduler.snapshot()] == ["post-tweet"]
+
+
+def test_first_runs_are_staggered_within_loop_delay():
+    before = time.time()
+    scheduler = TaskScheduler(FakeAgent({"a": 1, "b": 1, "c": 1}, loop_delay=5))
+
+    for entry in scheduler.snapshot():
+        assert before <= entry["due"] <= time.time() + 5
+
+
+def test_schedule_respects_eligibility(monkeypatch):
+    eligible = time.time() + 1000
+    monkeypatch.setitem(scheduler_module.action_eligibility, "post-tweet", lambda agent: eligible)
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1}))
+
+    assert scheduler.peek().due == eligible
+    assert scheduler.schedule("post-tweet", time.time()) == eligible
+
+
+def test_broken_eligibility_does_not_block_the_task(monkeypatch):
+    def broken(agent):
+        raise RuntimeError("state not loaded")
+
+    monkeypatch.setitem(scheduler_module.action_eligibility, "post-tweet", broken)
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1}))
+
+    assert scheduler.eligible_at("post-tweet") == 0
+
+
+def test_next_due_after_success_and_failure(no_jitter):
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1, "like-tweet": 1}))
+    now = time.time()
+
+    assert scheduler.next_due("post-tweet", True) == pytest.approx(now + 20, abs=1)
+    assert scheduler.next_due("post-tweet", False) == pytest.approx(now + FAILURE_DELAY, abs=1)
+
+
+def test_complete_requeues_the_task(no_jitter):
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1}))
+    assert len(scheduler) == 1
+
+    due = scheduler.complete("post-tweet", True)
+
+    assert len(scheduler) == 2
+    assert due == pytest.approx(time.time() + 10, abs=1)
+
+
+def test_wait_for_next_pops_the_earliest_due_task():
+    scheduler = TaskScheduler(FakeAgent({"a": 1, "b": 1}))
+    scheduler._queue.clear()
+    now = time.time()
+    scheduler.schedule("b", now - 1)
+    scheduler.schedule("a", now - 2)
+
+    assert scheduler.wait_for_next() == "a"
+    assert scheduler.wait_for_next() == "b"
+    assert len(scheduler) == 0
+
+
+def test_wait_for_next_requeues_a_task_whose_window_moved(monkeypatch):
+    scheduler = TaskScheduler(FakeAgent({"post-tweet": 1, "like-tweet": 1}))
+    scheduler._queue.clear()
+    now = time.time()
+    scheduler.schedule("post-tweet", now - 2)
+    scheduler.schedule("like-tweet", now - 1)
+    # Another task tweeted after post-tweet was queued
+    monkeypatch.setitem(scheduler_module.action_eligibility, "post-tweet", lambda agent: now + 1000)
+
+    assert scheduler.wait_for_next() == "like-tweet"
+    assert scheduler.snapshot() == [{"task": "post-tweet", "due": now + 1000}]
+
+
+def test_wait_for_next_returns_none_when_stopped():
+    scheduler = TaskScheduler(FakeAgent({"a": 1}))
+    scheduler._queue.clear()
+    scheduler.schedule("a", time.time() + 1000)
+    stop = threading.Event()
+    threading.Timer(0.05, stop.set).start()
+
+    assert scheduler.wait_for_next(stop) is None
+
+
+def test_wait_for_next_without_tasks_raises():
+    scheduler = TaskScheduler(FakeAgent({"a": 0}))
+
+    with pytest.raises(ValueError):
+        scheduler.wait_for_next()
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.singleflight import SingleFlight
+
+
+class BlockingCall:
+    """Upstream call that runs until released, counting how often it ran"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.release = threading.Event()
+        self.runs = 0
+
+    def __call__(self):
+        self.runs += 1
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def wait_for_followers(flight, key, count):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        with flight._lock:
+            current = flight._flights.get(key)
+            if current is not None and current.followers >= count:
+                return
+        time.sleep(0.001)
+    raise AssertionError(f"{count} followers never joined")
+
+
+def run_concurrently(flight, call, callers=3):
+    key = SingleFlight.make_key("twitter", "read-timeline", {"count": 10})
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(flight.do, key, call, label="twitter/read-timeline")]
+        wait_for_followers(flight, key, 0)
+        futures += [pool.submit(flight.do, key, call, label="twitter/read-timeline") for _ in range(callers - 1)]
+        wait_for_followers(flight, key, callers - 1)
+        call.release.set()
+    return futures
+
+
+def test_followers_share_the_leaders_result():
+    flight = SingleFlight()
+    call = BlockingCall(result=[{"id": "1"}, {"id": "2"}])
+
+    results = [future.result() for future in run_concurrently(flight, call)]
+    assert call.runs == 1
+    assert results == [call.result] * 3
+    stats = flight.get_stats()
+    assert (stats["calls"], stats["upstream"], stats["coalesced"], stats["in_flight"]) == (3, 1, 2, 0)
+    assert stats["coalesced_by_action"] == {"twitter/read-timeline": 2}
+
+
+def test_each_caller_gets_a_private_copy():
+    flight = SingleFlight()
+    call = BlockingCall(result=[{"id": "1"}, {"id": "2"}])
+
+    results = [future.result() for future in run_concurrently(flight, call)]
+    results[0].pop(0)
+    results[1][0]["id"] = "changed"
+    assert results[2] == [{"id": "1"}, {"id": "2"}]
+
+
+def test_leader_error_reaches_every_follower():
+    flight = SingleFlight()
+    call = BlockingCall(error=TimeoutError("upstream timed out"))
+
+    futures = run_concurrently(flight, call)
+    for future in futures:
+        with pytest.raises(TimeoutError, match="upstream timed out"):
+            future.result()
+    assert call.runs == 1
+    assert flight.get_stats()["errors"] == 1
+
+
+def test_calls_that_do_not_overlap_are_not_merged():
+    flight = SingleFlight()
+    calls = []
+
+    for _ in range(2):
+        flight.do("key", lambda: calls.append(1) or len(calls))
+    assert len(calls) == 2
+    assert flight.get_stats()["coalesced"] == 0
+
+
+def test_make_key_ignores_kwarg_order():
+    assert SingleFlight.make_key("twitter", "get-tweet", {"a": 1, "b": 2}) == \
+        SingleFlight.make_key("twitter", "get-tweet", {"b": 2, "a": 1})